@@ -11,6 +11,8 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
+import time
+
 from spiderfoot import SpiderFootPlugin
 
 
@@ -26,20 +28,30 @@ class sfp__stor_db(SpiderFootPlugin):
     # Default options
     opts = {
         'maxstorage': 1024,  # max bytes for any piece of info stored (0 = unlimited)
+        'maxbatchsize': 500,  # max events to write to the database at once
+        'maxbatchdelay': 1,  # max seconds an event waits before being written
         '_store': True
     }
 
     # Option descriptions
     optdescs = {
-        'maxstorage': "Maximum bytes to store for any piece of information retrieved (0 = unlimited.)"
+        'maxstorage': "Maximum bytes to store for any piece of information retrieved (0 = unlimited.)",
+        'maxbatchsize': "Maximum number of events to write to the database in one go.",
+        'maxbatchdelay': "Maximum number of seconds an event is held before being written to the database."
     }
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
+        self.batch = list()
+        self.batchStarted = None
+        self.stats = {'rows': 0, 'batches': 0, 'seconds': 0.0, 'maxSeconds': 0.0}
 
         for opt in list(userOpts.keys()):
             self.opts[opt] = userOpts[opt]
 
+        # wake up to write out held events if none arrive for a while
+        self._idleTimeout = self.opts['maxbatchdelay'] or None
+
     # What events is this module interested in for input
     # Because this is a storage plugin, we are interested in everything so we
     # can store all events for later analysis.
@@ -51,12 +63,88 @@ class sfp__stor_db(SpiderFootPlugin):
         if not self.opts['_store']:
             return
 
-        if self.opts['maxstorage'] != 0 and len(sfEvent.data) > self.opts['maxstorage']:
-            self.debug("Storing an event: " + sfEvent.eventType)
-            self.__sfdb__.scanEventStore(self.getScanId(), sfEvent, self.opts['maxstorage'])
+        self.debug("Storing an event: " + sfEvent.eventType)
+
+        if not self.batch:
+            self.batchStarted = time.monotonic()
+        self.batch.append(sfEvent)
+
+        if len(self.batch) >= self.opts['maxbatchsize'] or time.monotonic() - self.batchStarted >= self.opts['maxbatchdelay']:
+            self.storeBatch()
+
+    def idle(self):
+        if self.batch and time.monotonic() - self.batchStarted >= self.opts['maxbatchdelay']:
+            self.storeBatch()
+
+    def finish(self):
+        self.storeBatch()
+
+    def threadWorker(self):
+        try:
+            super().threadWorker()
+        finally:
+            # the scan is over or was aborted; write out anything still held
+            try:
+                self.storeBatch()
+            except IOError as e:
+                self.error(f"Unable to store {len(self.batch)} events: {e}")
+            self.logStats()
+
+    def storeBatch(self):
+        """Write held events to the database in a single transaction.
+
+        Events are held until they have been written, so if the database
+        can't be written to, they are written with the next batch. If an
+        event is invalid, the events are written one at a time instead, so
+        only the invalid event is lost.
+        """
+        if not self.batch:
             return
 
-        self.debug("Storing an event: " + sfEvent.eventType)
-        self.__sfdb__.scanEventStore(self.getScanId(), sfEvent)
+        start = time.perf_counter()
+        try:
+            self.__sfdb__.scanEventStoreBatch(self.getScanId(), self.batch, self.opts['maxstorage'])
+            stored = len(self.batch)
+            self.batch = list()
+        except (TypeError, ValueError) as e:
+            self.debug(f"Unable to store a batch of {len(self.batch)} events ({e}), storing them one at a time")
+            stored = self.storeEvents()
+        seconds = time.perf_counter() - start
+
+        self.stats['rows'] += stored
+        self.stats['batches'] += 1
+        self.stats['seconds'] += seconds
+        self.stats['maxSeconds'] = max(self.stats['maxSeconds'], seconds)
+
+    def storeEvents(self):
+        """Write held events to the database one at a time, dropping any
+        which are invalid.
+
+        Returns:
+            int: number of events written
+        """
+        stored = 0
+        while self.batch:
+            sfEvent = self.batch[0]
+            try:
+                self.__sfdb__.scanEventStore(self.getScanId(), sfEvent, self.opts['maxstorage'])
+                stored += 1
+            except (TypeError, ValueError) as e:
+                self.error(f"Unable to store {sfEvent.eventType} event from {sfEvent.module}: {e}")
+            del self.batch[0]
+        return stored
+
+    def logStats(self):
+        """Log how many events were stored and how quickly."""
+        stats = self.stats
+        if not stats['batches']:
+            return
+
+        rowsPerSecond = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        self.info(
+            f"Stored {stats['rows']:,} events in {stats['batches']:,} batches: "
+            f"{rowsPerSecond:,.0f} rows/sec, "
+            f"{stats['seconds'] / stats['batches'] * 1000:.1f} ms mean / {stats['maxSeconds'] * 1000:.1f} ms max flush latency"
+        )
 
 # End of sfp__stor_db class
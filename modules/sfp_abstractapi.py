@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
@@ -41,7 +40,12 @@ class sfp_abstractapi(SpiderFootPlugin):
             'favIcon': "https://app.abstractapi.com/favicon.ico",
             'logo': "https://app.abstractapi.com/logo192.png",
             'description': "Abstract provides powerful APIs to help you enrich any user experience or automate any workflow."
-        }
+        },
+        'rateLimits': {
+            'companyenrichment.abstractapi.com': 1,
+            'phonevalidation.abstractapi.com': 1,
+            'ipgeolocation.abstractapi.com': 1,
+        },
     }
 
     opts = {
@@ -140,8 +144,6 @@ class sfp_abstractapi(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(1)
-
         if not res:
             self.debug("No response from AbstractAPI Company Enrichment API endpoint")
             return None
@@ -172,8 +174,6 @@ class sfp_abstractapi(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(1)
-
         if not res:
             self.debug("No response from AbstractAPI Phone Validation API endpoint")
             return None
@@ -204,8 +204,6 @@ class sfp_abstractapi(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(1)
-
         if not res:
             self.debug("No response from AbstractAPI Phone Validation API endpoint")
             return None
@@ -11,9 +11,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
-
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_abusech(SpiderFootPlugin):
@@ -122,11 +120,10 @@ class sfp_abusech(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in Abuse.ch Feodo Tracker.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in Abuse.ch Feodo Tracker.")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in Abuse.ch Feodo Tracker.")
+                return True
 
         return False
 
@@ -134,7 +131,7 @@ class sfp_abusech(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('abusech_feodo', 24)
 
         if blacklist is not None:
-            return self.parseFeodoTrackerBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('abusech_feodo', blacklist, self.parseFeodoTrackerBlacklist)
 
         res = self.sf.fetchUrl(
             "https://feodotracker.abuse.ch/downloads/ipblocklist.txt",
@@ -154,7 +151,7 @@ class sfp_abusech(SpiderFootPlugin):
 
         self.sf.cachePut("abusech_feodo", res['content'])
 
-        return self.parseFeodoTrackerBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('abusech_feodo', res['content'], self.parseFeodoTrackerBlacklist)
 
     def parseFeodoTrackerBlacklist(self, blacklist):
         """Parse plaintext blacklist
@@ -193,11 +190,10 @@ class sfp_abusech(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in Abuse.ch SSL Blacklist.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in Abuse.ch SSL Blacklist.")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in Abuse.ch SSL Blacklist.")
+                return True
 
         return False
 
@@ -205,7 +201,7 @@ class sfp_abusech(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('abusech_ssl', 24)
 
         if blacklist is not None:
-            return self.parseSslBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('abusech_ssl', blacklist, self.parseSslBlacklist)
 
         res = self.sf.fetchUrl(
             "https://sslbl.abuse.ch/blacklist/sslipblacklist.csv",
@@ -225,7 +221,7 @@ class sfp_abusech(SpiderFootPlugin):
 
         self.sf.cachePut("abusech_ssl", res['content'])
 
-        return self.parseSslBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('abusech_ssl', res['content'], self.parseSslBlacklist)
 
     def parseSslBlacklist(self, blacklist):
         """Parse plaintext blacklist
@@ -268,11 +264,10 @@ class sfp_abusech(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in Abuse.ch URL Haus Blacklist.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in Abuse.ch URL Haus Blacklist.")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in Abuse.ch URL Haus Blacklist.")
+                return True
         elif targetType == "domain":
             if target.lower() in blacklist:
                 self.debug(f"Host name {target} found in Abuse.ch URL Haus Blacklist.")
@@ -284,7 +279,7 @@ class sfp_abusech(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('abusech_urlhaus', 24)
 
         if blacklist is not None:
-            return self.parseUrlHausBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('abusech_urlhaus', blacklist, self.parseUrlHausBlacklist)
 
         res = self.sf.fetchUrl(
             "https://urlhaus.abuse.ch/downloads/csv_recent/",
@@ -304,7 +299,7 @@ class sfp_abusech(SpiderFootPlugin):
 
         self.sf.cachePut("abusech_urlhaus", res['content'])
 
-        return self.parseUrlHausBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('abusech_urlhaus', res['content'], self.parseUrlHausBlacklist)
 
     def parseUrlHausBlacklist(self, blacklist):
         """Parse plaintext blacklist
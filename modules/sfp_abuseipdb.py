@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -52,7 +51,10 @@ class sfp_abuseipdb(SpiderFootPlugin):
             "Our mission is to help make Web safer by providing a central blacklist for"
             "webmasters, system administrators, and other interested parties to"
             "report and find IP addresses that have been associated with malicious activity online."
-        }
+        },
+        'rateLimits': {
+            'api.abuseipdb.com': 1,
+        },
     }
 
     opts = {
@@ -118,8 +120,6 @@ class sfp_abuseipdb(SpiderFootPlugin):
             headers=headers
         )
 
-        time.sleep(1)
-
         if res['code'] == '429':
             self.error("You are being rate-limited by AbuseIPDB")
             self.errorState = True
@@ -197,8 +197,6 @@ class sfp_abuseipdb(SpiderFootPlugin):
             headers=headers
         )
 
-        time.sleep(1)
-
         if res['code'] == '429':
             self.error("You are being rate-limited by AbuseIPDB")
             self.errorState = True
@@ -251,8 +249,6 @@ class sfp_abuseipdb(SpiderFootPlugin):
             headers=headers
         )
 
-        time.sleep(1)
-
         if res['code'] == '429':
             self.error("You are being rate-limited by AbuseIPDB")
             self.errorState = True
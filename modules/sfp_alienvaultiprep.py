@@ -11,9 +11,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
-
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_alienvaultiprep(SpiderFootPlugin):
@@ -98,11 +96,10 @@ class sfp_alienvaultiprep(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in AlienVault IP Reputation Database blacklist.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in AlienVault IP Reputation Database blacklist.")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in AlienVault IP Reputation Database blacklist.")
+                return True
 
         return False
 
@@ -110,7 +107,7 @@ class sfp_alienvaultiprep(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('alienvaultiprep', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('alienvaultiprep', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "https://reputation.alienvault.com/reputation.generic",
@@ -130,7 +127,7 @@ class sfp_alienvaultiprep(SpiderFootPlugin):
 
         self.sf.cachePut("alienvaultiprep", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('alienvaultiprep', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
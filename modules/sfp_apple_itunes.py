@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -34,7 +33,10 @@ class sfp_apple_itunes(SpiderFootPlugin):
             'logo': "https://itunes.apple.com/favicon.ico",
             'description': "The Apple iTunes store is a store for downloading "
                 "and purchasing apps for Apple devices.",
-        }
+        },
+        'rateLimits': {
+            'itunes.apple.com': 1,
+        },
     }
 
     opts = {
@@ -80,8 +82,6 @@ class sfp_apple_itunes(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout']
         )
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -34,7 +33,10 @@ class sfp_bgpview(SpiderFootPlugin):
             'favIcon': "https://bgpview.io/favicon-32x32.png",
             'logo': "https://bgpview.io/assets/logo.png",
             'description': "BGPView is a simple API allowing consumers to view all sort of analytics data about the current state and structure of the internet.",
-        }
+        },
+        'rateLimits': {
+            'api.bgpview.io': 1,
+        },
     }
 
     opts = {
@@ -76,8 +78,6 @@ class sfp_bgpview(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                timeout=self.opts['_fetchtimeout'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
@@ -104,8 +104,6 @@ class sfp_bgpview(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                timeout=self.opts['_fetchtimeout'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
@@ -132,8 +130,6 @@ class sfp_bgpview(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                timeout=self.opts['_fetchtimeout'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.parse
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
@@ -47,6 +46,11 @@ class sfp_bitcoinabuse(SpiderFootPlugin):
             "will be harder for criminals to convert the digital currency"
             " back into fiat money.",
         },
+        "rateLimits": {
+            # All endpoints other than Report Address have a rate limit of
+            # 30 requests per minute or one request every two seconds on average.
+            "www.bitcoinabuse.com": 2,
+        },
     }
     opts = {
         "api_key": "",
@@ -86,10 +90,6 @@ class sfp_bitcoinabuse(SpiderFootPlugin):
             useragent="SpiderFoot",
         )
 
-        # All endpoints other than Report Address have a rate limit of
-        # 30 requests per minute or one request every two seconds on average.
-        time.sleep(2)
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
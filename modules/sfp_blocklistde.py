@@ -10,9 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
-
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_blocklistde(SpiderFootPlugin):
@@ -102,11 +100,10 @@ class sfp_blocklistde(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in blocklist.de blacklist.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in blocklist.de blacklist.")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in blocklist.de blacklist.")
+                return True
 
         return False
 
@@ -114,7 +111,7 @@ class sfp_blocklistde(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('blocklistde', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('blocklistde', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "https://lists.blocklist.de/lists/all.txt",
@@ -134,7 +131,7 @@ class sfp_blocklistde(SpiderFootPlugin):
 
         self.sf.cachePut("blocklistde", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('blocklistde', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
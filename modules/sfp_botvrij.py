@@ -10,7 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_botvrij(SpiderFootPlugin):
@@ -88,7 +88,7 @@ class sfp_botvrij(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('botvrij', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('botvrij', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "https://www.botvrij.eu/data/blocklist/blocklist_full.csv",
@@ -108,7 +108,7 @@ class sfp_botvrij(SpiderFootPlugin):
 
         self.sf.cachePut("botvrij", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('botvrij', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import re
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -38,7 +37,10 @@ class sfp_callername(SpiderFootPlugin):
             "The easy-to-use and streamlined interface allow users to look up the caller ID information of any number quickly. "
             "Just type the unknown number into the search bar to start. "
             "You need not pay nor register to use this 100% free service.",
-        }
+        },
+        'rateLimits': {
+            'callername.com': 1,
+        },
     }
 
     # Default options
@@ -100,8 +102,6 @@ class sfp_callername(SpiderFootPlugin):
         url = f"https://callername.com/{number}"
         res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], useragent=self.opts['_useragent'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             self.debug('No response from CallerName.com')
             return
@@ -52,7 +52,11 @@ class sfp_censys(SpiderFootPlugin):
             "Censys scans the entire internet constantly, including obscure ports. "
             "We use a combination of banner grabs and deep protocol handshakes "
             "to provide industry-leading visibility and an accurate depiction of what is live on the internet.",
-        }
+        },
+        'rateLimits': {
+            # API rate limit: 0.4 actions/second (120.0 per 5 minute interval)
+            'search.censys.io': 'delay',
+        },
     }
 
     opts = {
@@ -123,9 +127,6 @@ class sfp_censys(SpiderFootPlugin):
             headers=headers
         )
 
-        # API rate limit: 0.4 actions/second (120.0 per 5 minute interval)
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def queryHostsSearch(self, qry):
@@ -147,9 +148,6 @@ class sfp_censys(SpiderFootPlugin):
             headers=headers
         )
 
-        # API rate limit: 0.4 actions/second (120.0 per 5 minute interval)
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
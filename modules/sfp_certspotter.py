@@ -12,7 +12,6 @@
 
 import base64
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -43,7 +42,11 @@ class sfp_certspotter(SpiderFootPlugin):
             "logo": "https://sslmate.com/assets/@995de4b3fc64525a0c960b570432bcaf.png",
             "description": "Cert Spotter monitors your domains for expiring, unauthorized, "
             "and invalid SSL certificates, so you can act before an incident, not after."
-        }
+        },
+        'rateLimits': {
+            # Free plan - 1,000 single-hostname queries / hour; 100 full-domain queries / hour
+            'api.certspotter.com': 1,
+        },
     }
 
     # Default options
@@ -117,9 +120,6 @@ class sfp_certspotter(SpiderFootPlugin):
             useragent=self.opts['_useragent'],
         )
 
-        # Free plan - 1,000 single-hostname queries / hour; 100 full-domain queries / hour
-        time.sleep(1)
-
         if res['content'] is None:
             self.debug('No response from CertSpotter API')
             return None
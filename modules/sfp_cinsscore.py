@@ -10,9 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
-
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_cinsscore(SpiderFootPlugin):
@@ -103,25 +101,45 @@ class sfp_cinsscore(SpiderFootPlugin):
 
             self.sf.cachePut("sfmal_" + cid, data['content'])
 
-        for line in data["content"].split('\n'):
-            ip = line.strip().lower()
+        blocklist = SpiderFootBlocklist.fromData("sfmal_" + cid, data['content'], self.parseBlocklist)
 
-            if targetType == "netblock":
-                try:
-                    if IPAddress(ip) in IPNetwork(qry):
-                        self.debug(f"{ip} found within netblock/subnet {qry} in cinsscore.com list.")
-                        return url
-                except Exception as e:
-                    self.debug(f"Error encountered parsing: {e}")
-                    continue
+        if targetType == "netblock":
+            ip = blocklist.matchNetwork(qry)
+            if ip:
+                self.debug(f"{ip} found within netblock/subnet {qry} in cinsscore.com list.")
+                return url
 
-            if targetType == "ip":
-                if qry.lower() == ip:
-                    self.debug(f"{qry} found in cinsscore.com list.")
-                    return url
+        if targetType == "ip":
+            if qry in blocklist:
+                self.debug(f"{qry} found in cinsscore.com list.")
+                return url
 
         return None
 
+    def parseBlocklist(self, blocklist):
+        """Parse plaintext block list
+
+        Args:
+            blocklist (str): plaintext block list from cinsscore.com
+
+        Returns:
+            list: list of blocked IP addresses
+        """
+        ips = list()
+
+        if not blocklist:
+            return ips
+
+        for line in blocklist.split('\n'):
+            ip = line.strip().lower()
+            if not ip:
+                continue
+            if ip.startswith('#'):
+                continue
+            ips.append(ip)
+
+        return ips
+
     def handleEvent(self, event):
         eventName = event.eventType
         eventData = event.data
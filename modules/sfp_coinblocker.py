@@ -10,7 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_coinblocker(SpiderFootPlugin):
@@ -94,7 +94,7 @@ class sfp_coinblocker(SpiderFootPlugin):
         blocklist = self.sf.cacheGet('coinblocker', self.opts.get('cacheperiod', 24))
 
         if blocklist is not None:
-            return self.parseBlocklist(blocklist)
+            return SpiderFootBlocklist.fromData('coinblocker', blocklist, self.parseBlocklist)
 
         url = "https://zerodot1.gitlab.io/CoinBlockerLists/list.txt"
         res = self.sf.fetchUrl(
@@ -115,7 +115,7 @@ class sfp_coinblocker(SpiderFootPlugin):
 
         self.sf.cachePut("coinblocker", res['content'])
 
-        return self.parseBlocklist(res['content'])
+        return SpiderFootBlocklist.fromData('coinblocker', res['content'], self.parseBlocklist)
 
     def parseBlocklist(self, blocklist):
         """Parse plaintext CoinBlocker list
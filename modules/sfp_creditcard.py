@@ -19,7 +19,7 @@ class sfp_creditcard(SpiderFootPlugin):
     meta = {
         'name': "Credit Card Number Extractor",
         'summary': "Identify Credit Card Numbers in any data",
-        'flags': ["errorprone"],
+        'flags': ["errorprone", "cpubound"],
         'useCases': ["Footprint", "Investigate", "Passive"],
         'categories': ["Content Analysis"]
     }
@@ -13,7 +13,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
@@ -33,7 +32,10 @@ class sfp_crobat_api(SpiderFootPlugin):
             'logo': "https://sonar.omnisint.io/img/crobat.png",
             'description': "The entire Rapid7 Sonar DNS dataset indexed,"
                 " available at your fingertips.",
-        }
+        },
+        'rateLimits': {
+            'sonar.omnisint.io': 'delay',
+        },
     }
 
     opts = {
@@ -80,8 +82,6 @@ class sfp_crobat_api(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
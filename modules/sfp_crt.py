@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.parse
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
@@ -36,7 +35,10 @@ class sfp_crt(SpiderFootPlugin):
             'favIcon': "https://crt.sh/sectigo_s.png",
             'logo': "https://crt.sh/sectigo_s.png",
             'description': "Free CT Log Certificate Search Tool from Sectigo (formerly Comodo CA)."
-        }
+        },
+        'rateLimits': {
+            'crt.sh': 0.5,
+        },
     }
 
     opts = {
@@ -88,8 +90,6 @@ class sfp_crt(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(0.5)
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
@@ -198,8 +198,6 @@ class sfp_crt(SpiderFootPlugin):
                 useragent=self.opts['_useragent']
             )
 
-            time.sleep(0.5)
-
             if not res or not res['content']:
                 self.error(f"Error retrieving certificate with ID {cert_id}. No response from crt.sh")
                 continue
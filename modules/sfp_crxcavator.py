@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -35,7 +34,10 @@ class sfp_crxcavator(SpiderFootPlugin):
             'description': "CRXcavator automatically scans the entire Chrome Web "
                 "Store every 3 hours and produces a quantified risk score for "
                 "each Chrome Extension based on several factors.",
-        }
+        },
+        'rateLimits': {
+            'api.crxcavator.io': 1,
+        },
     }
 
     opts = {
@@ -84,8 +86,6 @@ class sfp_crxcavator(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout']
         )
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
@@ -108,8 +108,6 @@ class sfp_crxcavator(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout']
         )
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
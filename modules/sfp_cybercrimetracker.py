@@ -10,7 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_cybercrimetracker(SpiderFootPlugin):
@@ -99,7 +99,7 @@ class sfp_cybercrimetracker(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('cybercrime-tracker', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('cybercrime-tracker', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "https://cybercrime-tracker.net/all.php",
@@ -119,7 +119,7 @@ class sfp_cybercrimetracker(SpiderFootPlugin):
 
         self.sf.cachePut("cybercrime-tracker", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('cybercrime-tracker', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
@@ -44,7 +44,10 @@ class sfp_dehashed(SpiderFootPlugin):
             "security analysts, journalists, security companies, "
             "and everyday people to help secure accounts and provide insight on compromised assets. "
             "Free breach alerts & breach notifications.",
-        }
+        },
+        'rateLimits': {
+            'api.dehashed.com': 'pause',
+        },
     }
 
     # Default options
@@ -111,8 +114,6 @@ class sfp_dehashed(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                verify=True)
 
-        time.sleep(self.opts['pause'])
-
         if res['code'] == "400":
             self.error("Too many requests were performed in a small amount of time. Please wait a bit before querying the API.")
             time.sleep(5)
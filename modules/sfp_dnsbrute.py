@@ -12,9 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import importlib
-import random
-import threading
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -37,6 +34,7 @@ class sfp_dnsbrute(SpiderFootPlugin):
         "top10000": False,
         "numbersuffix": True,
         "numbersuffixlimit": True,
+        "maxqps": 0,
         "_maxthreads": 100
     }
 
@@ -48,19 +46,18 @@ class sfp_dnsbrute(SpiderFootPlugin):
         'top10000': "Try a further 10,000 common hostnames/sub-domains. Will make the scan much slower.",
         'numbersuffix': "For any host found, try appending 1, 01, 001, -1, -01, -001, 2, 02, etc. (up to 10)",
         'numbersuffixlimit': "Limit using the number suffixes for hosts that have already been resolved? If disabled this will significantly extend the duration of scans.",
-        "_maxthreads": "Maximum threads"
+        'maxqps': "Maximum number of DNS lookups per second. 0 for no limit.",
+        "_maxthreads": "Maximum number of hosts to look up at once"
     }
 
     events = None
     sublist = None
-    lock = None
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
         self.sublist = self.tempStorage()
         self.events = self.tempStorage()
         self.__dataSource__ = "DNS"
-        self.lock = threading.Lock()
 
         for opt in list(userOpts.keys()):
             self.opts[opt] = userOpts[opt]
@@ -90,44 +87,30 @@ class sfp_dnsbrute(SpiderFootPlugin):
     def producedEvents(self):
         return ["INTERNET_NAME"]
 
-    def tryHost(self, name):
-        try:
-            if self.sf.resolveHost(name) or self.sf.resolveHost6(name):
-                with self.lock:
-                    self.hostResults[name] = True
-        except Exception:
-            with self.lock:
-                self.hostResults[name] = False
-
     def tryHostWrapper(self, hostList, sourceEvent):
-        self.hostResults = dict()
-        running = True
-        i = 0
-        t = []
-
-        # Spawn threads for scanning
-        self.info("Spawning threads to check hosts: " + str(hostList))
-        for name in hostList:
-            tn = 'thread_sfp_dnsbrute_' + str(random.SystemRandom().randint(1, 999999999))
-            t.append(threading.Thread(name=tn, target=self.tryHost, args=(name,)))
-            t[i].start()
-            i += 1
-
-        # Block until all threads are finished
-        while running:
-            found = False
-            for rt in threading.enumerate():
-                if rt.name.startswith("thread_sfp_dnsbrute_"):
-                    found = True
-
-            if not found:
-                running = False
-
-            time.sleep(0.05)
-
-        for res in self.hostResults:
-            if self.hostResults.get(res, False):
-                self.sendEvent(sourceEvent, res)
+        self.info(f"Checking {len(hostList)} hosts")
+        found = set()
+
+        # Report hosts as soon as they resolve
+        def resolved(host, answer):
+            if self.checkForStop():
+                return False
+
+            _, addrs = answer
+            if addrs and host not in found:
+                found.add(host)
+                self.sendEvent(sourceEvent, host)
+
+            return True
+
+        self.sf.resolver.queryMany(hostList, 'A', callback=resolved, concurrency=self.opts['_maxthreads'], maxRate=self.opts['maxqps'])
+
+        if self.checkForStop():
+            return
+
+        # Look up IPv6 addresses only for hosts without IPv4 addresses
+        unresolved = [host for host in hostList if host not in found]
+        self.sf.resolver.queryMany(unresolved, 'AAAA', callback=resolved, concurrency=self.opts['_maxthreads'], maxRate=self.opts['maxqps'])
 
     # Store the result internally and notify listening modules
     def sendEvent(self, source, result):
@@ -193,30 +176,15 @@ class sfp_dnsbrute(SpiderFootPlugin):
             self.debug("Wildcard DNS detected.")
             return
 
-        targetList = list()
-        for sub in self.sublist:
-            if self.checkForStop():
-                return
-
-            name = f"{sub}.{eventData}"
-
-            if len(targetList) <= self.opts['_maxthreads']:
-                targetList.append(name)
-            else:
-                self.tryHostWrapper(targetList, event)
-                targetList = list()
+        self.tryHostWrapper([f"{sub}.{eventData}" for sub in self.sublist], event)
 
-        # Scan whatever may be left over.
-        if len(targetList) > 0:
-            self.tryHostWrapper(targetList, event)
+        if self.checkForStop():
+            return
 
         if self.opts['numbersuffix'] and not self.opts['numbersuffixlimit']:
             nextsubs = dict()
             dom = "." + eventData
             for s in self.sublist:
-                if self.checkForStop():
-                    return
-
                 for i in range(10):
                     nextsubs[s + str(i) + dom] = True
                     nextsubs[s + "0" + str(i) + dom] = True
@@ -225,13 +193,7 @@ class sfp_dnsbrute(SpiderFootPlugin):
                     nextsubs[s + "-0" + str(i) + dom] = True
                     nextsubs[s + "-00" + str(i) + dom] = True
 
-                if len(list(nextsubs.keys())) >= self.opts['_maxthreads']:
-                    self.tryHostWrapper(list(nextsubs.keys()), event)
-                    nextsubs = dict()
-
-            # Scan whatever may be left over.
-            if len(nextsubs) > 0:
-                self.tryHostWrapper(list(nextsubs.keys()), event)
+            self.tryHostWrapper(list(nextsubs.keys()), event)
 
 
 # End of sfp_dnsbrute class
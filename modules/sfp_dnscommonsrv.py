@@ -11,8 +11,6 @@
 # Licence:     MIT
 # -----------------------------------------------------------------------------
 
-import dns.resolver
-
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
 
@@ -106,27 +104,19 @@ class sfp_dnscommonsrv(SpiderFootPlugin):
 
         self.events[eventDataHash] = True
 
-        res = dns.resolver.Resolver()
-        if self.opts.get('_dnsserver', "") != "":
-            res.nameservers = [self.opts['_dnsserver']]
-
         self.debug("Iterating through possible SRV records.")
 
-        # Try resolving common names
+        # Skip hosts we've processed already
+        names = list()
         for srv in self.commonsrv:
-            if self.checkForStop():
-                return
-
             name = srv + "." + eventData
+            if self.sf.hashstring(name) not in self.events:
+                names.append(name)
 
-            # Skip hosts we've processed already
-            if self.sf.hashstring(name) in self.events:
-                continue
-
-            try:
-                answers = res.query(name, 'SRV', timeout=10)
-            except Exception:
-                answers = []
+        # Try resolving common names
+        for name, (_, answers) in self.sf.resolver.queryMany(names, 'SRV').items():
+            if self.checkForStop():
+                return
 
             if not answers:
                 continue
@@ -140,8 +130,8 @@ class sfp_dnscommonsrv(SpiderFootPlugin):
             self.notifyListeners(evt)
 
             for a in answers:
-                # Strip off the trailing .
-                tgt_clean = a.target.to_text().rstrip(".")
+                # Records are "priority weight port target"
+                tgt_clean = a.split()[-1]
 
                 if self.getTarget().matches(tgt_clean):
                     evt_type = "INTERNET_NAME"
@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -47,7 +46,10 @@ class sfp_emailcrawlr(SpiderFootPlugin):
             "Find all email addresses associated with a domain.\n"
             "Get social accounts associated with an email.\n"
             "Verify email address deliverability.",
-        }
+        },
+        'rateLimits': {
+            'api.emailcrawlr.com': 'delay',
+        },
     }
 
     # Default options
@@ -101,8 +103,6 @@ class sfp_emailcrawlr(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Parse API response
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -42,7 +41,11 @@ class sfp_emailrep(SpiderFootPlugin):
             "presence on social media sites, professional networking sites, personal connections, "
             "public records, deliverability, data breaches, dark web credential leaks, "
             "phishing emails, threat actor emails, and more to answer these types of questions.",
-        }
+        },
+        'rateLimits': {
+            # Documentation does not indicate rate limit threshold (50 queries/day)
+            'emailrep.io': 1,
+        },
     }
 
     opts = {
@@ -87,9 +90,6 @@ class sfp_emailrep(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout']
         )
 
-        # Documentation does not indicate rate limit threshold (50 queries/day)
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -42,7 +41,10 @@ class sfp_etherscan(SpiderFootPlugin):
             'logo': "https://etherscan.io/images/brandassets/etherscan-logo-circle.png",
             'description': "Etherscan allows you to explore and search the Ethereum blockchain "
             "for transactions, addresses, tokens, prices and other activities taking place on Ethereum (ETH)",
-        }
+        },
+        'rateLimits': {
+            'api.etherscan.io': 'pause',
+        },
     }
 
     # Default options
@@ -88,8 +90,6 @@ class sfp_etherscan(SpiderFootPlugin):
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['pause'])
-
         if res['content'] is None:
             self.info(f"No Etherscan data found for {qry}")
             return None
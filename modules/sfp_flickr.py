@@ -13,7 +13,6 @@
 
 import json
 import re
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -47,7 +46,10 @@ class sfp_flickr(SpiderFootPlugin):
                            "are accompanied by a longstanding API program. "
                            "Since 2005, developers have collaborated on top of Flickr's APIs to build fun, creative, "
                            "and gorgeous experiences around photos that extend beyond Flickr.",
-        }
+        },
+        'rateLimits': {
+            'api.flickr.com': 'pause',
+        },
     }
 
     # Default options
@@ -124,8 +126,6 @@ class sfp_flickr(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                timeout=self.opts['_fetchtimeout'])
 
-        time.sleep(self.opts['pause'])
-
         try:
             return json.loads(res['content'])
         except Exception as e:
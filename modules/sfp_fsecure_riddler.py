@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -43,7 +42,10 @@ class sfp_fsecure_riddler(SpiderFootPlugin):
             "ensuring an in-depth quality data set you will not find anywhere else.\n"
             "Use Riddler to enumerate possible attack vectors during your pen-test or use the very same data "
             "to monitor potential threats before it is too late.",
-        }
+        },
+        'rateLimits': {
+            'riddler.io': 1,
+        },
     }
 
     opts = {
@@ -135,8 +137,6 @@ class sfp_fsecure_riddler(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                timeout=self.opts['_fetchtimeout'])
 
-        time.sleep(1)
-
         if res['code'] in ["400", "401", "402", "403", "500"]:
             self.error(f"Unexpected HTTP response code {res['code']} from F-Secure Riddler")
             self.errorState = True
@@ -13,7 +13,6 @@
 
 import hashlib
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootHelpers, SpiderFootPlugin
 
@@ -38,7 +37,10 @@ class sfp_gravatar(SpiderFootPlugin):
             "appearing beside your name when you do things like comment or post on a blog.\n"
             "A Gravatar is a Globally Recognized Avatar. You upload it and create your profile just once, "
             "and then when you participate in any Gravatar-enabled site, your Gravatar image will automatically follow you there.",
-        }
+        },
+        'rateLimits': {
+            'secure.gravatar.com': 1,
+        },
     }
 
     # Default options
@@ -81,8 +83,6 @@ class sfp_gravatar(SpiderFootPlugin):
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             self.debug('No response from gravatar.com')
             return None
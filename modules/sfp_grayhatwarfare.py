@@ -10,7 +10,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
@@ -41,7 +40,10 @@ class sfp_grayhatwarfare(SpiderFootPlugin):
             'description': "It is a searchable database of open buckets."
             "Has up to million results of each bucket."
             "Full text search with binary logic (can search for keywords and also stopwords)",
-        }
+        },
+        'rateLimits': {
+            'buckets.grayhatwarfare.com': 'pause',
+        },
     }
 
     # Default options
@@ -103,8 +105,6 @@ class sfp_grayhatwarfare(SpiderFootPlugin):
             verify=True
         )
 
-        time.sleep(self.opts['pause'])
-
         if res['code'] != "200":
             self.error("Unable to fetch data from Grayhat Warfare API.")
             self.errorState = True
@@ -13,7 +13,6 @@
 
 import json
 import math
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -38,7 +37,10 @@ class sfp_grep_app(SpiderFootPlugin):
             'description': "grep.app searches code from over a half million public repositories on GitHub.\n"
             "It searches for the exact string you enter, including any punctuation or other characters.\n"
             "You can also search by regular expression, using the RE2 syntax.",
-        }
+        },
+        'rateLimits': {
+            'grep.app': 1,
+        },
     }
 
     # Default options
@@ -82,8 +84,6 @@ class sfp_grep_app(SpiderFootPlugin):
                                useragent=self.opts['_useragent'],
                                timeout=self.opts['_fetchtimeout'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
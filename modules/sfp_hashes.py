@@ -19,7 +19,7 @@ class sfp_hashes(SpiderFootPlugin):
     meta = {
         'name': "Hash Extractor",
         'summary': "Identify MD5 and SHA hashes in web content, files and more.",
-        'flags': [],
+        'flags': ["cpubound"],
         'useCases': ["Footprint", "Investigate", "Passive"],
         'categories': ["Content Analysis"]
     }
@@ -39,7 +39,11 @@ class sfp_haveibeenpwned(SpiderFootPlugin):
             'favIcon': "https://haveibeenpwned.com/favicon.ico",
             'logo': "https://haveibeenpwned.com/favicon.ico",
             'description': "Check if you have an account that has been compromised in a data breach.",
-        }
+        },
+        'rateLimits': {
+            # https://haveibeenpwned.com/API/v2#RateLimiting
+            'haveibeenpwned.com': 1.5,
+        },
     }
 
     # Default options
@@ -91,8 +95,6 @@ class sfp_haveibeenpwned(SpiderFootPlugin):
             hdrs['hibp-api-key'] = self.opts['api_key']
 
         while retry < 2:
-            # https://haveibeenpwned.com/API/v2#RateLimiting
-            time.sleep(1.5)
             res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'],
                                    useragent="SpiderFoot", headers=hdrs)
 
@@ -129,8 +131,6 @@ class sfp_haveibeenpwned(SpiderFootPlugin):
         retry = 0
 
         while retry < 2:
-            # https://haveibeenpwned.com/API/v2#RateLimiting
-            time.sleep(1.5)
             res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'],
                                    useragent="SpiderFoot", headers=headers)
 
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -42,7 +41,10 @@ class sfp_hybrid_analysis(SpiderFootPlugin):
             'logo': "https://www.hybrid-analysis.com/img/logo.svg",
             'description': "A free malware analysis service for the community. "
             "Using this service you can submit files for in-depth static and dynamic analysis.",
-        }
+        },
+        'rateLimits': {
+            'www.hybrid-analysis.com': 'delay',
+        },
     }
 
     # Default options
@@ -101,8 +103,6 @@ class sfp_hybrid_analysis(SpiderFootPlugin):
             postData=params
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def queryHost(self, qry):
@@ -130,8 +130,6 @@ class sfp_hybrid_analysis(SpiderFootPlugin):
             postData=params
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def queryHash(self, qry):
@@ -159,8 +157,6 @@ class sfp_hybrid_analysis(SpiderFootPlugin):
             postData=params
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
@@ -19,7 +19,7 @@ class sfp_iban(SpiderFootPlugin):
     meta = {
         'name': "IBAN Number Extractor",
         'summary': "Identify International Bank Account Numbers (IBANs) in any data.",
-        'flags': ["errorprone"],
+        'flags': ["errorprone", "cpubound"],
         'useCases': ["Footprint", "Investigate", "Passive"],
         'categories': ["Content Analysis"]
     }
@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -35,7 +34,10 @@ class sfp_ipapico(SpiderFootPlugin):
             'logo': "https://ipapi.co/static/images/favicon.34f0ec468301.png",
             'description': "Powerful & Simple REST API for IP Address Geolocation."
             "ipapi.co provides a REST API to find the location of an IP address.",
-        }
+        },
+        'rateLimits': {
+            'ipapi.co': 1.5,
+        },
     }
 
     # Default options
@@ -77,7 +79,6 @@ class sfp_ipapico(SpiderFootPlugin):
         res = self.sf.fetchUrl(queryString,
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'])
-        time.sleep(1.5)
 
         if res['content'] is None:
             self.info(f"No ipapi.co data found for {qry}")
@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -43,7 +42,10 @@ class sfp_ipapicom(SpiderFootPlugin):
             "to look various pieces of information IPv4 and IPv6 addresses are associated with. "
             "For each IP address processed, the API returns more than 45 unique data points, "
             "such as location data, connection data, ISP information, time zone, currency and security assessment data.",
-        }
+        },
+        'rateLimits': {
+            'api.ipapi.com': 1.5,
+        },
     }
 
     # Default options
@@ -87,7 +89,6 @@ class sfp_ipapicom(SpiderFootPlugin):
         res = self.sf.fetchUrl(queryString,
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'])
-        time.sleep(1.5)
 
         if res['code'] == "429":
             self.error("You are being rate-limited by IP-API.com.")
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -45,7 +44,10 @@ class sfp_jsonwhoiscom(SpiderFootPlugin):
             "Around 1000 gTLDs include .com, .org, .net, .us, .biz, .info, .mobi, .pro, .asia and many other new ones.\n"
             "Raw and parsed Whois data are both accessible for downloads in the form of "
             "MYSQL or MYSQL database dumps and Comma Separated Values (.CSV) files.",
-        }
+        },
+        'rateLimits': {
+            'jsonwhois.com': 'delay',
+        },
     }
 
     # Default options
@@ -100,8 +102,6 @@ class sfp_jsonwhoiscom(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Parse API response
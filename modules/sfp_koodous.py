@@ -12,7 +12,6 @@
 
 import json
 import re
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -43,7 +42,11 @@ class sfp_koodous(SpiderFootPlugin):
             'favIcon': "https://koodous.com/favicon.ico",
             'logo': "https://koodous.com/assets/img/koodous-logo.png",
             "description": "The Collaborative Platform for Android Malware Analysts."
-        }
+        },
+        'rateLimits': {
+            # 100 requests per minute
+            'developer.koodous.com': 1,
+        },
     }
 
     opts = {
@@ -93,9 +96,6 @@ class sfp_koodous(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout']
         )
 
-        # 100 requests per minute
-        time.sleep(1)
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
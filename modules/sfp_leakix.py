@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -42,7 +41,10 @@ class sfp_leakix(SpiderFootPlugin):
             'description': "LeakIX provides insights into devices and servers that are compromised "
             "and compromised database schemas online.\n"
             "In this scope we inspect found services for weak credentials.",
-        }
+        },
+        'rateLimits': {
+            'leakix.net': 'delay',
+        },
     }
 
     # Default options
@@ -95,8 +97,6 @@ class sfp_leakix(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Parse API response
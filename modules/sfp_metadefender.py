@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -41,7 +40,10 @@ class sfp_metadefender(SpiderFootPlugin):
             'description': "File Analysis - Analyzing binaries with 30+ anti-malware engines.\n"
             "Heuristic analysis to detect more unknown and targeted attacks.\n"
             "Binary vulnerability data assessment, IP/Domain reputation, Threat Intelligence Feeds",
-        }
+        },
+        'rateLimits': {
+            'api.metadefender.com': 'delay',
+        },
     }
 
     # Default options
@@ -96,8 +98,6 @@ class sfp_metadefender(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query ip REST API
@@ -112,8 +112,6 @@ class sfp_metadefender(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Parse API response
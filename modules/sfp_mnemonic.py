@@ -44,7 +44,11 @@ class sfp_mnemonic(SpiderFootPlugin):
             "threat researchers, incident responders and ethical hackers, combined "
             "with our Argus security platform ensures we stay ahead of "
             "advanced cyberattacks and protect our customers from evolving threats.",
-        }
+        },
+        'rateLimits': {
+            # Unauthenticated users are limited to 100 requests per minute, and 1000 requests per day.
+            'api.mnemonic.no': 0.75,
+        },
     }
 
     opts = {
@@ -121,9 +125,6 @@ class sfp_mnemonic(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        # Unauthenticated users are limited to 100 requests per minute, and 1000 requests per day.
-        time.sleep(0.75)
-
         if res['content'] is None:
             self.info("No results found for " + qry)
             return None
@@ -11,9 +11,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
-
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_multiproxy(SpiderFootPlugin):
@@ -97,11 +95,10 @@ class sfp_multiproxy(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in multiproxy.org open proxy list.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in proxy_list:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in multiproxy.org open proxy list.")
-                    return True
+            ip = proxy_list.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in multiproxy.org open proxy list.")
+                return True
 
         return False
 
@@ -109,7 +106,7 @@ class sfp_multiproxy(SpiderFootPlugin):
         proxy_list = self.sf.cacheGet('multiproxyopenproxies', 24)
 
         if proxy_list is not None:
-            return self.parseProxyList(proxy_list)
+            return SpiderFootBlocklist.fromData('multiproxyopenproxies', proxy_list, self.parseProxyList)
 
         res = self.sf.fetchUrl(
             "http://multiproxy.org/txt_all/proxy.txt",
@@ -129,7 +126,7 @@ class sfp_multiproxy(SpiderFootPlugin):
 
         self.sf.cachePut("multiproxyopenproxies", res['content'])
 
-        return self.parseProxyList(res['content'])
+        return SpiderFootBlocklist.fromData('multiproxyopenproxies', res['content'], self.parseProxyList)
 
     def parseProxyList(self, proxy_list):
         """Parse plaintext open proxy list
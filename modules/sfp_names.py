@@ -20,7 +20,7 @@ class sfp_names(SpiderFootPlugin):
     meta = {
         'name': "Human Name Extractor",
         'summary': "Attempt to identify human names in fetched content.",
-        'flags': ["errorprone"],
+        'flags': ["errorprone", "cpubound"],
         'useCases': ["Footprint", "Passive"],
         'categories': ["Content Analysis"]
     }
@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -45,7 +44,10 @@ class sfp_networksdb(SpiderFootPlugin):
             'description': "Our database contains information about the public IPv4 and IPv6 addresses, "
             "networks and domains owned by companies and organisations across the world "
             "along with city-level IP geolocation data and autonomous system information.",
-        }
+        },
+        'rateLimits': {
+            'networksdb.io': 'delay',
+        },
     }
     # Default options
     opts = {
@@ -105,8 +107,6 @@ class sfp_networksdb(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query IP Geolocation
@@ -126,8 +126,6 @@ class sfp_networksdb(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query Domains on IP (Reverse DNS)
@@ -147,8 +145,6 @@ class sfp_networksdb(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query IPs for Domain (Forward DNS)
@@ -168,8 +164,6 @@ class sfp_networksdb(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query Autonomous System Info
@@ -190,8 +184,6 @@ class sfp_networksdb(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query Autonomous System Networks
@@ -212,8 +204,6 @@ class sfp_networksdb(SpiderFootPlugin):
                                timeout=15,
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Parse API response
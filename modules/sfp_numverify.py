@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -47,7 +46,10 @@ class sfp_numverify(SpiderFootPlugin):
             "national and international phone number validation and information lookup for a total of 232 countries around the world.\n"
             "Requested numbers are processed in real-time, cross-checked with the latest international numbering plan databases "
             "and returned in handy JSON format enriched with useful carrier, geographical location and line type data.",
-        }
+        },
+        'rateLimits': {
+            'apilayer.net': 1,
+        },
     }
 
     # Default options
@@ -96,8 +98,6 @@ class sfp_numverify(SpiderFootPlugin):
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             self.debug('No response from apilayer.net')
             return None
@@ -10,7 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_openphish(SpiderFootPlugin):
@@ -93,7 +93,7 @@ class sfp_openphish(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('openphish', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('openphish', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "https://www.openphish.com/feed.txt",
@@ -113,7 +113,7 @@ class sfp_openphish(SpiderFootPlugin):
 
         self.sf.cachePut("openphish", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('openphish', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
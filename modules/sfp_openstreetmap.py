@@ -13,7 +13,6 @@
 
 import json
 import re
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -39,7 +38,11 @@ class sfp_openstreetmap(SpiderFootPlugin):
             'favIcon': "https://www.openstreetmap.org/assets/osm_logo-b7061f13a03615f787a7e0e56a0db5252eb2a217ab063183e78526a8cc10989b.svg",
             'logo': "https://www.openstreetmap.org/assets/osm_logo-b7061f13a03615f787a7e0e56a0db5252eb2a217ab063183e78526a8cc10989b.svg",
             'description': "OpenStreetMap powers map data on thousands of web sites, mobile apps, and hardware devices.",
-        }
+        },
+        'rateLimits': {
+            # Usage Policy mandates no more than 1 request per second
+            'nominatim.openstreetmap.org': 1,
+        },
     }
 
     opts = {
@@ -121,9 +124,6 @@ class sfp_openstreetmap(SpiderFootPlugin):
         # Search for address
         data = self.query(eventData)
 
-        # Usage Policy mandates no more than 1 request per second
-        time.sleep(1)
-
         if data is None:
             self.debug("Found no results for " + eventData)
             return
@@ -12,8 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import random
-import threading
-import time
 
 from netaddr import IPNetwork
 
@@ -48,7 +46,7 @@ class sfp_portscan_tcp(SpiderFootPlugin):
 
     # Option descriptions
     optdescs = {
-        'maxthreads': "Number of ports to try to open simultaneously (number of threads to spawn at once.)",
+        'maxthreads': "Number of ports to try to open simultaneously on each IP address.",
         'ports': r"The TCP ports to scan. Prefix with an '@' to iterate through a file containing ports to try (one per line), e.g. @C:\ports.txt or @/home/bob/ports.txt. Or supply a URL to load the list from there.",
         'timeout': "Seconds before giving up on a port.",
         'randomize': "Randomize the order of ports scanned.",
@@ -58,15 +56,13 @@ class sfp_portscan_tcp(SpiderFootPlugin):
 
     results = None
     portlist = list()
-    portResults = dict()
-    lock = None
     errorState = False
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
         self.results = self.tempStorage()
+        self.portlist = list()
         self.__dataSource__ = "Target Network"
-        self.lock = threading.Lock()
 
         for opt in list(userOpts.keys()):
             self.opts[opt] = userOpts[opt]
@@ -101,59 +97,6 @@ class sfp_portscan_tcp(SpiderFootPlugin):
     def producedEvents(self):
         return ["TCP_PORT_OPEN", "TCP_PORT_OPEN_BANNER"]
 
-    def tryPort(self, ip, port):
-        peer = f"{ip}:{port}"
-
-        try:
-            sock = self.sf.safeSocket(ip, port, self.opts['timeout'])
-            with self.lock:
-                self.portResults[peer] = True
-        except Exception:
-            with self.lock:
-                self.portResults[peer] = False
-            return
-
-        # If the port was open, see what we can read
-        try:
-            with self.lock:
-                self.portResults[peer] = sock.recv(4096)
-        except Exception:
-            sock.close()
-            return
-        else:
-            if not self.portResults[peer]:
-                # No banner, but port is open
-                self.portResults[peer] = True
-
-        sock.close()
-
-    def tryPortWrapper(self, ip, portList):
-        self.portResults = dict()
-        running = True
-        i = 0
-        t = []
-
-        # Spawn threads for scanning
-        while i < len(portList):
-            port = portList[i]
-            self.info(f"Spawning thread to check port: {port} on {ip}")
-            t.append(threading.Thread(name=f"sfp_portscan_tcp_{port}", target=self.tryPort, args=(ip, port)))
-            t[i].start()
-            i += 1
-
-        # Block until all threads are finished
-        while running:
-            found = False
-            for rt in threading.enumerate():
-                if rt.name.startswith("sfp_portscan_tcp_"):
-                    found = True
-
-            if not found:
-                running = False
-            time.sleep(0.25)
-
-        return self.portResults
-
     # Generate TCP_PORT_OPEN_BANNER event
     def sendEvent(self, resArray, srcEvent):
         for cp in resArray:
@@ -211,31 +154,29 @@ class sfp_portscan_tcp(SpiderFootPlugin):
         else:
             scanIps.append(eventData)
 
+        ipsToScan = list()
         for ipAddr in set(scanIps):
             if ipAddr in self.results:
                 self.debug(f"Skipping {ipAddr} as already scanned.")
-                return
+                continue
 
             self.results[ipAddr] = True
+            ipsToScan.append(ipAddr)
+
+        if not ipsToScan:
+            return
 
-            self.info(f"Scanning {len(set(self.portlist))} ports on {ipAddr}")
+        self.info(f"Scanning {len(self.portlist)} ports on {len(ipsToScan)} IP addresses")
 
-            i = 0
-            portArr = []
-            for port in self.portlist:
+        # Report the open ports of each IP address as soon as it is scanned
+        scan = self.sf.portScanner.scan(ipsToScan, self.portlist, self.opts['timeout'], self.opts['maxthreads'])
+        try:
+            for ipAddr, openPorts in scan:
                 if self.checkForStop():
                     return
 
-                if i < self.opts['maxthreads']:
-                    portArr.append(port)
-                else:
-                    self.sendEvent(self.tryPortWrapper(ipAddr, portArr), event)
-                    i = 0
-                    portArr = [port]
-
-                i += 1
-
-            # Scan whatever is remaining
-            self.sendEvent(self.tryPortWrapper(ipAddr, portArr), event)
+                self.sendEvent({f"{ipAddr}:{port}": banner or True for port, banner in openPorts.items()}, event)
+        finally:
+            scan.close()
 
 # End of sfp_portscan_tcp class
@@ -47,7 +47,10 @@ class sfp_pulsedive(SpiderFootPlugin):
             'description': "Why check 30 different solutions for varying snippets of data when you can just check one? "
             "Pulsedive enriches IOCs but also fetches article summaries from Wikipedia and "
             "even posts from Reddit and the infosec blogosphere to provide contextual information for threats.",
-        }
+        },
+        'rateLimits': {
+            'pulsedive.com': 'delay',
+        },
     }
 
     # Default options
@@ -119,8 +122,6 @@ class sfp_pulsedive(SpiderFootPlugin):
         url = 'https://pulsedive.com/api/info.php?' + urllib.parse.urlencode(params)
         res = self.sf.fetchUrl(url, timeout=30, useragent="SpiderFoot")
 
-        time.sleep(self.opts['delay'])
-
         if res['code'] == '429':
             self.error("You are being rate-limited by Pulsedive")
             self.errorState = True
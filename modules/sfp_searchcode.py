@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -35,7 +34,10 @@ class sfp_searchcode(SpiderFootPlugin):
             'website': "https://searchcode.com/",
             'logo': "https://searchcode.com/static/small_logo.png",
             'description': "Simple, comprehensive code search."
-        }
+        },
+        'rateLimits': {
+            'searchcode.com': 2,
+        },
     }
 
     opts = {
@@ -85,8 +87,6 @@ class sfp_searchcode(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout']
         )
 
-        time.sleep(2)
-
         if res['content'] is None:
             return None
 
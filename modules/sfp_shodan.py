@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -48,7 +47,10 @@ class sfp_shodan(SpiderFootPlugin):
             "Use Shodan to discover which of your devices are connected to the Internet, where they are located and who is using them."
             "Keep track of all the computers on your network that are directly accessible from the Internet. "
             "Shodan lets you understand your digital footprint.",
-        }
+        },
+        'rateLimits': {
+            'api.shodan.io': 1,
+        },
     }
 
     # Default options
@@ -94,7 +96,6 @@ class sfp_shodan(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout'],
             useragent="SpiderFoot"
         )
-        time.sleep(1)
 
         if res['code'] in ["403", "401"]:
             self.error("SHODAN API key seems to have been rejected or you have exceeded usage limits.")
@@ -128,7 +129,6 @@ class sfp_shodan(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout'],
             useragent="SpiderFoot"
         )
-        time.sleep(1)
 
         if res['code'] in ["403", "401"]:
             self.error("SHODAN API key seems to have been rejected or you have exceeded usage limits.")
@@ -162,7 +162,6 @@ class sfp_shodan(SpiderFootPlugin):
             timeout=self.opts['_fetchtimeout'],
             useragent="SpiderFoot"
         )
-        time.sleep(1)
 
         if res['code'] in ["403", "401"]:
             self.error("SHODAN API key seems to have been rejected or you have exceeded usage limits.")
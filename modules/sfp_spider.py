@@ -11,10 +11,10 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
+import asyncio
 import json
-import time
 
-from spiderfoot import SpiderFootEvent, SpiderFootHelpers, SpiderFootPlugin
+from spiderfoot import SpiderFootCrawler, SpiderFootEvent, SpiderFootHelpers, SpiderFootPlugin
 
 
 class sfp_spider(SpiderFootPlugin):
@@ -30,7 +30,8 @@ class sfp_spider(SpiderFootPlugin):
     # Default options
     opts = {
         'robotsonly': False,  # only follow links specified by robots.txt
-        'pausesec': 0,  # number of seconds to pause between fetches
+        'pausesec': 0,  # number of seconds to pause between fetches from a host
+        'hostconcurrency': 4,  # max number of pages to fetch at once from a host
         'maxpages': 100,  # max number of pages to fetch
         'maxlevels': 3,  # max number of levels to traverse within a site
         'usecookies': True,  # Use cookies?
@@ -43,14 +44,18 @@ class sfp_spider(SpiderFootPlugin):
         'filtermime': ['image/'],
         'filterusers': True,  # Don't follow /~user directories
         'nosubs': False,  # Should links to subdomains be ignored?
-        'reportduplicates': False
+        'reportduplicates': False,
+        'cachepages': False,  # Send conditional requests for pages cached with an ETag or Last-Modified header
+        'cacheage': 24,  # number of hours to keep cached pages for
+        'cachemaxsize': 1000000  # max size of a page to cache, in characters
     }
 
     # Option descriptions
     optdescs = {
         'robotsonly': "Only follow links specified by robots.txt?",
         'usecookies': "Accept and use cookies?",
-        'pausesec': "Number of seconds to pause between page fetches.",
+        'pausesec': "Number of seconds to pause between page fetches from each host.",
+        'hostconcurrency': "Maximum number of pages to fetch at once from each host.",
         'start': "Prepend targets with these until you get a hit, to start spidering.",
         'maxpages': "Maximum number of pages to fetch per starting point identified.",
         'maxlevels': "Maximum levels to traverse per starting point (e.g. hostname or link identified by another module) identified.",
@@ -58,15 +63,22 @@ class sfp_spider(SpiderFootPlugin):
         'filtermime': "MIME types to ignore.",
         'filterusers': "Skip spidering of /~user directories?",
         'nosubs': "Skip spidering of subdomains of the target?",
-        'reportduplicates': "Report links every time one is found, even if found before?"
+        'reportduplicates': "Report links every time one is found, even if found before?",
+        'cachepages': "Cache pages with an ETag or Last-Modified header, and ask sites to only send them again if they have changed?",
+        'cacheage': "Number of hours to keep cached pages for.",
+        'cachemaxsize': "Maximum size of a page to cache, in characters. Larger pages are not cached."
     }
 
     # If using robots.txt, this will get populated with filter rules
+    # (see SpiderFootCrawler.robotsMatcher())
     robotsRules = dict()
 
-    # Pages already fetched
+    # Hashes of pages already fetched (see SpiderFootCrawler.urlHash())
     fetchedPages = None
 
+    # File extensions not to fetch, from the filterfiles option
+    filterExtensions = None
+
     # Events for links identified
     urlEvents = None
 
@@ -75,7 +87,7 @@ class sfp_spider(SpiderFootPlugin):
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
-        self.fetchedPages = self.tempStorage()
+        self.fetchedPages = set()
         self.urlEvents = self.tempStorage()
         self.siteCookies = self.tempStorage()
         self.__dataSource__ = "Target Website"
@@ -83,6 +95,8 @@ class sfp_spider(SpiderFootPlugin):
         for opt in list(userOpts.keys()):
             self.opts[opt] = userOpts[opt]
 
+        self.filterExtensions = tuple('.' + ext.lower() for ext in self.opts['filterfiles'])
+
     # Search engines and DNS lookups provide INTERNET_NAME.
     def watchedEvents(self):
         return ["LINKED_URL_INTERNAL", "INTERNET_NAME"]
@@ -98,37 +112,98 @@ class sfp_spider(SpiderFootPlugin):
             "TARGET_WEB_CONTENT_TYPE"
         ]
 
-    def processUrl(self, url: str) -> dict:
-        """Fetch data from a URL and obtain all links that should be followed.
+    def filteredFile(self, url: str) -> bool:
+        """Whether a URL is of a file type not to fetch.
+
+        Args:
+            url (str): URL
+
+        Returns:
+            bool: URL has a filtered file extension
+        """
+        return url.lower().split('?')[0].endswith(self.filterExtensions)
+
+    # Label of a page in the cache
+    def cacheLabel(self, url: str) -> str:
+        return "sfp_spider " + SpiderFootCrawler.canonicalUrl(url)
+
+    def fetchPage(self, url: str) -> dict:
+        """Fetch a URL, sending back the cookies of its site.
+
+        If the page was cached with an ETag or Last-Modified header, the
+        site is asked to only send the page if it has changed, and the
+        cached page is returned if it has not.
 
         Args:
             url (str): URL to fetch
 
         Returns:
-            dict: links identified in URL content
+            dict: HTTP response
         """
         site = self.sf.urlFQDN(url)
         cookies = None
 
-        # Filter out certain file types (if user chooses to)
-        if list(filter(lambda ext: url.lower().split('?')[0].endswith('.' + ext.lower()), self.opts['filterfiles'])):
-            # self.debug(f"Ignoring URL with filtered file extension: {link}")
-            return None
-
         if site in self.siteCookies:
             self.debug(f"Restoring cookies for {site}: {self.siteCookies[site]}")
             cookies = self.siteCookies[site]
 
+        cached = None
+        headers = None
+        if self.opts['cachepages']:
+            cached = self.sf.cacheGet(self.cacheLabel(url), self.opts['cacheage'])
+            if cached:
+                cached = json.loads(cached)
+                headers = dict()
+                if cached['headers'].get('etag'):
+                    headers['If-None-Match'] = cached['headers']['etag']
+                if cached['headers'].get('last-modified'):
+                    headers['If-Modified-Since'] = cached['headers']['last-modified']
+
         # Fetch the contents of the supplied URL
+        sizeLimit = 10000000
         fetched = self.sf.fetchUrl(
             url,
             cookies=cookies,
             timeout=self.opts['_fetchtimeout'],
             useragent=self.opts['_useragent'],
-            sizeLimit=10000000,
+            headers=headers,
+            sizeLimit=sizeLimit,
             verify=False
         )
-        self.fetchedPages[url] = True
+
+        if not fetched or not self.opts['cachepages']:
+            return fetched
+
+        if cached and fetched['code'] == "304":
+            self.debug(f"{url} has not changed, using cached content.")
+            return dict(cached, realurl=fetched['realurl'] or url)
+
+        fetchedHeaders = fetched['headers'] or dict()
+        if fetched['code'] == "200" and isinstance(fetched['content'], str) \
+                and len(fetched['content']) <= min(self.opts['cachemaxsize'], sizeLimit) \
+                and (fetchedHeaders.get('etag') or fetchedHeaders.get('last-modified')):
+            self.sf.cachePut(self.cacheLabel(url), json.dumps({
+                'code': fetched['code'],
+                'status': fetched['status'],
+                'content': fetched['content'],
+                'headers': fetchedHeaders,
+                'realurl': fetched['realurl'],
+            }))
+
+        return fetched
+
+    def processUrl(self, url: str, fetched: dict) -> dict:
+        """Notify modules of the content fetched from a URL and obtain all
+        links that should be followed.
+
+        Args:
+            url (str): URL fetched
+            fetched (dict): HTTP response
+
+        Returns:
+            dict: links identified in URL content
+        """
+        site = self.sf.urlFQDN(url)
 
         if not fetched:
             return None
@@ -151,7 +226,7 @@ class sfp_spider(SpiderFootPlugin):
         if real_url and real_url != url:
             # self.debug(f"Redirect of {url} to {real_url}")
             # Store the content for the redirect so that it isn't fetched again
-            self.fetchedPages[real_url] = True
+            self.fetchedPages.add(SpiderFootCrawler.urlHash(real_url))
             # Notify modules about the new link
             self.urlEvents[real_url] = self.linkNotify(real_url, self.urlEvents[url])
             url = real_url  # override the URL if we had a redirect
@@ -200,6 +275,11 @@ class sfp_spider(SpiderFootPlugin):
         returnLinks = dict()
 
         for link in links:
+            # Filter out certain file types (if user chooses to)
+            if self.filteredFile(link):
+                # self.debug(f"Ignoring URL with filtered file extension: {link}")
+                continue
+
             linkBase = SpiderFootHelpers.urlBaseUrl(link)
             linkFQDN = self.sf.urlFQDN(link)
 
@@ -225,8 +305,8 @@ class sfp_spider(SpiderFootPlugin):
                 continue
 
             # If we are respecting robots.txt, filter those out too
-            if linkBase in self.robotsRules and self.opts['robotsonly']:
-                if list(filter(lambda blocked: type(blocked).lower(blocked) in link.lower() or blocked == '*', self.robotsRules[linkBase])):
+            if self.robotsRules.get(linkBase) is not None and self.opts['robotsonly']:
+                if self.robotsRules[linkBase].search(link.lower()):
                     # self.debug("Ignoring page found in robots.txt: " + link)
                     continue
 
@@ -359,9 +439,6 @@ class sfp_spider(SpiderFootPlugin):
         return self.spiderFrom(spiderTarget)
 
     def spiderFrom(self, startingPoint: str) -> None:
-        pagesFetched = 0
-        levelsTraversed = 0
-
         # Are we respecting robots.txt?
         if self.opts['robotsonly']:
             targetBase = SpiderFootHelpers.urlBaseUrl(startingPoint)
@@ -376,49 +453,45 @@ class sfp_spider(SpiderFootPlugin):
                     robots_txt = res['content']
                     if robots_txt:
                         self.debug(f"robots.txt contents: {robots_txt}")
-                        self.robotsRules[targetBase] = SpiderFootHelpers.extractUrlsFromRobotsTxt(robots_txt)
+                        self.robotsRules[targetBase] = SpiderFootCrawler.robotsMatcher(SpiderFootHelpers.extractUrlsFromRobotsTxt(robots_txt))
 
-        # First iteration we are starting with the target link.
-        nextLinks = [startingPoint]
+        if self.filteredFile(startingPoint):
+            self.debug(f"Ignoring {startingPoint} with filtered file extension.")
+            return
 
-        # Iterations after that are based on links found on those pages, while:
+        async def fetch(url: str) -> dict:
+            self.debug(f"Fetching fresh content from: {url}")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.sf.getFetchExecutor(), self.fetchPage, url)
+
+        def process(url: str, fetched: dict) -> list:
+            if not fetched:
+                return None
+            links = self.processUrl(url, fetched)
+            if not links:
+                return None
+            return self.cleanLinks(links)
+
+        # Pages are fetched lowest level first (the starting point is the
+        # first level), while:
         # number of spidered pages < max pages
-        # spidering depth <= max levels (the first level is the first link)
-        while (pagesFetched < self.opts['maxpages']) and (levelsTraversed <= self.opts['maxlevels']):
-            if not nextLinks:
-                self.info("No more links to spider, finishing.")
-                return
-
-            # Fetch content from the new links
-            links = dict()
-            for link in nextLinks:
-                if self.checkForStop():
-                    return
-
-                if link in self.fetchedPages:
-                    self.debug(f"Already fetched {link}, skipping.")
-                    continue
-
-                self.debug(f"Fetching fresh content from: {link}")
-
-                time.sleep(self.opts['pausesec'])
-
-                freshLinks = self.processUrl(link)
-                if freshLinks:
-                    links.update(freshLinks)
-
-                pagesFetched += 1
-                if pagesFetched >= self.opts['maxpages']:
-                    self.info(f"Maximum number of pages ({self.opts['maxpages']}) reached.")
-                    return
-
-            nextLinks = self.cleanLinks(links)
-            self.debug(f"Found links: {nextLinks}")
+        # spidering depth <= max levels
+        crawler = SpiderFootCrawler(
+            fetch,
+            process,
+            seen=self.fetchedPages,
+            maxPages=self.opts['maxpages'],
+            maxLevels=self.opts['maxlevels'],
+            hostConcurrency=self.opts['hostconcurrency'],
+            pause=self.opts['pausesec'],
+            stop=self.checkForStop
+        )
+        crawler.add(startingPoint)
+        pagesFetched = asyncio.run(crawler.crawl())
 
-            # We've scanned through another layer of the site
-            levelsTraversed += 1
-            self.debug(f"At level: {levelsTraversed}, Pages: {pagesFetched}")
-            if levelsTraversed > self.opts['maxlevels']:
-                self.info(f"Maximum number of levels ({self.opts['maxlevels']}) reached.")
+        if pagesFetched >= self.opts['maxpages']:
+            self.info(f"Maximum number of pages ({self.opts['maxpages']}) reached.")
+        else:
+            self.info(f"No more links to spider, finishing after {pagesFetched} pages.")
 
 # End of sfp_spider class
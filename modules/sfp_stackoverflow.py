@@ -12,7 +12,6 @@
 
 import json
 import re
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootHelpers, SpiderFootPlugin
 
@@ -42,7 +41,10 @@ class sfp_stackoverflow(SpiderFootPlugin):
             'logo': "https://cdn.sstatic.net/Sites/stackoverflow/Img/apple-touch-icon.png",
             'description': "StackOverflow is a knowledge sharing public platform for IT professionals"
             "and students where users can post questions and get answers from other users."
-        }
+        },
+        'rateLimits': {
+            'api.stackexchange.com': 1,
+        },
     }
 
     # Default Options
@@ -94,7 +96,6 @@ class sfp_stackoverflow(SpiderFootPlugin):
                     timeout=self.opts['_fetchtimeout'],
                     useragent="SpiderFoot"
                 )
-                time.sleep(1)
             except Exception as e:
                 self.error(f"Error querying StackExchange API: {e}")
                 self.errorState = True
@@ -108,7 +109,6 @@ class sfp_stackoverflow(SpiderFootPlugin):
                     timeout=self.opts['_fetchtimeout'],
                     useragent="SpiderFoot"
                 )
-                time.sleep(1)
             except Exception as e:
                 self.error(f"Error querying StackExchange API: {e}")
                 self.errorState = True
@@ -11,7 +11,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_stevenblack_hosts(SpiderFootPlugin):
@@ -86,7 +86,7 @@ class sfp_stevenblack_hosts(SpiderFootPlugin):
         blocklist = self.sf.cacheGet('stevenblack_hosts', 24)
 
         if blocklist is not None:
-            return self.parseBlocklist(blocklist)
+            return SpiderFootBlocklist.fromData('stevenblack_hosts', blocklist, self.parseBlocklist)
 
         url = "https://raw.githubusercontent.com/StevenBlack/hosts/master/hosts"
         res = self.sf.fetchUrl(
@@ -107,7 +107,7 @@ class sfp_stevenblack_hosts(SpiderFootPlugin):
 
         self.sf.cachePut("stevenblack_hosts", res['content'])
 
-        return self.parseBlocklist(res['content'])
+        return SpiderFootBlocklist.fromData('stevenblack_hosts', res['content'], self.parseBlocklist)
 
     def parseBlocklist(self, blocklist):
         """Parse plaintext block list
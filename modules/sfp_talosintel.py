@@ -11,9 +11,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
-
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_talosintel(SpiderFootPlugin):
@@ -101,11 +99,10 @@ class sfp_talosintel(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in Talos Intelligence blacklist.")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in Talos Intelligence blacklist.")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in Talos Intelligence blacklist.")
+                return True
 
         return False
 
@@ -113,7 +110,7 @@ class sfp_talosintel(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('talosintel', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('talosintel', blacklist, self.parseBlacklist)
 
         # https://talosintelligence.com/documents/ip-blacklist redirects to:
         # https://snort.org/downloads/ip-block-list
@@ -135,7 +132,7 @@ class sfp_talosintel(SpiderFootPlugin):
 
         self.sf.cachePut("talosintel", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('talosintel', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
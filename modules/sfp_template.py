@@ -345,12 +345,6 @@ class sfp_template(SpiderFootPlugin):
             # (event we generated above) -> RAW_RIR_DATA (event from the third
             # party about the IP Address we queried).
             evt = SpiderFootEvent("RAW_RIR_DATA", str(rec), self.__name__, pevent)
-            self.notifyListeners(evt)
-
-            # Whenever operating in a loop, call this to check whether the user
-            # requested the scan to be aborted.
-            if self.checkForStop():
-                return
 
             # In some cases, you want to override the data source for the event
             # you're producing to be the data source of the event that you've
@@ -360,7 +354,8 @@ class sfp_template(SpiderFootPlugin):
             # itself! sfp_email is a good example, since it is purely looking
             # for e-mail addresses in received content, so an EMAILADDR event
             # should have a data source of whatever place the EMAILADDR was
-            # actually found in. This is how you'd achieve that:
+            # actually found in. This is how you'd achieve that (before
+            # notifying listeners, as events can't be changed afterwards):
             if event.moduleDataSource:
                 evt.moduleDataSource = event.moduleDataSource
             else:
@@ -368,6 +363,13 @@ class sfp_template(SpiderFootPlugin):
                 # code might depend on this field existing and not being None.
                 evt.moduleDataSource = "Unknown"
 
+            self.notifyListeners(evt)
+
+            # Whenever operating in a loop, call this to check whether the user
+            # requested the scan to be aborted.
+            if self.checkForStop():
+                return
+
             # Note that we are using rec.get('os') instead of rec['os'] - this
             # means we won't get an exception if the 'os' key doesn't exist. In
             # general, you should always use .get() instead of accessing keys
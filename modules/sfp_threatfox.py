@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -35,7 +34,10 @@ class sfp_threatfox(SpiderFootPlugin):
             'description': "ThreatFox is a free platform from abuse.ch with the goal of sharing"
             "indicators of compromise (IOCs) associated with malware with the infosec community,"
             "AV vendors and threat intelligence providers.",
-        }
+        },
+        'rateLimits': {
+            'threatfox-api.abuse.ch': 1,
+        },
     }
 
     opts = {
@@ -96,8 +98,6 @@ class sfp_threatfox(SpiderFootPlugin):
             postData=json.dumps(params)
         )
 
-        time.sleep(1)
-
         if res['content'] is None:
             return None
 
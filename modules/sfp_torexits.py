@@ -15,7 +15,7 @@ import json
 
 from netaddr import IPNetwork
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_torexits(SpiderFootPlugin):
@@ -96,7 +96,7 @@ class sfp_torexits(SpiderFootPlugin):
         exit_addresses = self.sf.cacheGet('torexitnodes', self.opts.get('cacheperiod', 1))
 
         if exit_addresses is not None:
-            return self.parseExitNodes(exit_addresses)
+            return SpiderFootBlocklist.fromData('torexitnodes', exit_addresses, self.parseExitNodes)
 
         res = self.sf.fetchUrl(
             "https://onionoo.torproject.org/details?search=flag:exit",
@@ -116,7 +116,7 @@ class sfp_torexits(SpiderFootPlugin):
 
         self.sf.cachePut("torexitnodes", res['content'])
 
-        return self.parseExitNodes(res['content'])
+        return SpiderFootBlocklist.fromData('torexitnodes', res['content'], self.parseExitNodes)
 
     def parseExitNodes(self, data):
         """Extract exit node IP addresses from TOR relay search results
@@ -10,7 +10,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootPlugin
 
@@ -30,7 +29,10 @@ class sfp_venmo(SpiderFootPlugin):
             'favIcon': "https://d1v6x81qdeozhc.cloudfront.net/static/images/logo/apple-touch-icon-1a10ee4b947b728d54265ac8c5084f78.png",
             'logo': "https://d1v6x81qdeozhc.cloudfront.net/static/images/logo/apple-touch-icon-1a10ee4b947b728d54265ac8c5084f78.png",
             'description': "Venmo is a digital wallet that allows you to send money and make purchases at approved merchants.",
-        }
+        },
+        'rateLimits': {
+            'api.venmo.com': 1,
+        },
     }
 
     # Default options
@@ -64,8 +66,6 @@ class sfp_venmo(SpiderFootPlugin):
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'])
 
-        time.sleep(1)
-
         if res['content'] is None:
             self.debug('No response from api.venmo.com')
             return None
@@ -11,9 +11,9 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from netaddr import IPAddress, IPNetwork
+from netaddr import IPNetwork
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_voipbl(SpiderFootPlugin):
@@ -94,11 +94,10 @@ class sfp_voipbl(SpiderFootPlugin):
                 self.debug(f"IP address {target} found in VoIP Blacklist (VoIPBL).")
                 return True
         elif targetType == "netblock":
-            netblock = IPNetwork(target)
-            for ip in blacklist:
-                if IPAddress(ip) in netblock:
-                    self.debug(f"IP address {ip} found within netblock/subnet {target} in VoIP Blacklist (VoIPBL).")
-                    return True
+            ip = blacklist.matchNetwork(target)
+            if ip:
+                self.debug(f"IP address {ip} found within netblock/subnet {target} in VoIP Blacklist (VoIPBL).")
+                return True
 
         return False
 
@@ -106,7 +105,7 @@ class sfp_voipbl(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('voipbl', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('voipbl', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "https://voipbl.org/update",
@@ -126,7 +125,7 @@ class sfp_voipbl(SpiderFootPlugin):
 
         self.sf.cachePut("voipbl", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('voipbl', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
@@ -135,12 +134,12 @@ class sfp_voipbl(SpiderFootPlugin):
             blacklist (str): plaintext blacklist from VoIP Blacklist (VoIPBL)
 
         Returns:
-            list: list of blacklisted IP addresses
+            list: list of blacklisted netblocks
         """
-        ips = list()
+        cidrs = list()
 
         if not blacklist:
-            return ips
+            return cidrs
 
         for cidr in blacklist.split('\n'):
             cidr = cidr.strip()
@@ -150,12 +149,11 @@ class sfp_voipbl(SpiderFootPlugin):
                 continue
 
             try:
-                for ip in IPNetwork(cidr):
-                    ips.append(str(ip))
+                cidrs.append(str(IPNetwork(cidr)))
             except Exception:
                 continue
 
-        return ips
+        return cidrs
 
     def handleEvent(self, event):
         eventName = event.eventType
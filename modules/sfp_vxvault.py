@@ -10,7 +10,7 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
-from spiderfoot import SpiderFootEvent, SpiderFootPlugin
+from spiderfoot import SpiderFootBlocklist, SpiderFootEvent, SpiderFootPlugin
 
 
 class sfp_vxvault(SpiderFootPlugin):
@@ -100,7 +100,7 @@ class sfp_vxvault(SpiderFootPlugin):
         blacklist = self.sf.cacheGet('vxvault', 24)
 
         if blacklist is not None:
-            return self.parseBlacklist(blacklist)
+            return SpiderFootBlocklist.fromData('vxvault', blacklist, self.parseBlacklist)
 
         res = self.sf.fetchUrl(
             "http://vxvault.net/URL_List.php",
@@ -120,7 +120,7 @@ class sfp_vxvault(SpiderFootPlugin):
 
         self.sf.cachePut("vxvault", res['content'])
 
-        return self.parseBlacklist(res['content'])
+        return SpiderFootBlocklist.fromData('vxvault', res['content'], self.parseBlacklist)
 
     def parseBlacklist(self, blacklist):
         """Parse plaintext blacklist
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -43,7 +42,10 @@ class sfp_whatcms(SpiderFootPlugin):
             'favIcon': "https://whatcms.org/themes/what_bootstrap4/favicon.ico",
             'logo': "https://whatcms.org/themes/what_bootstrap4/favicon.ico",
             'description': "Detect what CMS a site is using.",
-        }
+        },
+        'rateLimits': {
+            'whatcms.org': 'delay',
+        },
     }
 
     # Default options
@@ -97,8 +99,6 @@ class sfp_whatcms(SpiderFootPlugin):
                                timeout=self.opts['timeout'],
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Query WhatCMS API for the web technology used by the specified URL
@@ -113,8 +113,6 @@ class sfp_whatcms(SpiderFootPlugin):
                                timeout=self.opts['timeout'],
                                useragent=self.opts['_useragent'])
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     # Parse API response
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 
 from spiderfoot import SpiderFootEvent, SpiderFootHelpers, SpiderFootPlugin
 
@@ -37,7 +36,10 @@ class sfp_zonefiles(SpiderFootPlugin):
             "favIcon": "https://zonefiles.io/favicon.ico",
             "logo": "https://zonefiles.io/static/images/logo.png",
             "description": "You can fetch data for any domain name with our pay-as-you-go API."
-        }
+        },
+        'rateLimits': {
+            'zonefiles.io': 'delay',
+        },
     }
 
     opts = {
@@ -96,8 +98,6 @@ class sfp_zonefiles(SpiderFootPlugin):
             useragent=self.opts['_useragent']
         )
 
-        time.sleep(self.opts['delay'])
-
         return self.parseApiResponse(res)
 
     def parseApiResponse(self, res: dict):
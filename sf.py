@@ -32,6 +32,7 @@ from sfwebui import SpiderFootWebUi
 from spiderfoot import SpiderFootHelpers
 from spiderfoot import SpiderFootDb
 from spiderfoot import SpiderFootCorrelator
+from spiderfoot import SpiderFootCache
 from spiderfoot.logger import logListenerSetup, logWorkerSetup
 from spiderfoot import __version__
 
@@ -54,11 +55,15 @@ def main() -> None:
     sfConfig = {
         '_debug': False,  # Debug
         '_maxthreads': 3,  # Number of modules to run concurrently
+        '_correlationworkers': 4,  # Number of correlation rules to run concurrently
+        '_cpuprocesses': 0,  # Number of processes to run CPU-bound modules in
         '__logging': True,  # Logging in general
         '__outputfilter': None,  # Event types to filter from modules' output
         '_useragent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:62.0) Gecko/20100101 Firefox/62.0',  # User-Agent to use for HTTP requests
         '_dnsserver': '',  # Override the default resolver
         '_fetchtimeout': 5,  # number of seconds before giving up on a fetch
+        '_fetchhostconnections': 10,  # number of concurrent HTTP connections to each host
+        '_portscansockets': 256,  # number of sockets open at once for port scanning
         '_internettlds': 'https://publicsuffix.org/list/effective_tld_names.dat',
         '_internettlds_cache': 72,
         '_genericusers': ",".join(SpiderFootHelpers.usernamesFromWordlists(['generic-usernames'])),
@@ -75,9 +80,13 @@ def main() -> None:
     sfOptdescs = {
         '_debug': "Enable debugging?",
         '_maxthreads': "Max number of modules to run concurrently",
+        '_correlationworkers': "Max number of correlation rules to run concurrently once a scan has finished.",
+        '_cpuprocesses': "Number of worker processes to run CPU-bound modules (such as content analysis) in, so they can use more than one CPU core. 0 runs them in the scan process.",
         '_useragent': "User-Agent string to use for HTTP requests. Prefix with an '@' to randomly select the User Agent from a file containing user agent strings for each request, e.g. @C:\\useragents.txt or @/home/bob/useragents.txt. Or supply a URL to load the list from there.",
         '_dnsserver': "Override the default resolver with another DNS server. For example, 8.8.8.8 is Google's open DNS server.",
         '_fetchtimeout': "Number of seconds before giving up on a HTTP request.",
+        '_fetchhostconnections': "Max number of concurrent HTTP connections to each host. Connections are kept open and reused between requests.",
+        '_portscansockets': "Max number of sockets open at once for TCP port scanning, across all modules.",
         '_internettlds': "List of Internet TLDs.",
         '_internettlds_cache': "Hours to cache the Internet TLD list. This can safely be quite a long time given that the list doesn't change too often.",
         '_genericusers': "List of usernames that if found as usernames or as part of e-mail addresses, should be treated differently to non-generics.",
@@ -113,15 +122,37 @@ def main() -> None:
     p.add_argument("-q", action='store_true', help="Disable logging. This will also hide errors!")
     p.add_argument("-V", "--version", action='store_true', help="Display the version of SpiderFoot and exit.")
     p.add_argument("-max-threads", type=int, help="Max number of modules to run concurrently.")
+    p.add_argument("--correlation-workers", metavar="N", type=int, help="Max number of correlation rules to run concurrently.")
+    p.add_argument("--cache-stats", action='store_true', help="Display the size of the cache of data fetched by modules, and its hits, misses and characters read and written by scans, and exit.")
+    p.add_argument("--cache-purge", action='store_true', help="Remove all data fetched by modules from the cache and exit.")
     args = p.parse_args()
 
     if args.version:
         print(f"SpiderFoot {__version__}: Open Source Intelligence Automation.")
         sys.exit(0)
 
+    if args.cache_stats:
+        stats = SpiderFootCache.shared().stats(allProcesses=True)
+        print(f"{'Entries'.ljust(12)}  {stats['entries']:,}")
+        print(f"{'Size'.ljust(12)}  {stats['size']:,} characters")
+        print(f"{'Memory hits'.ljust(12)}  {stats['memoryHits']:,}")
+        print(f"{'Disk hits'.ljust(12)}  {stats['diskHits']:,}")
+        print(f"{'Misses'.ljust(12)}  {stats['misses']:,}")
+        print(f"{'Read'.ljust(12)}  {stats['sizeRead']:,} characters")
+        print(f"{'Written'.ljust(12)}  {stats['sizeWritten']:,} characters")
+        print(f"{'Evicted'.ljust(12)}  {stats['evicted']:,}")
+        sys.exit(0)
+
+    if args.cache_purge:
+        print(f"Removed {SpiderFootCache.shared().purge():,} entries from the cache.")
+        sys.exit(0)
+
     if args.max_threads:
         sfConfig['_maxthreads'] = args.max_threads
 
+    if args.correlation_workers:
+        sfConfig['_correlationworkers'] = args.correlation_workers
+
     if args.debug:
         sfConfig['_debug'] = True
     else:
@@ -190,7 +221,7 @@ def main() -> None:
         try:
             log.info(f"Running {len(correlationRulesRaw)} correlation rules against scan, {args.correlate}.")
             corr = SpiderFootCorrelator(dbh, correlationRulesRaw, args.correlate)
-            corr.run_correlations()
+            corr.run_correlations(sfConfig['_correlationworkers'])
         except Exception as e:
             log.critical(f"Unable to run correlation rules: {e}", exc_info=True)
             sys.exit(-1)
@@ -10,32 +10,36 @@
 # Licence:     MIT
 # -------------------------------------------------------------------------------
 
+import asyncio
+import functools
 import hashlib
+import http.cookiejar
 import inspect
-import io
 import json
 import logging
-import os
 import random
 import re
 import socket
 import ssl
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime
 
 import cryptography
 import dns.resolver
+import dns.reversename
 import netaddr
 import OpenSSL
 import requests
 import urllib3
 from publicsuffixlist import PublicSuffixList
-from spiderfoot import SpiderFootHelpers
+from spiderfoot import SpiderFootCache, SpiderFootHelpers, SpiderFootPortScanner, SpiderFootRateLimiter, SpiderFootResolver
 
 # For hiding the SSL warnings coming from the requests lib
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)  # noqa: DUO131
@@ -49,12 +53,39 @@ class SpiderFoot:
         scanId (str): scan ID this instance of SpiderFoot is being used in
         socksProxy (str): SOCKS proxy
         opts (dict): configuration options
+        rateLimiter (SpiderFootRateLimiter): rate limits on fetchUrl() requests
+        resolver (SpiderFootResolver): DNS resolver caching lookups
+        portScanner (SpiderFootPortScanner): TCP port scanner
+
+    Note:
+        HTTP requests made through an instance share one requests session
+        (see getSession()), so connections to a host are kept alive and
+        reused between fetches. A scan creates one instance for all its
+        modules.
     """
     _dbh = None
     _scanId = None
     _socksProxy = None
+    _session = None
+    _fetchExecutor = None
     opts = dict()
 
+    # Guards creating the shared session and fetch thread pool
+    _sessionLock = threading.Lock()
+
+    # Maximum number of hosts to keep connection pools open to
+    httpPoolHosts = 100
+
+    # Maximum number of fetches run at once by fetchUrlAsync() and fetchUrlMany()
+    fetchWorkers = 32
+
+    # Public suffix list parsed from each version of the Internet TLD list,
+    # keyed by SHA256 hash of the list, and the one for each list object
+    # seen, keyed by id(); shared by every instance in the process
+    _publicSuffixLists = dict()
+    _publicSuffixListsById = dict()
+    _publicSuffixLock = threading.Lock()
+
     def __init__(self, options: dict) -> None:
         """Initialize SpiderFoot object.
 
@@ -69,6 +100,9 @@ class SpiderFoot:
 
         self.opts = deepcopy(options)
         self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.rateLimiter = SpiderFootRateLimiter()
+        self.portScanner = SpiderFootPortScanner(int(self.opts.get('_portscansockets', 256)))
+        self.dnsWildcards = dict()
 
         # This is ugly but we don't want any fetches to fail - we expect
         # to encounter unverified SSL certs!
@@ -78,6 +112,9 @@ class SpiderFoot:
             res = dns.resolver.Resolver()
             res.nameservers = [self.opts['_dnsserver']]
             dns.resolver.override_system_resolver(res)
+            self.resolver = SpiderFootResolver([self.opts['_dnsserver']])
+        else:
+            self.resolver = SpiderFootResolver()
 
     @property
     def dbh(self):
@@ -169,8 +206,13 @@ class SpiderFoot:
         if val.lower().startswith('http://') or val.lower().startswith('https://'):
             try:
                 self.info(f"Downloading configuration data from: {val}")
-                session = self.getSession()
-                res = session.get(val)
+                proxies = None
+                if self.socksProxy:
+                    proxies = {
+                        'http': self.socksProxy,
+                        'https': self.socksProxy,
+                    }
+                res = self.getSession().get(val, proxies=proxies)
 
                 return res.content.decode('utf-8')
             except BaseException as e:
@@ -258,20 +300,18 @@ class SpiderFoot:
             label (str): Name of the cached data to be used when retrieving the cached data.
             data (str): Data to cache
         """
-        pathLabel = hashlib.sha224(label.encode('utf-8')).hexdigest()
-        cacheFile = SpiderFootHelpers.cachePath() + "/" + pathLabel
-        with io.open(cacheFile, "w", encoding="utf-8", errors="ignore") as fp:
-            if isinstance(data, list):
-                for line in data:
-                    if isinstance(line, str):
-                        fp.write(line)
-                        fp.write("\n")
-                    else:
-                        fp.write(line.decode('utf-8') + '\n')
-            elif isinstance(data, bytes):
-                fp.write(data.decode('utf-8'))
-            else:
-                fp.write(data)
+        if isinstance(data, list):
+            lines = list()
+            for line in data:
+                if isinstance(line, str):
+                    lines.append(line + "\n")
+                else:
+                    lines.append(line.decode('utf-8') + '\n')
+            data = "".join(lines)
+        elif isinstance(data, bytes):
+            data = data.decode('utf-8')
+
+        SpiderFootCache.shared().put(label, data)
 
     def cacheGet(self, label: str, timeoutHrs: int) -> str:
         """Retreive data from the cache.
@@ -287,21 +327,11 @@ class SpiderFoot:
         if not label:
             return None
 
-        pathLabel = hashlib.sha224(label.encode('utf-8')).hexdigest()
-        cacheFile = SpiderFootHelpers.cachePath() + "/" + pathLabel
-        try:
-            cache_stat = os.stat(cacheFile)
-        except OSError:
-            return None
-
-        if cache_stat.st_size == 0:
+        data = SpiderFootCache.shared().get(label, timeoutHrs * 3600)
+        if not data:
             return None
 
-        if cache_stat.st_mtime > time.time() - timeoutHrs * 3600 or timeoutHrs == 0:
-            with open(cacheFile, "r", encoding='utf-8') as fp:
-                return fp.read()
-
-        return None
+        return data
 
     def configSerialize(self, opts: dict, filterSystem: bool = True):
         """Convert a Python dictionary to something storable in the database.
@@ -658,6 +688,43 @@ class SpiderFoot:
         self.debug(f"Keywords: {keywords}")
         return set([k for k in keywords if k])
 
+    def publicSuffixList(self, tldList: list) -> PublicSuffixList:
+        """Public suffix list of the ICANN domains in an Internet TLD list.
+
+        Parsing the TLD list takes far longer than looking a host name up
+        in it, so each version of the list is parsed once and shared by
+        every instance in the process. Each list object is also remembered
+        by identity, so its contents are only hashed the first time it is
+        seen. Lists must therefore not be changed once they have been used.
+
+        Args:
+            tldList (list): lines of the Mozilla public suffix list, or the whole list as a string
+
+        Returns:
+            PublicSuffixList: public suffix list
+        """
+        with SpiderFoot._publicSuffixLock:
+            entry = SpiderFoot._publicSuffixListsById.get(id(tldList))
+            if entry is not None and entry[0] is tldList:
+                return entry[1]
+
+        lines = tldList.splitlines() if isinstance(tldList, str) else tldList
+        key = hashlib.sha256("\n".join(lines).encode('utf-8', errors='replace')).hexdigest()
+
+        with SpiderFoot._publicSuffixLock:
+            psl = SpiderFoot._publicSuffixLists.get(key)
+            if psl is None:
+                psl = PublicSuffixList(tldList, only_icann=True)
+                SpiderFoot._publicSuffixLists[key] = psl
+
+            # The list is kept with its entry so its id() can't be reused
+            # by another object while the entry exists.
+            if len(SpiderFoot._publicSuffixListsById) >= 1000:
+                SpiderFoot._publicSuffixListsById.clear()
+            SpiderFoot._publicSuffixListsById[id(tldList)] = (tldList, psl)
+
+        return psl
+
     def hostDomain(self, hostname: str, tldList: list) -> str:
         """Obtain the domain name for a supplied hostname.
 
@@ -673,8 +740,7 @@ class SpiderFoot:
         if not hostname:
             return None
 
-        ps = PublicSuffixList(tldList, only_icann=True)
-        return ps.privatesuffix(hostname)
+        return self.publicSuffixList(tldList).privatesuffix(hostname)
 
     def validHost(self, hostname: str, tldList: str) -> bool:
         """Check if the provided string is a valid hostname with a valid public suffix TLD.
@@ -697,8 +763,7 @@ class SpiderFoot:
         if not re.match(r"^[a-z0-9-\.]*$", hostname, re.IGNORECASE):
             return False
 
-        ps = PublicSuffixList(tldList, only_icann=True, accept_unknown=False)
-        sfx = ps.privatesuffix(hostname)
+        sfx = self.publicSuffixList(tldList).privatesuffix(hostname, accept_unknown=False)
         return sfx is not None
 
     def isDomain(self, hostname: str, tldList: list) -> bool:
@@ -721,8 +786,7 @@ class SpiderFoot:
         if not hostname:
             return False
 
-        ps = PublicSuffixList(tldList, only_icann=True, accept_unknown=False)
-        sfx = ps.privatesuffix(hostname)
+        sfx = self.publicSuffixList(tldList).privatesuffix(hostname, accept_unknown=False)
         return sfx == hostname
 
     def validIP(self, address: str) -> bool:
@@ -831,26 +895,38 @@ class SpiderFoot:
             host (str): host to resolve
 
         Returns:
-            list: IP addresses
+            list: IP addresses, and the names followed to them
         """
         if not host:
             self.error(f"Unable to resolve host: {host} (Invalid host)")
             return list()
 
-        addrs = list()
-        try:
-            addrs = self.normalizeDNS(socket.gethostbyname_ex(host))
-        except BaseException as e:
-            self.debug(f"Unable to resolve host: {host} ({e})")
-            return addrs
+        names, addrs = self.resolver.query(host, 'A')
 
         if not addrs:
             self.debug(f"Unable to resolve host: {host}")
-            return addrs
+            return list()
 
         self.debug(f"Resolved {host} to IPv4: {addrs}")
 
-        return list(set(addrs))
+        return list(set(names + addrs))
+
+    def resolveHostMany(self, hosts: list) -> dict:
+        """Return normalised IPv4 resolutions of many hostnames, looked up
+        concurrently.
+
+        Must not be called from a running event loop.
+
+        Args:
+            hosts (list): hosts to resolve
+
+        Returns:
+            dict: IP addresses, and the names followed to them, of each host
+        """
+        ret = dict()
+        for host, (names, addrs) in self.resolver.queryMany([host for host in hosts if host], 'A').items():
+            ret[host] = list(set(names + addrs)) if addrs else list()
+        return ret
 
     def resolveIP(self, ipaddr: str) -> list:
         """Return a normalised resolution of an IPv4 or IPv6 address.
@@ -859,7 +935,7 @@ class SpiderFoot:
             ipaddr (str): IP address to reverse resolve
 
         Returns:
-            list: list of domain names
+            list: list of domain names, and the IP address
         """
 
         if not self.validIP(ipaddr) and not self.validIP6(ipaddr):
@@ -868,19 +944,15 @@ class SpiderFoot:
 
         self.debug(f"Performing reverse resolve of {ipaddr}")
 
-        try:
-            addrs = self.normalizeDNS(socket.gethostbyaddr(ipaddr))
-        except BaseException as e:
-            self.debug(f"Unable to reverse resolve IP address: {ipaddr} ({e})")
-            return list()
+        _, names = self.resolver.query(dns.reversename.from_address(ipaddr).to_text(), 'PTR')
 
-        if not addrs:
+        if not names:
             self.debug(f"Unable to reverse resolve IP address: {ipaddr}")
             return list()
 
-        self.debug(f"Reverse resolved {ipaddr} to: {addrs}")
+        self.debug(f"Reverse resolved {ipaddr} to: {names}")
 
-        return list(set(addrs))
+        return list(set(names + [ipaddr]))
 
     def resolveHost6(self, hostname: str) -> list:
         """Return a normalised IPv6 resolution of a hostname.
@@ -895,24 +967,33 @@ class SpiderFoot:
             self.error(f"Unable to resolve host: {hostname} (Invalid host)")
             return list()
 
-        addrs = list()
-        try:
-            res = socket.getaddrinfo(hostname, None, socket.AF_INET6)
-            for addr in res:
-                if addr[4][0] not in addrs:
-                    addrs.append(addr[4][0])
-        except BaseException as e:
-            self.debug(f"Unable to resolve host: {hostname} ({e})")
-            return addrs
+        _, addrs = self.resolver.query(hostname, 'AAAA')
 
         if not addrs:
             self.debug(f"Unable to resolve host: {hostname}")
-            return addrs
+            return list()
 
         self.debug(f"Resolved {hostname} to IPv6: {addrs}")
 
         return list(set(addrs))
 
+    def resolveHost6Many(self, hostnames: list) -> dict:
+        """Return normalised IPv6 resolutions of many hostnames, looked up
+        concurrently.
+
+        Must not be called from a running event loop.
+
+        Args:
+            hostnames (list): hostnames to resolve
+
+        Returns:
+            dict: IP addresses of each hostname
+        """
+        ret = dict()
+        for hostname, (_, addrs) in self.resolver.queryMany([hostname for hostname in hostnames if hostname], 'AAAA').items():
+            ret[hostname] = list(set(addrs))
+        return ret
+
     def validateIP(self, host: str, ip: str) -> bool:
         """Verify a host resolves to a given IP.
 
@@ -1081,18 +1162,34 @@ class SpiderFoot:
         return ret
 
     def getSession(self) -> 'requests.sessions.Session':
-        """Return requests session object.
+        """Return the requests session shared by this instance.
+
+        The session keeps a pool of keep-alive connections per host (and
+        per proxy), holding at most _fetchhostconnections connections to
+        each host. Requests beyond that wait for a connection to be freed.
+        Cookies set by responses are not kept, so they never leak between
+        requests. Proxies must be passed with each request.
 
         Returns:
             requests.sessions.Session: requests session
         """
-        session = requests.session()
-        if self.socksProxy:
-            session.proxies = {
-                'http': self.socksProxy,
-                'https': self.socksProxy,
-            }
-        return session
+        if self._session is not None:
+            return self._session
+
+        with self._sessionLock:
+            if self._session is None:
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.httpPoolHosts,
+                    pool_maxsize=int(self.opts.get('_fetchhostconnections', 10)),
+                    pool_block=True
+                )
+                session = requests.session()
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+
+        return self._session
 
     def removeUrlCreds(self, url: str) -> str:
         """Remove potentially sensitive strings (such as "key=..." and "password=...") from a string.
@@ -1277,6 +1374,7 @@ class SpiderFoot:
                 self.info(f"Fetching (HEAD): {self.removeUrlCreds(url)} ({', '.join(request_log)})")
 
             try:
+                self.rateLimiter.acquire(parsed_url.hostname)
                 hdr = self.getSession().head(
                     url,
                     headers=header,
@@ -1284,6 +1382,7 @@ class SpiderFoot:
                     verify=verify,
                     timeout=timeout
                 )
+                self.rateLimiter.checkResponse(parsed_url.hostname, hdr.status_code, hdr.headers.get('retry-after'))
             except Exception as e:
                 if noLog:
                     self.debug(f"Unexpected exception ({e}) occurred fetching (HEAD only) URL: {url}", exc_info=True)
@@ -1314,6 +1413,8 @@ class SpiderFoot:
                     self.info(f"Fetching (HEAD): {self.removeUrlCreds(result['realurl'])} ({', '.join(request_log)})")
 
                 try:
+                    realhost = urllib.parse.urlparse(result['realurl']).hostname or ''
+                    self.rateLimiter.acquire(realhost)
                     hdr = self.getSession().head(
                         result['realurl'],
                         headers=header,
@@ -1321,6 +1422,7 @@ class SpiderFoot:
                         verify=verify,
                         timeout=timeout
                     )
+                    self.rateLimiter.checkResponse(realhost, hdr.status_code, hdr.headers.get('retry-after'))
                     size = int(hdr.headers.get('content-length', 0))
                     result['realurl'] = hdr.headers.get('location', result['realurl'])
                     result['code'] = str(hdr.status_code)
@@ -1342,6 +1444,7 @@ class SpiderFoot:
                     self.debug(f"Fetching (POST): {self.removeUrlCreds(url)} ({', '.join(request_log)})")
                 else:
                     self.info(f"Fetching (POST): {self.removeUrlCreds(url)} ({', '.join(request_log)})")
+                self.rateLimiter.acquire(parsed_url.hostname)
                 res = self.getSession().post(
                     url,
                     data=postData,
@@ -1357,6 +1460,7 @@ class SpiderFoot:
                     self.debug(f"Fetching (GET): {self.removeUrlCreds(url)} ({', '.join(request_log)})")
                 else:
                     self.info(f"Fetching (GET): {self.removeUrlCreds(url)} ({', '.join(request_log)})")
+                self.rateLimiter.acquire(parsed_url.hostname)
                 res = self.getSession().get(
                     url,
                     headers=header,
@@ -1377,6 +1481,8 @@ class SpiderFoot:
 
             return result
 
+        self.rateLimiter.checkResponse(parsed_url.hostname, res.status_code, res.headers.get('retry-after'))
+
         try:
             result['headers'] = dict()
             result['realurl'] = res.url
@@ -1436,6 +1542,58 @@ class SpiderFoot:
         self.info(f"Fetched {self.removeUrlCreds(url)} ({len(result['content'] or '')} bytes in {t}s)")
         return result
 
+    async def fetchUrlAsync(self, url: str, **kwargs) -> dict:
+        """Fetch a URL from a coroutine and return the HTTP response as a dictionary.
+
+        The fetch runs on a pool of at most fetchWorkers threads shared by
+        this instance, over the shared session (see getSession()).
+
+        Args:
+            url (str): URL to fetch
+            **kwargs: fetchUrl() arguments
+
+        Returns:
+            dict: HTTP response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.getFetchExecutor(), functools.partial(self.fetchUrl, url, **kwargs))
+
+    def fetchUrlMany(self, urls: list, **kwargs) -> dict:
+        """Fetch several URLs concurrently and return their HTTP responses.
+
+        Must not be called from a running event loop; await
+        fetchUrlAsync() there instead.
+
+        Args:
+            urls (list): URLs to fetch
+            **kwargs: fetchUrl() arguments, applied to every URL
+
+        Returns:
+            dict: HTTP response of each URL, keyed by URL
+        """
+        if not urls:
+            return dict()
+
+        async def fetchAll() -> list:
+            return await asyncio.gather(*[self.fetchUrlAsync(url, **kwargs) for url in urls])
+
+        return dict(zip(urls, asyncio.run(fetchAll())))
+
+    def getFetchExecutor(self) -> ThreadPoolExecutor:
+        """Return the thread pool running fetchUrlAsync() fetches.
+
+        Returns:
+            ThreadPoolExecutor: fetch thread pool
+        """
+        if self._fetchExecutor is not None:
+            return self._fetchExecutor
+
+        with self._sessionLock:
+            if self._fetchExecutor is None:
+                self._fetchExecutor = ThreadPoolExecutor(max_workers=self.fetchWorkers, thread_name_prefix="fetchUrl")
+
+        return self._fetchExecutor
+
     def checkDnsWildcard(self, target: str) -> bool:
         """Check if wildcard DNS is enabled for a domain by looking up a random subdomain.
 
@@ -1448,13 +1606,17 @@ class SpiderFoot:
         if not target:
             return False
 
+        # Modules check the same domains over and over, so check each once
+        target = target.lower()
+        wildcard = self.dnsWildcards.get(target)
+        if wildcard is not None:
+            return wildcard
+
         randpool = 'bcdfghjklmnpqrstvwxyz3456789'
         randhost = ''.join([random.SystemRandom().choice(randpool) for x in range(10)])
 
-        if not self.resolveHost(randhost + "." + target):
-            return False
-
-        return True
+        wildcard = self.dnsWildcards[target] = bool(self.resolveHost(randhost + "." + target))
+        return wildcard
 
     def cveInfo(self, cveId: str, sources: str = "circl,nist") -> (str, str):
         """Look up a CVE ID for more information in the first available source.
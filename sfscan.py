@@ -12,7 +12,6 @@
 import socket
 import time
 import queue
-from time import sleep
 from copy import deepcopy
 from contextlib import suppress
 from collections import OrderedDict
@@ -20,7 +19,7 @@ from collections import OrderedDict
 import dns.resolver
 
 from sflib import SpiderFoot
-from spiderfoot import SpiderFootDb, SpiderFootEvent, SpiderFootPlugin, SpiderFootTarget, SpiderFootHelpers, SpiderFootThreadPool, SpiderFootCorrelator, logger
+from spiderfoot import SpiderFootDb, SpiderFootEvent, SpiderFootPlugin, SpiderFootTarget, SpiderFootHelpers, SpiderFootThreadPool, SpiderFootProcessPool, SpiderFootCorrelator, SpiderFootCache, SpiderFootConfig, logger
 
 
 def startSpiderFootScanner(loggingQueue, *args, **kwargs):
@@ -48,6 +47,15 @@ class SpiderFootScanner():
     __moduleInstances = dict()
     __modconfig = dict()
     __scanName = None
+    __inFlight = dict()
+    __inFlightTotal = 0
+    __eventRouting = dict()
+    __wildcardSubscribers = tuple()
+
+    # Seconds between checks for scan abort requests and status logging
+    statusCheckInterval = 1
+    # Maximum number of times modules are sent "FINISHED" at the end of a scan
+    maxFinishRounds = 10
 
     def __init__(self, scanName: str, scanId: str, targetValue: str, targetType: str, moduleList: list, globalOpts: dict, start: bool = True) -> None:
         """Initialize SpiderFootScanner object.
@@ -211,9 +219,11 @@ class SpiderFootScanner():
         self.__setStatus("INITIALIZING", time.time() * 1000, None)
 
         self.__sharedThreadPool = SpiderFootThreadPool(threads=self.__config.get("_maxthreads", 3), name='sharedThreadPool')
+        self.__processPool = None
 
         # Used when module threading is enabled
         self.eventQueue = None
+        self.__dispatchStats = {'events': 0, 'deliveries': 0, 'seconds': 0.0}
 
         if start:
             self.__startScan()
@@ -273,6 +283,9 @@ class SpiderFootScanner():
 
             self.__sharedThreadPool.start()
 
+            # Global options are frozen once and shared by every module
+            globalConfig = SpiderFootConfig.freeze(self.__config)
+
             # moduleList = list of modules the user wants to run
             self.__sf.debug(f"Loading {len(self.__moduleList)} modules ...")
             for modName in self.__moduleList:
@@ -299,10 +312,8 @@ class SpiderFootScanner():
 
                 # Set up the module options, scan ID, database handle and listeners
                 try:
-                    # Configuration is a combined global config with module-specific options
-                    self.__modconfig[modName] = deepcopy(self.__config['__modules__'][modName]['opts'])
-                    for opt in list(self.__config.keys()):
-                        self.__modconfig[modName][opt] = deepcopy(self.__config[opt])
+                    # Configuration is the shared global config layered over module-specific options
+                    self.__modconfig[modName] = SpiderFootConfig(globalConfig, deepcopy(self.__config['__modules__'][modName]['opts']))
 
                     # clear any listener relationships from the past
                     mod.clearListeners()
@@ -310,6 +321,7 @@ class SpiderFootScanner():
                     mod.setSharedThreadPool(self.__sharedThreadPool)
                     mod.setDbh(self.__dbh)
                     mod.setup(self.__sf, self.__modconfig[modName])
+                    self.__sf.rateLimiter.setLimitsFromModule(mod)
                 except Exception:
                     self.__sf.error(f"Module {modName} initialization failed", exc_info=True)
                     mod.errorState = True
@@ -362,12 +374,18 @@ class SpiderFootScanner():
 
             if not self.__moduleInstances:
                 self.__setStatus("ERROR-FAILED", None, time.time() * 1000)
+                self.__sharedThreadPool.shutdown(wait=False)
                 self.__dbh.close()
                 return
 
             # sort modules by priority
             self.__moduleInstances = OrderedDict(sorted(self.__moduleInstances.items(), key=lambda m: m[-1]._priority))
 
+            # work out which modules to send each event type to
+            self.buildEventRouting()
+
+            self.startProcessPool()
+
             # Now we are ready to roll..
             self.__setStatus("RUNNING")
 
@@ -419,6 +437,21 @@ class SpiderFootScanner():
             self.__setStatus("ERROR-FAILED", None, time.time() * 1000)
 
         finally:
+            if self.__processPool is not None:
+                self.__processPool.shutdown()
+
+            for host, stats in self.__sf.rateLimiter.stats().items():
+                self.__sf.info(f"Made {stats['requests']:,} requests to {host} at {stats['rate']:.2f}/s, waiting {stats['waited']:.1f}s for rate limits")
+
+            cacheStats = SpiderFootCache.shared().stats()
+            self.__sf.info(f"Cache: {cacheStats['memoryHits']:,} memory hits, {cacheStats['diskHits']:,} disk hits, {cacheStats['misses']:,} misses, "
+                           f"{cacheStats['sizeRead']:,} characters read, {cacheStats['sizeWritten']:,} characters written")
+            SpiderFootCache.shared().saveStats()
+
+            dnsStats = self.__sf.resolver.stats()
+            self.__sf.info(f"DNS: {dnsStats['queries']:,} lookups, {dnsStats['hits']:,} cache hits, {dnsStats['nxdomain']:,} names not found, "
+                           f"{dnsStats['timeouts']:,} timeouts, {dnsStats['errors']:,} errors")
+
             if not failed:
                 self.__setStatus("FINISHED", None, time.time() * 1000)
                 self.runCorrelations()
@@ -433,10 +466,17 @@ class SpiderFootScanner():
         for rule in self.__config['__correlationrules__']:
             ruleset[rule['id']] = rule['rawYaml']
         corr = SpiderFootCorrelator(self.__dbh, ruleset, self.__scanId)
-        corr.run_correlations()
+        corr.run_correlations(self.__config.get('_correlationworkers', 1))
 
     def waitForThreads(self) -> None:
-        """Wait for threads.
+        """Dispatch events to modules until the scan has completed.
+
+        Blocks on the scanner event queue rather than polling it. Every event
+        handed to a module is counted as in-flight for that module until the
+        module reports the task as done (see SpiderFootPlugin.threadWorker()),
+        so the scan is complete once the event queue is empty and no module
+        has work in flight. At that point modules are sent "FINISHED", and the
+        scan ends after a round of "FINISHED" produces no new events.
 
         Raises:
             TypeError: queue tried to process a malformed event
@@ -445,58 +485,66 @@ class SpiderFootScanner():
         if not self.eventQueue:
             return
 
-        counter = 0
+        self.__inFlight = dict()
+        self.__inFlightTotal = 0
+        self.__dispatchStats = {'events': 0, 'deliveries': 0, 'seconds': 0.0}
+        finishRounds = 0
+        finishRoundStart = None
+        lastStatusCheck = 0
 
         try:
             # start one thread for each module
             for mod in self.__moduleInstances.values():
+                self.__inFlight[mod.__name__] = 0
                 mod.start()
-            final_passes = 3
 
             # watch for newly-generated events
             while True:
-
-                # log status of threads every 10 iterations
-                log_status = counter % 10 == 0
-                counter += 1
-
-                if log_status:
+                now = time.monotonic()
+                if now - lastStatusCheck >= self.statusCheckInterval:
+                    lastStatusCheck = now
                     scanstatus = self.__dbh.scanInstanceGet(self.__scanId)
                     if scanstatus and scanstatus[5] == "ABORT-REQUESTED":
                         raise AssertionError("ABORT-REQUESTED")
+                    for mod in self.__moduleInstances.values():
+                        if mod.errorState:
+                            self.__releaseModule(mod)
+                    self.__logStatus()
+
+                if self.__inFlightTotal == 0 and self.eventQueue.empty():
+                    # nothing new since the last round of FINISHED; we're done
+                    if finishRoundStart == self.__dispatchStats['events'] or finishRounds >= self.maxFinishRounds:
+                        break
+
+                    # Trigger module.finished()
+                    finishRounds += 1
+                    finishRoundStart = self.__dispatchStats['events']
+                    self.__sf.debug(f"All modules idle, sending FINISHED to modules (round {finishRounds}).")
+                    for mod in self.__moduleInstances.values():
+                        if not mod.errorState and mod.incomingEventQueue is not None:
+                            self.__inFlight[mod.__name__] += 1
+                            self.__inFlightTotal += 1
+                            mod.incomingEventQueue.put('FINISHED')
+                    continue
 
                 try:
-                    sfEvent = self.eventQueue.get_nowait()
-                    self.__sf.debug(f"waitForThreads() got event, {sfEvent.eventType}, from eventQueue.")
+                    sfEvent = self.eventQueue.get(timeout=self.statusCheckInterval)
                 except queue.Empty:
-                    # check if we're finished
-                    if self.threadsFinished(log_status):
-                        sleep(.1)
-                        # but are we really?
-                        if self.threadsFinished(log_status):
-                            if final_passes < 1:
-                                break
-                            # Trigger module.finished()
-                            for mod in self.__moduleInstances.values():
-                                if not mod.errorState and mod.incomingEventQueue is not None:
-                                    mod.incomingEventQueue.put('FINISHED')
-                            sleep(.1)
-                            while not self.threadsFinished(log_status):
-                                log_status = counter % 100 == 0
-                                counter += 1
-                                sleep(.01)
-                            final_passes -= 1
-
-                    else:
-                        # save on CPU
-                        sleep(.1)
+                    continue
+
+                # a module has completed a task
+                if isinstance(sfEvent, str):
+                    self.__taskDone(sfEvent)
                     continue
 
                 if not isinstance(sfEvent, SpiderFootEvent):
                     raise TypeError(f"sfEvent is {type(sfEvent)}; expected SpiderFootEvent")
 
-                # for every module
-                for mod in self.__moduleInstances.values():
+                self.__sf.debug(f"waitForThreads() got event, {sfEvent.eventType}, from eventQueue.")
+                dispatchStart = time.perf_counter()
+
+                # for every module subscribed to this event type
+                for mod in self.__eventRouting.get(sfEvent.eventType, self.__wildcardSubscribers):
                     # if it's been aborted
                     if mod._stopScanning:
                         # break out of the while loop
@@ -504,83 +552,158 @@ class SpiderFootScanner():
 
                     # send it the new event if applicable
                     if not mod.errorState and mod.incomingEventQueue is not None:
-                        watchedEvents = mod.watchedEvents()
-                        if sfEvent.eventType in watchedEvents or "*" in watchedEvents:
-                            mod.incomingEventQueue.put(deepcopy(sfEvent))
+                        self.__inFlight[mod.__name__] += 1
+                        self.__inFlightTotal += 1
+                        self.__dispatchStats['deliveries'] += 1
+                        mod.incomingEventQueue.put(sfEvent)
+
+                self.__dispatchStats['events'] += 1
+                self.__dispatchStats['seconds'] += time.perf_counter() - dispatchStart
 
         finally:
+            self.__logDispatchStats()
+
             # tell the modules to stop
             for mod in self.__moduleInstances.values():
                 mod._stopScanning = True
+                # wake up module threads blocked waiting for events
+                with suppress(Exception):
+                    mod.incomingEventQueue.put(None)
+
+            # wait for storage modules to write out the events they hold,
+            # so every event is stored before the scan is marked finished
+            # and correlations are run
+            for mod in self.__moduleInstances.values():
+                if mod.__name__.startswith('sfp__stor_') and mod.thread is not None:
+                    mod.thread.join()
+
             self.__sharedThreadPool.shutdown(wait=True)
+            self.__sf.portScanner.close()
+
+    def startProcessPool(self) -> None:
+        """Hand events for modules flagged as CPU-bound to worker processes,
+        if the _cpuprocesses option is set.
+        """
+        processes = int(self.__config.get('_cpuprocesses', 0))
+        if processes <= 0:
+            return
+
+        cpuBound = [mod for mod in self.__moduleInstances.values() if 'cpubound' in (mod.meta or {}).get('flags', [])]
+        if not cpuBound:
+            return
 
-    def threadsFinished(self, log_status: bool = False) -> bool:
-        """Check if all threads are complete.
+        self.__sf.debug(f"Running {len(cpuBound)} CPU-bound modules in {processes} processes.")
+        self.__processPool = SpiderFootProcessPool(processes, {mod.__name__: self.__modconfig[mod.__name__] for mod in cpuBound}, self.__target)
+        for mod in cpuBound:
+            mod.setProcessPool(self.__processPool)
+
+    def buildEventRouting(self) -> None:
+        """Build the index of event types to the modules watching them.
+
+        Each module's watchedEvents() is only called once, here, rather than
+        for every event. Modules watching "*" are kept separately and added
+        to every entry, as well as being the subscribers for event types no
+        module explicitly watches. Subscribers are kept in module priority
+        order.
+        """
+        self.__eventRouting = dict()
+        self.__wildcardSubscribers = tuple()
+
+        subscribers = dict()
+        wildcard = list()
+        for mod in self.__moduleInstances.values():
+            watchedEvents = set(mod.watchedEvents() or [])
+            if "*" in watchedEvents:
+                wildcard.append(mod)
+                continue
+            for eventType in watchedEvents:
+                subscribers.setdefault(eventType, []).append(mod)
+
+        for eventType, mods in subscribers.items():
+            self.__eventRouting[eventType] = tuple(sorted(mods + wildcard, key=lambda m: m._priority))
+        self.__wildcardSubscribers = tuple(wildcard)
+
+        self.__sf.debug(f"Event routing: {len(self.__eventRouting):,} event types, {len(wildcard):,} modules watching all events.")
+
+    def eventSubscribers(self, eventType: str) -> tuple:
+        """Modules an event of the specified type will be sent to.
 
         Args:
-            log_status (bool): print thread queue status to debug log
+            eventType (str): event type
 
         Returns:
-            bool: True if all threads are finished
+            tuple: modules, in priority order
         """
-        if self.eventQueue is None:
-            return True
-
-        modules_waiting = dict()
-        for m in self.__moduleInstances.values():
-            try:
-                if m.incomingEventQueue is not None:
-                    modules_waiting[m.__name__] = m.incomingEventQueue.qsize()
-            except Exception:
-                with suppress(Exception):
-                    m.errorState = True
-        modules_waiting = sorted(modules_waiting.items(), key=lambda x: x[-1], reverse=True)
-
-        modules_running = []
-        for m in self.__moduleInstances.values():
-            try:
-                if m.running:
-                    modules_running.append(m.__name__)
-            except Exception:
-                with suppress(Exception):
-                    m.errorState = True
-
-        modules_errored = []
-        for m in self.__moduleInstances.values():
-            try:
-                if m.errorState:
-                    modules_errored.append(m.__name__)
-            except Exception:
-                with suppress(Exception):
-                    m.errorState = True
+        return self.__eventRouting.get(eventType, self.__wildcardSubscribers)
 
-        queues_empty = [qsize == 0 for m, qsize in modules_waiting]
+    @property
+    def dispatchStats(self) -> dict:
+        """Event dispatch statistics for the scan.
 
-        for mod in self.__moduleInstances.values():
-            if mod.errorState and mod.incomingEventQueue is not None:
-                self.__sf.debug(f"Clearing and unsetting incomingEventQueue for errored module {mod.__name__}.")
-                with suppress(Exception):
-                    while 1:
-                        mod.incomingEventQueue.get_nowait()
-                mod.incomingEventQueue = None
+        Returns:
+            dict: number of events dispatched, number of deliveries to modules,
+                  total seconds spent dispatching and mean microseconds per event
+        """
+        stats = dict(self.__dispatchStats)
+        if stats['events']:
+            stats['usPerEvent'] = stats['seconds'] * 1000000 / stats['events']
+        else:
+            stats['usPerEvent'] = 0
+        return stats
 
-        if not modules_running and not queues_empty:
-            self.__sf.debug("Clearing queues for stalled/aborted modules.")
-            for mod in self.__moduleInstances.values():
-                with suppress(Exception):
-                    while True:
-                        mod.incomingEventQueue.get_nowait()
-
-        if log_status:
-            events_queued = ", ".join([f"{mod}: {qsize:,}" for mod, qsize in modules_waiting[:5] if qsize > 0])
-            if not events_queued:
-                events_queued = 'None'
-            self.__sf.debug(f"Events queued: {sum([m[-1] for m in modules_waiting]):,} ({events_queued})")
-            if modules_running:
-                self.__sf.debug(f"Modules running: {len(modules_running):,} ({', '.join(modules_running)})")
-            if modules_errored:
-                self.__sf.debug(f"Modules errored: {len(modules_errored):,} ({', '.join(modules_errored)})")
-
-        if all(queues_empty) and not modules_running:
-            return True
-        return False
+    def __logDispatchStats(self) -> None:
+        """Log event dispatch statistics to the scan log."""
+        stats = self.dispatchStats
+        self.__sf.info(
+            f"Scan [{self.__scanId}] dispatched {stats['events']:,} events to modules "
+            f"({stats['deliveries']:,} deliveries, {stats['usPerEvent']:.1f}us per event)."
+        )
+
+    def __taskDone(self, modName: str) -> None:
+        """Record that a module has completed processing an event.
+
+        Args:
+            modName (str): name of the module which completed the task
+        """
+        mod = self.__moduleInstances.get(modName)
+        if mod is None:
+            return
+
+        if mod.errorState:
+            self.__releaseModule(mod)
+            return
+
+        if self.__inFlight[modName] > 0:
+            self.__inFlight[modName] -= 1
+            self.__inFlightTotal -= 1
+
+    def __releaseModule(self, mod) -> None:
+        """Stop tracking work for a module which is in an error state and
+        discard any events still queued for it.
+
+        Args:
+            mod (SpiderFootPlugin): errored module
+        """
+        self.__inFlightTotal -= self.__inFlight.get(mod.__name__, 0)
+        self.__inFlight[mod.__name__] = 0
+
+        if mod.incomingEventQueue is not None:
+            self.__sf.debug(f"Clearing and unsetting incomingEventQueue for errored module {mod.__name__}.")
+            with suppress(Exception):
+                while 1:
+                    mod.incomingEventQueue.get_nowait()
+            with suppress(Exception):
+                mod.incomingEventQueue.put(None)
+            mod.incomingEventQueue = None
+
+    def __logStatus(self) -> None:
+        """Log the in-flight work of each module to the debug log."""
+        modules_waiting = sorted(self.__inFlight.items(), key=lambda x: x[-1], reverse=True)
+        events_queued = ", ".join([f"{mod}: {count:,}" for mod, count in modules_waiting[:5] if count > 0])
+        if not events_queued:
+            events_queued = 'None'
+        self.__sf.debug(f"Events in flight: {self.__inFlightTotal:,} ({events_queued})")
+
+        modules_errored = [m.__name__ for m in self.__moduleInstances.values() if m.errorState]
+        if modules_errored:
+            self.__sf.debug(f"Modules errored: {len(modules_errored):,} ({', '.join(modules_errored)})")
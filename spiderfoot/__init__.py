@@ -1,8 +1,17 @@
 from .db import SpiderFootDb
 from .event import SpiderFootEvent
 from .threadpool import SpiderFootThreadPool
+from .processpool import SpiderFootProcessPool
+from .config import SpiderFootConfig
+from .ratelimit import SpiderFootRateLimiter
+from .resolver import SpiderFootResolver
+from .portscan import SpiderFootPortScanner
+from .crawler import SpiderFootCrawler
 from .plugin import SpiderFootPlugin
 from .target import SpiderFootTarget
 from .helpers import SpiderFootHelpers
+from .cache import SpiderFootCache
+from .blocklist import SpiderFootBlocklist
+from .snapshot import SpiderFootScanSnapshot
 from .correlation import SpiderFootCorrelator
 from spiderfoot.__version__ import __version__
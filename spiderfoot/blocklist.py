@@ -0,0 +1,174 @@
+import ipaddress
+import threading
+from bisect import bisect_right
+
+
+class SpiderFootBlocklist:
+    """Block list of host names, IP addresses and networks, parsed once
+    for fast lookups.
+
+    Host names are kept in a set. IP addresses and networks are merged into
+    sorted, non-overlapping ranges of integers (one list per IP version),
+    searched by bisection. Looking up a host name or IP address, or
+    whether any listed address falls within a network, takes the same
+    time however long the block list is.
+
+    Modules parse the feed data they cache into a list of entries, and
+    turn it into a block list with fromData(), which reuses the block list
+    parsed from the same data for the rest of the process:
+
+        data = self.sf.cacheGet('example', 24)
+        ...
+        return SpiderFootBlocklist.fromData('example', data, self.parseBlocklist)
+
+    Attributes:
+        hosts (frozenset): lower case host names
+    """
+
+    # Last block list parsed for each label, and the data it was parsed from
+    parsed = dict()
+    parsedLock = threading.Lock()
+
+    def __init__(self, entries: list = None) -> None:
+        """Build a block list.
+
+        Args:
+            entries (list): host names, IP addresses and networks in CIDR notation
+        """
+        hosts = set()
+        ranges = {4: list(), 6: list()}
+
+        for entry in entries or []:
+            if not entry:
+                continue
+
+            entry = entry.strip().lower()
+
+            # Host names never start with ':' and rarely with a digit, so
+            # skip parsing most of them as IP addresses.
+            if entry[0].isdigit() or entry[0] == ':':
+                try:
+                    network = ipaddress.ip_network(entry, strict=False)
+                except ValueError:
+                    pass
+                else:
+                    ranges[network.version].append((int(network.network_address), int(network.broadcast_address)))
+                    continue
+
+            hosts.add(entry)
+
+        self.hosts = frozenset(hosts)
+        self.count = len(self.hosts)
+        self.starts = dict()
+        self.ends = dict()
+
+        for version, versionRanges in ranges.items():
+            self.count += len(versionRanges)
+
+            starts = list()
+            ends = list()
+            for start, end in sorted(versionRanges):
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                    continue
+                starts.append(start)
+                ends.append(end)
+
+            self.starts[version] = starts
+            self.ends[version] = ends
+
+    @classmethod
+    def fromData(cls, label: str, data: str, parse) -> 'SpiderFootBlocklist':
+        """Return the block list parsed from feed data.
+
+        The block list last parsed under the label is reused if it was
+        parsed from the same data, such as when the data comes from the
+        cache again.
+
+        Args:
+            label (str): name of the block list, usually its cache label
+            data (str): feed data
+            parse (callable): function parsing the feed data into a list of entries
+
+        Returns:
+            SpiderFootBlocklist: block list, or None if the data could not be parsed
+        """
+        with cls.parsedLock:
+            last = cls.parsed.get(label)
+
+        # Comparing data by identity first avoids comparing megabytes of
+        # feed data for the usual case of data from the cache in memory.
+        if last is not None and (last[0] is data or last[0] == data):
+            return last[1]
+
+        entries = parse(data)
+        if entries is None:
+            return None
+
+        blocklist = cls(entries)
+        with cls.parsedLock:
+            cls.parsed[label] = (data, blocklist)
+
+        return blocklist
+
+    def __contains__(self, item: str) -> bool:
+        """Check whether a host name or IP address is listed.
+
+        Args:
+            item (str): host name or IP address
+
+        Returns:
+            bool: listed
+        """
+        if not item:
+            return False
+
+        item = item.lower()
+        if item in self.hosts:
+            return True
+
+        try:
+            address = ipaddress.ip_address(item)
+        except ValueError:
+            return False
+
+        value = int(address)
+        i = bisect_right(self.starts[address.version], value) - 1
+        return i >= 0 and self.ends[address.version][i] >= value
+
+    def __len__(self) -> int:
+        """Number of host names, IP addresses and networks listed.
+
+        Returns:
+            int: number of entries
+        """
+        return self.count
+
+    def matchNetwork(self, network: str) -> str:
+        """Find a listed IP address within a network.
+
+        Args:
+            network (str): network in CIDR notation
+
+        Returns:
+            str: the lowest listed IP address within the network, or None
+        """
+        try:
+            network = ipaddress.ip_network(network, strict=False)
+        except ValueError:
+            return None
+
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+        starts = self.starts[network.version]
+        ends = self.ends[network.version]
+
+        # Ranges don't overlap, so only the last range starting within the
+        # network (or before it) can reach into it.
+        i = bisect_right(starts, last) - 1
+        if i < 0 or ends[i] < first:
+            return None
+
+        # The lowest listed address is in the first range reaching into the network
+        j = bisect_right(ends, first - 1)
+        return str(type(network.network_address)(max(starts[j], first)))
@@ -0,0 +1,304 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .helpers import SpiderFootHelpers
+
+
+class SpiderFootCache:
+    """Cache of data fetched by modules, such as blocklists and feeds.
+
+    Data is kept in a single SQLite file in the cache directory, shared by
+    every process using it, with a bounded least recently used cache in
+    memory in front of it. When the file grows past maxSize, the least
+    recently used entries are evicted.
+
+    Attributes:
+        path (str): cache database file path
+        conn: SQLite connect() connection
+        memorySize (int): maximum characters of data kept in memory
+        maxSize (int): maximum characters of data kept on disk
+        size (int): characters of data on disk, counted when the cache is
+            opened and kept up to date as this process stores data
+    """
+
+    # Caches shared by every SpiderFoot in the process, keyed on process ID
+    # (connections must not be used across a fork) and path
+    instances = dict()
+    instancesLock = threading.Lock()
+
+    # Default maximum characters of data kept in memory and on disk
+    defaultMemorySize = 64 * 1024 * 1024
+    defaultMaxSize = 1024 * 1024 * 1024
+
+    # Settings applied to the connection
+    connectionPragmas = [
+        "PRAGMA journal_mode=WAL",  # readers in other processes don't block writes
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA busy_timeout=30000",  # wait for writes from other processes
+    ]
+
+    createSchemaQueries = [
+        "CREATE TABLE IF NOT EXISTS tbl_cache ( \
+            label       VARCHAR NOT NULL PRIMARY KEY, \
+            stored      REAL NOT NULL, \
+            accessed    REAL NOT NULL, \
+            size        INT NOT NULL, \
+            data        TEXT NOT NULL \
+        )",
+        # covers finding the least recently used entries and their size
+        "CREATE INDEX IF NOT EXISTS idx_cache_accessed ON tbl_cache (accessed, size)",
+        # hits, misses, characters read and written and entries evicted,
+        # totalled across the processes which have saved them
+        "CREATE TABLE IF NOT EXISTS tbl_cache_stats ( \
+            name        VARCHAR NOT NULL PRIMARY KEY, \
+            value       INT NOT NULL \
+        )",
+    ]
+
+    def __init__(self, path: str, memorySize: int = None, maxSize: int = None) -> None:
+        """Open the cache, creating the cache database file if it does not exist.
+
+        Args:
+            path (str): cache database file path
+            memorySize (int): maximum characters of data kept in memory
+            maxSize (int): maximum characters of data kept on disk
+
+        Raises:
+            IOError: cache database I/O failed
+        """
+        self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.path = path
+        self.memorySize = self.defaultMemorySize if memorySize is None else memorySize
+        self.maxSize = self.defaultMaxSize if maxSize is None else maxSize
+
+        self.memory = OrderedDict()
+        self.memoryUsed = 0
+        self.lock = threading.RLock()
+
+        self.counters = {
+            'memoryHits': 0,
+            'diskHits': 0,
+            'misses': 0,
+            'sizeRead': 0,
+            'sizeWritten': 0,
+            'evicted': 0,
+        }
+        self.savedCounters = dict.fromkeys(self.counters, 0)
+
+        try:
+            self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            for pragma in self.connectionPragmas:
+                self.conn.execute(pragma)
+            for query in self.createSchemaQueries:
+                self.conn.execute(query)
+            self.size = int(self.conn.execute("SELECT total(size) FROM tbl_cache").fetchone()[0])
+        except sqlite3.Error as e:
+            raise IOError(f"Error opening cache database {path}") from e
+
+    @classmethod
+    def shared(cls) -> 'SpiderFootCache':
+        """Return the cache shared by this process, in the cache directory.
+
+        Returns:
+            SpiderFootCache: cache
+        """
+        path = f"{SpiderFootHelpers.cachePath()}/cache.db"
+        with cls.instancesLock:
+            cache = cls.instances.get((os.getpid(), path))
+            if cache is None:
+                cache = cls.instances[(os.getpid(), path)] = cls(path)
+            return cache
+
+    @staticmethod
+    def key(label: str) -> str:
+        """Key of the data cached under a label.
+
+        Args:
+            label (str): name of the cached data
+
+        Returns:
+            str: key
+        """
+        return hashlib.sha224(label.encode('utf-8')).hexdigest()
+
+    def get(self, label: str, maxAge: float = 0) -> str:
+        """Retrieve data from the cache.
+
+        Args:
+            label (str): name of the cached data
+            maxAge (float): age in seconds past which cached data is ignored, 0 for no limit
+
+        Returns:
+            str: cached data, or None if not cached or too old
+        """
+        key = self.key(label)
+        oldest = time.time() - maxAge if maxAge else 0
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] >= oldest:
+                self.memory.move_to_end(key)
+                self.counters['memoryHits'] += 1
+                self.counters['sizeRead'] += len(entry[1])
+                return entry[1]
+
+            try:
+                row = self.conn.execute("SELECT stored, data FROM tbl_cache WHERE label = ? AND stored >= ?", [key, oldest]).fetchone()
+                if row is not None:
+                    self.conn.execute("UPDATE tbl_cache SET accessed = ? WHERE label = ?", [time.time(), key])
+            except sqlite3.Error as e:
+                self.log.warning(f"Error reading from cache database {self.path}: {e}")
+                row = None
+
+            if row is None:
+                self.counters['misses'] += 1
+                return None
+
+            self.counters['diskHits'] += 1
+            self.counters['sizeRead'] += len(row[1])
+            self.remember(key, row[0], row[1])
+            return row[1]
+
+    def put(self, label: str, data: str) -> None:
+        """Store data to the cache, replacing any data cached under the label.
+
+        Args:
+            label (str): name of the cached data
+            data (str): data to cache
+        """
+        key = self.key(label)
+        now = time.time()
+
+        with self.lock:
+            self.remember(key, now, data)
+            self.counters['sizeWritten'] += len(data)
+
+            try:
+                replaced = self.conn.execute("SELECT size FROM tbl_cache WHERE label = ?", [key]).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO tbl_cache (label, stored, accessed, size, data) VALUES (?, ?, ?, ?, ?)",
+                    [key, now, now, len(data), data]
+                )
+                self.size += len(data) - (replaced[0] if replaced else 0)
+                if self.size > self.maxSize:
+                    self.evict()
+            except (sqlite3.Error, UnicodeEncodeError) as e:
+                self.log.warning(f"Error writing to cache database {self.path}: {e}")
+
+    def remember(self, key: str, stored: float, data: str) -> None:
+        """Keep data in memory, evicting the least recently used data to
+        make room for it. Data larger than memorySize is not kept.
+
+        Args:
+            key (str): key of the data
+            stored (float): time the data was stored
+            data (str): data
+        """
+        old = self.memory.pop(key, None)
+        if old is not None:
+            self.memoryUsed -= len(old[1])
+
+        if len(data) > self.memorySize:
+            return
+
+        self.memory[key] = (stored, data)
+        self.memoryUsed += len(data)
+        while self.memoryUsed > self.memorySize:
+            _, (_, evicted) = self.memory.popitem(last=False)
+            self.memoryUsed -= len(evicted)
+
+    def evict(self) -> None:
+        """Evict the least recently used data on disk until it fits in maxSize."""
+        if self.size <= self.maxSize:
+            return
+
+        labels = list()
+        evicted = 0
+        for label, size in self.conn.execute("SELECT label, size FROM tbl_cache ORDER BY accessed"):
+            labels.append(label)
+            evicted += size
+            if self.size - evicted <= self.maxSize:
+                break
+        else:
+            # other processes have evicted data since it was counted
+            evicted = self.size
+
+        self.conn.executemany("DELETE FROM tbl_cache WHERE label = ?", [[label] for label in labels])
+        self.size -= evicted
+        self.counters['evicted'] += len(labels)
+
+    def purge(self) -> int:
+        """Remove all cached data, including the per-label files of older
+        versions from the cache directory.
+
+        Returns:
+            int: number of entries removed
+        """
+        with self.lock:
+            self.memory.clear()
+            self.memoryUsed = 0
+            count = self.conn.execute("DELETE FROM tbl_cache").rowcount
+            self.size = 0
+            self.conn.execute("VACUUM")
+
+        cacheDir = os.path.dirname(self.path)
+        for name in os.listdir(cacheDir):
+            if re.fullmatch(r"[0-9a-f]{56}", name):
+                os.remove(os.path.join(cacheDir, name))
+                count += 1
+
+        return count
+
+    def saveStats(self) -> None:
+        """Add this process' hits, misses, characters read and written and
+        entries evicted since they were last saved to the totals kept in the
+        cache database.
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                for name, value in counters.items():
+                    self.conn.execute("INSERT OR IGNORE INTO tbl_cache_stats (name, value) VALUES (?, 0)", [name])
+                    self.conn.execute("UPDATE tbl_cache_stats SET value = value + ? WHERE name = ?", [value - self.savedCounters[name], name])
+                self.conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self.log.warning(f"Error writing to cache database {self.path}: {e}")
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                return
+            self.savedCounters = counters
+
+    def stats(self, allProcesses: bool = False) -> dict:
+        """Statistics of the cache.
+
+        Args:
+            allProcesses (bool): count the hits, misses, characters read and
+                written and entries evicted of every process which has saved
+                them, as well as this process'
+
+        Returns:
+            dict: entries and characters of data on disk and in memory,
+                  and hits, misses, characters read and written and
+                  entries evicted from disk
+        """
+        with self.lock:
+            entries, size = self.conn.execute("SELECT count(*), total(size) FROM tbl_cache").fetchone()
+            ret = {
+                'entries': entries,
+                'size': int(size),
+                'memoryEntries': len(self.memory),
+                'memorySize': self.memoryUsed,
+            }
+            ret.update(self.counters)
+            if allProcesses:
+                for name, value in self.conn.execute("SELECT name, value FROM tbl_cache_stats"):
+                    if name in ret:
+                        ret[name] += value - self.savedCounters[name]
+            return ret
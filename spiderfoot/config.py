@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class SpiderFootConfig(Mapping):
+    """Read-only view of the options of a module in a scan.
+
+    A module's options are its own options, overridden by the global
+    options of the scan. Rather than every module getting its own copy of
+    the global options, including the Internet TLD list and the metadata
+    of every module, the global options are frozen once per scan and each
+    module's view layers its own options beneath them, so setting up a
+    module only copies the module's own options.
+
+    Modules copy the options they are given into their own dict in
+    setup(), so they can still change their own copy of an option.
+
+    Example:
+        globalOpts = SpiderFootConfig.freeze(scanOpts)
+        mod.setup(sf, SpiderFootConfig(globalOpts, modOpts))
+    """
+
+    def __init__(self, globalOpts: Mapping, moduleOpts: dict = None) -> None:
+        """Initialize the SpiderFootConfig class.
+
+        Args:
+            globalOpts (Mapping): global options, as frozen by freeze()
+            moduleOpts (dict): options of the module
+        """
+        self._globalOpts = globalOpts
+        self._moduleOpts = MappingProxyType(dict(moduleOpts or {}))
+
+    @staticmethod
+    def freeze(opts: dict) -> MappingProxyType:
+        """Read-only copy of options, to be shared by every module.
+
+        Lists are copied to tuples, so they can't be changed in place by
+        one module under the others.
+
+        Args:
+            opts (dict): options
+
+        Returns:
+            MappingProxyType: read-only options
+        """
+        frozen = dict()
+        for opt, val in opts.items():
+            if isinstance(val, list):
+                val = tuple(val)
+            frozen[opt] = val
+        return MappingProxyType(frozen)
+
+    def __getitem__(self, opt: str):
+        try:
+            return self._globalOpts[opt]
+        except KeyError:
+            return self._moduleOpts[opt]
+
+    def __iter__(self):
+        yield from self._globalOpts
+        for opt in self._moduleOpts:
+            if opt not in self._globalOpts:
+                yield opt
+
+    def __len__(self) -> int:
+        return len(self._globalOpts) + sum(1 for opt in self._moduleOpts if opt not in self._globalOpts)
+
+    def __contains__(self, opt) -> bool:
+        return opt in self._globalOpts or opt in self._moduleOpts
+
+    def __repr__(self) -> str:
+        return f"SpiderFootConfig({dict(self)!r})"
+
+    def __reduce__(self):
+        # MappingProxyType can't be pickled, so send a plain dict of
+        # options to worker processes.
+        return (dict, (dict(self),))
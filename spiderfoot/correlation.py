@@ -1,9 +1,11 @@
 import logging
-from copy import deepcopy
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from copy import copy, deepcopy
 import re
 import netaddr
 import yaml
-from spiderfoot import SpiderFootDb
+from spiderfoot import SpiderFootDb, SpiderFootScanSnapshot
 
 
 class SpiderFootCorrelator:
@@ -16,6 +18,7 @@ class SpiderFootCorrelator:
     log = logging.getLogger("spiderfoot.correlator")
     dbh = None
     scanId = None
+    snapshot = None
     types = None
     rules = list()
     type_entity_map = dict()
@@ -105,9 +108,16 @@ class SpiderFootCorrelator:
         """
         return self.rules
 
-    def run_correlations(self) -> None:
+    def run_correlations(self, workers: int = 1) -> None:
         """Run all correlation rules.
 
+        With more than one worker, rules are processed concurrently (see
+        process_rules()). Correlation results are only ever stored from
+        the calling thread.
+
+        Args:
+            workers (int): number of rules to process concurrently
+
         Raises:
             ValueError: correlation rules cannot be run on specified scanId
         """
@@ -118,9 +128,7 @@ class SpiderFootCorrelator:
         if scan_instance[5] in ["RUNNING", "STARTING", "STARTED"]:
             raise ValueError(f"Scan {self.scanId} is {scan_instance[5]}. You cannot run correlations on running scans.")
 
-        for rule in self.rules:
-            self.log.debug(f"Processing rule: {rule['id']}")
-            results = self.process_rule(rule)
+        for rule, results in self.process_rules(workers):
             if not results:
                 self.log.debug(f"No results for rule {rule['id']}.")
                 continue
@@ -130,6 +138,74 @@ class SpiderFootCorrelator:
             for result in results:
                 self.create_correlation(rule, results[result])
 
+    def process_rules(self, workers: int = 1, snapshot: bool = True):
+        """Process every correlation rule, yielding the results of each as it
+        completes.
+
+        By default, the events of the scan are loaded once into a
+        SpiderFootScanSnapshot shared by every rule, and rules collect their
+        events from it rather than querying the database for each collection.
+
+        With more than one worker, rules are handed out to a pool of that many
+        threads, each querying the database through a read-only connection of
+        its own. SQLite runs queries without holding the GIL, so collecting
+        from the database runs in parallel.
+
+        Args:
+            workers (int): number of rules to process concurrently
+            snapshot (bool): collect events from a snapshot of the scan
+
+        Yields:
+            tuple: correlation rule and its results
+        """
+        if not snapshot:
+            self.snapshot = None
+        elif self.snapshot is None and self.rules:
+            self.snapshot = SpiderFootScanSnapshot(self.dbh, self.scanId)
+
+        workers = min(workers, len(self.rules))
+        if workers <= 1:
+            for rule in self.rules:
+                self.log.debug(f"Processing rule: {rule['id']}")
+                yield rule, self.process_rule(rule)
+            return
+
+        local = threading.local()
+        handles = list()
+
+        def setupWorker() -> None:
+            """Give the pool thread a correlator with its own database connection."""
+            worker = copy(self)
+            worker.dbh = SpiderFootDb({'__database': self.dbh.path}, readonly=True)
+            handles.append(worker.dbh)
+            local.worker = worker
+
+        def processRule(rule: dict) -> dict:
+            """Process a rule on the pool thread.
+
+            Args:
+                rule (dict): correlation rule
+
+            Returns:
+                dict: correlation rule results
+            """
+            self.log.debug(f"Processing rule: {rule['id']}")
+            return local.worker.process_rule(rule)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="correlator", initializer=setupWorker) as executor:
+                futures = {executor.submit(processRule, rule): rule for rule in self.rules}
+                try:
+                    for future in as_completed(futures):
+                        yield futures[future], future.result()
+                finally:
+                    # abandon any remaining rules if a rule failed
+                    for future in futures:
+                        future.cancel()
+        finally:
+            for dbh in handles:
+                dbh.close()
+
     def build_db_criteria(self, matchrule: dict) -> dict:
         """Build up the criteria to be used to query the database.
 
@@ -387,6 +463,130 @@ class SpiderFootCorrelator:
         self.log.debug(f"returning {len(events.values())} events from match_rule {matchrule}")
         return list(events.values())
 
+    def collect_from_snapshot(self, collection: dict, fetchChildren: bool, fetchSources: bool, fetchEntities: bool) -> list:
+        """Collect events from the snapshot of the scan.
+
+        The first match rule selects the events collect_from_db() would
+        query, and every other match rule filters them as refine_collection()
+        would, before the events kept are built.
+
+        Args:
+            collection (dict): match rules
+            fetchChildren (bool): TBD
+            fetchSources (bool): TBD
+            fetchEntities (bool): TBD
+
+        Returns:
+            list: events
+        """
+        entities = dict()
+
+        for step, matchrule in enumerate(collection):
+            if step == 0:
+                self.log.debug(f"match rule: {matchrule}")
+                criteria = self.build_db_criteria(matchrule)
+                if not criteria:
+                    self.log.error(f"Error encountered parsing match rule: {matchrule}.")
+                    return None
+
+                indices = self.snapshot.select(**criteria)
+                if fetchEntities:
+                    entities = self.snapshot_entities(indices)
+                continue
+
+            keep = self.compile_patterns(matchrule['value'], matchrule['method'])
+            indices = self.snapshot.filter(indices, matchrule['field'], keep, entities)
+
+        return [self.snapshot_event(i, fetchChildren, fetchSources, fetchEntities, entities) for i in indices]
+
+    def snapshot_entities(self, indices: list) -> dict:
+        """Find the entities of events in the snapshot of the scan, as
+        enrich_event_entities() does.
+
+        Args:
+            indices (list): positions of the events
+
+        Returns:
+            dict: positions of the entities of each event
+        """
+        snapshot = self.snapshot
+        entities = dict()
+
+        # key is the event whose source to check next, value the event
+        # seeking an entity, as in enrich_event_entities()
+        entity_missing = dict()
+        for i in indices:
+            for source in snapshot.source(i):
+                if snapshot.entityTypes[source] in ['ENTITY', 'INTERNAL']:
+                    entities.setdefault(i, []).append(source)
+                else:
+                    entity_missing[source] = i
+
+        while entity_missing:
+            new_missing = dict()
+            for candidate, i in entity_missing.items():
+                for source in snapshot.source(candidate):
+                    if snapshot.entityTypes[source] in ['ENTITY', 'INTERNAL']:
+                        entities.setdefault(i, []).append(source)
+                    else:
+                        new_missing[source] = i
+            entity_missing = new_missing
+
+        return entities
+
+    def snapshot_event(self, index: int, fetchChildren: bool, fetchSources: bool, fetchEntities: bool, entities: dict) -> dict:
+        """Build an event from the snapshot of the scan, as collect_from_db()
+        would.
+
+        Args:
+            index (int): position of the event
+            fetchChildren (bool): TBD
+            fetchSources (bool): TBD
+            fetchEntities (bool): TBD
+            entities (dict): positions of the entities of each event
+
+        Returns:
+            dict: event
+        """
+        snapshot = self.snapshot
+
+        def describe(i: int) -> dict:
+            return {
+                'type': snapshot.types[i],
+                'data': snapshot.data[i],
+                'module': snapshot.modules[i],
+                'id': snapshot.ids[i],
+                'entity_type': snapshot.entityTypes[i]
+            }
+
+        event = describe(index)
+        event.update({
+            'source': [],
+            'child': [],
+            'entity': []
+        })
+
+        # You need to fetch sources if you need entities, since
+        # the source will often be the entity.
+        if fetchSources or fetchEntities:
+            event['source'] = [describe(i) for i in snapshot.source(index)]
+
+        if fetchChildren:
+            event['child'] = [{
+                'type': snapshot.types[i],
+                'data': snapshot.data[i],
+                'module': snapshot.modules[i],
+                'id': snapshot.ids[i]
+            } for i in snapshot.children(index)]
+
+        if fetchEntities:
+            for i in entities.get(index, ()):
+                # an entity which is the event's source is the same record
+                sources = [s for s in event['source'] if s['id'] == snapshot.ids[i]]
+                event['entity'].append(sources[0] if sources else describe(i))
+
+        return event
+
     def event_extract(self, event: dict, field: str) -> list:
         """Event event field.
 
@@ -407,58 +607,86 @@ class SpiderFootCorrelator:
 
         return [event[field]]
 
-    def event_keep(self, event: dict, field: str, patterns: str, patterntype: str) -> bool:
-        """Keep event field.
+    def compile_patterns(self, patterns, patterntype: str):
+        """Compile the patterns of a match rule into a function testing
+        whether a value should be kept.
+
+        The first pattern a value matches decides whether it is kept: it is
+        kept if the pattern is plain and dropped if the pattern is negated
+        ("not ..."). A value matching no pattern is kept if the last pattern
+        is negated.
 
         Args:
-            event (dict): event
-            field (str): TBD
-            patterns (str): TBD
-            patterntype (str): TBD
+            patterns (str|list): patterns to match values against
+            patterntype (str): exact or regex
 
         Returns:
-            bool: TBD
+            function: function returning True for values to keep
         """
+        if not isinstance(patterns, list):
+            patterns = [patterns]
+
+        compiled = list()
+
+        def keep(value) -> bool:
+            if patterntype not in ["exact", "regex"]:
+                return False
+
+            # compiled when first used, so patterns of rules
+            # without any events to match aren't compiled
+            if not compiled:
+                for pattern in patterns:
+                    pattern = str(pattern)
+                    negated = pattern.startswith("not ")
+                    if negated:
+                        pattern = re.sub(r"^not\s+", "", pattern)
+                    if patterntype == "regex":
+                        pattern = re.compile(pattern, re.IGNORECASE)
+                    compiled.append((negated, pattern))
+
+            ret = False
+            for negated, pattern in compiled:
+                if patterntype == "exact":
+                    matched = value == pattern
+                else:
+                    matched = pattern.search(value)
+                ret = negated
+                if matched:
+                    return not negated
+            return ret
+
+        return keep
+
+    def event_matches(self, event: dict, field: str, keep) -> bool:
+        """Check whether to keep an event according to compiled patterns.
+
+        Args:
+            event (dict): event
+            field (str): field to test
+            keep (function): function returning True for values to keep, from compile_patterns()
 
+        Returns:
+            bool: event should be kept
+        """
         if "." in field:
             key, field = field.split(".")
-            return any(self.event_keep(subevent, field, patterns, patterntype) for subevent in event[key])
+            return any(self.event_matches(subevent, field, keep) for subevent in event[key])
 
-        value = event[field]
+        return keep(event[field])
 
-        if patterntype == "exact":
-            ret = False
-            for pattern in patterns:
-                if pattern.startswith("not "):
-                    ret = True
-                    pattern = re.sub(r"^not\s+", "", pattern)
-                    if value == pattern:
-                        return False
-                else:
-                    ret = False
-                    if value == pattern:
-                        return True
-            if ret:
-                return True
-            return False
+    def event_keep(self, event: dict, field: str, patterns: str, patterntype: str) -> bool:
+        """Keep event field.
 
-        if patterntype == "regex":
-            ret = False
-            for pattern in patterns:
-                if pattern.startswith("not "):
-                    ret = True
-                    pattern = re.sub(r"^not\s+", "", pattern)
-                    if re.search(pattern, value, re.IGNORECASE):
-                        return False
-                else:
-                    ret = False
-                    if re.search(pattern, value, re.IGNORECASE):
-                        return True
-            if ret:
-                return True
-            return False
+        Args:
+            event (dict): event
+            field (str): TBD
+            patterns (str): TBD
+            patterntype (str): TBD
 
-        return False
+        Returns:
+            bool: TBD
+        """
+        return self.event_matches(event, field, self.compile_patterns(patterns, patterntype))
 
     def refine_collection(self, matchrule: dict, events: list) -> None:
         """Cull events from the events list if they don't meet the match criteria.
@@ -467,23 +695,14 @@ class SpiderFootCorrelator:
             matchrule (dict): TBD
             events (list): TBD
         """
-        patterns = list()
-
-        if isinstance(matchrule['value'], list):
-            for r in matchrule['value']:
-                patterns.append(str(r))
-        else:
-            patterns = [str(matchrule['value'])]
-
         field = matchrule['field']
-        self.log.debug(f"attempting to match {patterns} against the {field} field in {len(events)} events")
+        self.log.debug(f"attempting to match {matchrule['value']} against the {field} field in {len(events)} events")
 
         # Go through each event, remove it if we shouldn't keep it
         # according to the match rule patterns.
-        for event in events[:]:
-            if not self.event_keep(event, field, patterns, matchrule['method']):
-                self.log.debug(f"removing {event} because of {field}")
-                events.remove(event)
+        keep = self.compile_patterns(matchrule['value'], matchrule['method'])
+        events[:] = [event for event in events if self.event_matches(event, field, keep)]
+        self.log.debug(f"{len(events)} events left after matching the {field} field")
 
     def collect_events(self, collection: dict, fetchChildren: bool, fetchSources: bool, fetchEntities: bool, collectIndex: int) -> list:
         """Collect data for aggregation and analysis.
@@ -500,19 +719,27 @@ class SpiderFootCorrelator:
         """
         step = 0
 
-        for matchrule in collection:
-            # First match rule means we fetch from the database, every
-            # other step happens locally to avoid burdening the db.
-            if step == 0:
-                events = self.collect_from_db(matchrule,
-                                              fetchEntities=fetchEntities,
-                                              fetchChildren=fetchChildren,
-                                              fetchSources=fetchSources)
-                step += 1
-                continue
+        # With a snapshot of the scan, every match rule is applied to the
+        # snapshot before any events are built.
+        if self.snapshot is not None:
+            events = self.collect_from_snapshot(collection,
+                                                fetchEntities=fetchEntities,
+                                                fetchChildren=fetchChildren,
+                                                fetchSources=fetchSources)
+        else:
+            for matchrule in collection:
+                # First match rule means we fetch from the database, every
+                # other step happens locally to avoid burdening the db.
+                if step == 0:
+                    events = self.collect_from_db(matchrule,
+                                                  fetchEntities=fetchEntities,
+                                                  fetchChildren=fetchChildren,
+                                                  fetchSources=fetchSources)
+                    step += 1
+                    continue
 
-            # Remove events in-place based on subsequent match-rules
-            self.refine_collection(matchrule, events)
+                # Remove events in-place based on subsequent match-rules
+                self.refine_collection(matchrule, events)
 
         # Stamp events with this collection ID for potential
         # use in analysis later.
@@ -555,6 +782,7 @@ class SpiderFootCorrelator:
             """
             topfield, subfield = field.split(".")
             if field.startswith(topfield + "."):
+                event[topfield] = list(event[topfield])
                 for s in event[topfield]:
                     if s[subfield] != value:
                         event[topfield].remove(s)
@@ -563,11 +791,14 @@ class SpiderFootCorrelator:
         for e in events:
             buckets = self.event_extract(e, rule['field'])
             for b in buckets:
-                e_copy = deepcopy(e)
+                # events aren't changed once collected, so only
+                # events with sub fields to strip are copied
+                e_copy = e
                 # if the bucket is of a child, source or entity,
                 # remove the children, sources or entities that
                 # aren't matching this bucket
                 if "." in rule['field']:
+                    e_copy = copy(e)
                     event_strip(e_copy, rule['field'], b)
                 if b in ret:
                     ret[b].append(e_copy)
@@ -612,7 +843,7 @@ class SpiderFootCorrelator:
             rule (dict): correlation rule
             buckets (dict): TBD
         """
-        self.log.debug(f"called with buckets {buckets}")
+        self.log.debug(f"called with {len(buckets)} buckets")
 
         def check_event(events: list, reference: list) -> bool:
             """Check event.
@@ -873,7 +1104,6 @@ class SpiderFootCorrelator:
             return None
 
         self.log.debug(f"{len(events)} proceeding to next stage: aggregation.")
-        self.log.debug(f"{events} ready to be processed.")
 
         # Perform aggregations. Aggregating breaks up the events
         # into buckets with the key being the field to aggregate by.
@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import re
+import time
+import urllib.parse
+
+
+class SpiderFootCrawler:
+    """Crawls a site, fetching pages from a frontier of links to follow.
+
+    Links wait in a frontier of their own for each host, fetched lowest
+    level first (the starting point is level 0, the links on it level 1,
+    and so on) and in the order they were found within a level. Pages are
+    fetched by workers running on an event loop, at most hostConcurrency
+    from each host at once, and a host's fetches start at least pause
+    seconds apart.
+
+    Links are recognised as already seen by a 64-bit hash of their
+    canonical form (see canonicalUrl()), so the set of pages fetched stays
+    small however many are crawled, and can be shared by every crawl of a
+    scan:
+
+        crawler = SpiderFootCrawler(fetch, process, seen=fetchedPages, maxPages=100, maxLevels=3)
+        crawler.add("https://example.com/")
+        asyncio.run(crawler.crawl())
+
+    fetch(url) is a coroutine returning the page at a URL; process(url,
+    page) returns the links on the page to follow, if any.
+
+    Attributes:
+        seen (set): hashes of the links fetched
+        maxPages (int): maximum number of pages fetched
+        maxLevels (int): maximum level of links followed
+        hostConcurrency (int): maximum number of pages fetched from each host at once
+        pause (float): minimum seconds between the starts of fetches from each host
+        workers (int): number of pages fetched at once
+        pagesFetched (int): number of pages fetched
+    """
+
+    def __init__(
+        self,
+        fetch,
+        process,
+        seen: set = None,
+        maxPages: int = 100,
+        maxLevels: int = 3,
+        hostConcurrency: int = 4,
+        pause: float = 0,
+        workers: int = 16,
+        stop=None
+    ) -> None:
+        """Initialize the SpiderFootCrawler class.
+
+        Args:
+            fetch (function): coroutine function fetching the page at a URL
+            process (function): function returning the links to follow on a fetched page
+            seen (set): hashes of the links already fetched, updated as pages are fetched
+            maxPages (int): maximum number of pages fetched
+            maxLevels (int): maximum level of links followed
+            hostConcurrency (int): maximum number of pages fetched from each host at once
+            pause (float): minimum seconds between the starts of fetches from each host
+            workers (int): number of pages fetched at once
+            stop (function): function returning True when the crawl should stop
+        """
+        self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.fetch = fetch
+        self.process = process
+        self.seen = set() if seen is None else seen
+        self.maxPages = int(maxPages)
+        self.maxLevels = int(maxLevels)
+        self.hostConcurrency = max(1, int(hostConcurrency))
+        self.pause = float(pause)
+        self.workers = max(1, int(workers))
+        self.stop = stop
+        self.pagesFetched = 0
+
+        # hashes of the links waiting in the frontier
+        self._queued = set()
+        # per host: heap of (level, order, url, hash) to fetch, number of
+        # pages being fetched, and time the next fetch may start
+        self._frontier = dict()
+        self._active = dict()
+        self._nextStart = dict()
+        self._order = itertools.count()
+        self._changed = None
+
+    @staticmethod
+    def canonicalUrl(url: str) -> str:
+        """Canonical form of a URL, for recognising links to the same page.
+
+        The scheme and host name are lower-cased, default ports, fragments
+        and "." and ".." path segments are dropped, an empty path becomes
+        "/" and percent-encoded characters are upper-cased.
+
+        Args:
+            url (str): URL
+
+        Returns:
+            str: canonical URL
+        """
+        try:
+            parts = urllib.parse.urlsplit(url.strip())
+            port = parts.port
+        except ValueError:
+            return url
+
+        if not parts.path.startswith('/') and parts.path:
+            return url
+
+        scheme = parts.scheme.lower()
+        netloc = (parts.hostname or '').rstrip('.')
+        if ':' in netloc:
+            netloc = f"[{netloc}]"
+        if parts.username is not None or parts.password is not None:
+            netloc = parts.netloc.rsplit('@', 1)[0] + '@' + netloc
+        if port is not None and (scheme, port) not in (('http', 80), ('https', 443)):
+            netloc += f":{port}"
+
+        segments = list()
+        for segment in parts.path.split('/')[1:]:
+            if segment == '..':
+                if segments:
+                    segments.pop()
+            elif segment != '.':
+                segments.append(segment)
+        path = '/' + '/'.join(segments)
+        if parts.path.endswith(('/.', '/..')):
+            path = path.rstrip('/') + '/'
+
+        path = re.sub(r'%[0-9a-fA-F]{2}', lambda m: m.group(0).upper(), path)
+        query = re.sub(r'%[0-9a-fA-F]{2}', lambda m: m.group(0).upper(), parts.query)
+
+        return urllib.parse.urlunsplit((scheme, netloc, path, query, ''))
+
+    @staticmethod
+    def urlHash(url: str) -> int:
+        """64-bit hash of the canonical form of a URL.
+
+        Args:
+            url (str): URL
+
+        Returns:
+            int: hash
+        """
+        digest = hashlib.blake2b(SpiderFootCrawler.canonicalUrl(url).encode('utf-8', errors='replace'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+    @staticmethod
+    def robotsMatcher(disallowed: list):
+        """Compile robots.txt Disallow rules into one regular expression.
+
+        A link is disallowed when its lower-cased form contains the
+        lower-cased path of a rule, or there is a rule for "*".
+
+        Args:
+            disallowed (list): paths of the Disallow rules
+
+        Returns:
+            re.Pattern: pattern to search lower-cased links with, or None if there are no rules
+        """
+        if not disallowed:
+            return None
+        if '*' in disallowed:
+            return re.compile('')
+        return re.compile('|'.join(re.escape(path.lower()) for path in sorted(set(disallowed), key=len)))
+
+    def add(self, url: str, level: int = 0) -> bool:
+        """Add a link to the frontier, unless it has been seen before or
+        is past the maximum level.
+
+        Args:
+            url (str): link
+            level (int): level of the link
+
+        Returns:
+            bool: link was added
+        """
+        if level > self.maxLevels:
+            return False
+
+        key = self.urlHash(url)
+        if key in self.seen or key in self._queued:
+            return False
+
+        try:
+            host = urllib.parse.urlsplit(url).hostname or ''
+        except ValueError:
+            return False
+
+        self._queued.add(key)
+        heapq.heappush(self._frontier.setdefault(host, list()), (level, next(self._order), url, key))
+        if self._changed is not None:
+            self._changed.set()
+        return True
+
+    def _nextLink(self) -> tuple:
+        """Take the next link to fetch from the frontier.
+
+        Returns:
+            tuple: host, level, link and hash of the link, or seconds until
+                   a link may be fetched, or None if there are none to fetch
+        """
+        now = time.monotonic()
+        best = None
+        wait = None
+        for host, links in self._frontier.items():
+            if not links or self._active.get(host, 0) >= self.hostConcurrency:
+                continue
+            startAt = self._nextStart.get(host, 0)
+            if startAt > now:
+                wait = startAt - now if wait is None else min(wait, startAt - now)
+                continue
+            if best is None or links[0] < self._frontier[best][0]:
+                best = host
+
+        if best is None:
+            return wait
+
+        level, _, url, key = heapq.heappop(self._frontier[best])
+        if not self._frontier[best]:
+            del self._frontier[best]
+        self._queued.discard(key)
+        self._active[best] = self._active.get(best, 0) + 1
+        self._nextStart[best] = now + self.pause
+        return best, level, url, key
+
+    async def _worker(self) -> None:
+        while True:
+            if self.pagesFetched >= self.maxPages or (self.stop is not None and self.stop()):
+                return
+
+            link = self._nextLink()
+            if link is None and not any(self._active.values()):
+                return
+
+            if not isinstance(link, tuple):
+                # wait for a fetch to find links, or a host's pause to pass
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), link)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            host, level, url, key = link
+            if key in self.seen:
+                self._active[host] -= 1
+                continue
+            self.seen.add(key)
+            self.pagesFetched += 1
+
+            try:
+                page = await self.fetch(url)
+                links = self.process(url, page)
+            except Exception as e:
+                self.log.error(f"Failed to crawl {url}: {e}", exc_info=True)
+                links = None
+            finally:
+                self._active[host] -= 1
+                self._changed.set()
+
+            for found in links or ():
+                self.add(found, level + 1)
+
+    async def crawl(self) -> int:
+        """Fetch pages until the frontier is empty, maxPages pages have
+        been fetched, or stop() returns True.
+
+        Returns:
+            int: number of pages fetched
+        """
+        self._changed = asyncio.Event()
+        await asyncio.gather(*[self._worker() for _ in range(self.workers)])
+        return self.pagesFetched
@@ -12,6 +12,7 @@
 
 from pathlib import Path
 import hashlib
+import os
 import random
 import re
 import sqlite3
@@ -26,14 +27,43 @@ class SpiderFootDb:
         conn: SQLite connect() connection
         dbh: SQLite cursor() database handle
         dbhLock (_thread.RLock): thread lock on database handle
+        path (str): database file path
+        readonly (bool): handle has a read-only connection of its own
+
+    Note:
+        Every SpiderFootDb in a process using the same database file shares
+        one SQLite connection, so creating a SpiderFootDb (as each module
+        thread and web UI request does) only costs a new cursor. The schema
+        is checked when the connection is first opened. All access to the
+        connection is serialised by dbhLock. Read-only handles have their
+        own connection and lock instead.
     """
 
     dbh = None
     conn = None
+    path = None
+    readonly = False
 
     # Prevent multithread access to sqlite database
     dbhLock = threading.RLock()
 
+    # Connections shared by every SpiderFootDb in the process, keyed on
+    # process ID (connections must not be used across a fork) and path
+    connections = dict()
+
+    # Maximum number of IDs to look up in one query when walking the
+    # graph of events
+    elementChunkSize = 5000
+
+    # Settings applied to every connection
+    connectionPragmas = [
+        "PRAGMA synchronous=NORMAL",  # safe with WAL; fsync on checkpoint, not every commit
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",  # 64 MiB
+        "PRAGMA mmap_size=268435456",  # 256 MiB
+        "PRAGMA busy_timeout=30000",  # wait up to 30 seconds for other processes' locks
+    ]
+
     # Queries for creating the SpiderFoot database
     createSchemaQueries = [
         "PRAGMA journal_mode=WAL",
@@ -99,15 +129,29 @@ class SpiderFootDb:
             event_hash          VARCHAR NOT NULL REFERENCES tbl_scan_results(hash) \
         )",
         "CREATE INDEX idx_scan_results_id ON tbl_scan_results (scan_instance_id)",
-        "CREATE INDEX idx_scan_results_type ON tbl_scan_results (scan_instance_id, type)",
+        "CREATE INDEX idx_scan_results_type_data ON tbl_scan_results (scan_instance_id, type, data, false_positive, generated)",
         "CREATE INDEX idx_scan_results_hash ON tbl_scan_results (scan_instance_id, hash)",
-        "CREATE INDEX idx_scan_results_module ON tbl_scan_results(scan_instance_id, module)",
+        "CREATE INDEX idx_scan_results_module_data ON tbl_scan_results (scan_instance_id, module, type, data, generated)",
         "CREATE INDEX idx_scan_results_srchash ON tbl_scan_results (scan_instance_id, source_event_hash)",
         "CREATE INDEX idx_scan_logs ON tbl_scan_log (scan_instance_id)",
         "CREATE INDEX idx_scan_correlation ON tbl_scan_correlation_results (scan_instance_id, id)",
         "CREATE INDEX idx_scan_correlation_events ON tbl_scan_correlation_results_events (correlation_id)"
     ]
 
+    # Queries for bringing the schema of an existing database up to date.
+    # These are run whenever a database is first connected to, so must be
+    # safe to run more than once.
+    migrateSchemaQueries = [
+        # Cover the columns filtered, grouped and sorted on by scanResultEvent(),
+        # scanResultSummary(), scanResultEventUnique() and scanResultHistory(),
+        # so results come back in order without sorting and summaries are
+        # read from the index alone. These replace the type and module indexes.
+        "CREATE INDEX IF NOT EXISTS idx_scan_results_type_data ON tbl_scan_results (scan_instance_id, type, data, false_positive, generated)",
+        "CREATE INDEX IF NOT EXISTS idx_scan_results_module_data ON tbl_scan_results (scan_instance_id, module, type, data, generated)",
+        "DROP INDEX IF EXISTS idx_scan_results_type",
+        "DROP INDEX IF EXISTS idx_scan_results_module",
+    ]
+
     eventDetails = [
         ['ROOT', 'Internal SpiderFoot Root event', 1, 'INTERNAL'],
         ['ACCOUNT_EXTERNAL_OWNED', 'Account on External Site', 0, 'ENTITY'],
@@ -283,7 +327,7 @@ class SpiderFootDb:
         ['WIKIPEDIA_PAGE_EDIT', 'Wikipedia Page Edit', 0, 'DESCRIPTOR'],
     ]
 
-    def __init__(self, opts: dict, init: bool = False) -> None:
+    def __init__(self, opts: dict, init: bool = False, readonly: bool = False) -> None:
         """Initialize database and create handle to the SQLite database file.
         Creates the database file if it does not exist.
         Creates database schema if it does not exist.
@@ -292,11 +336,14 @@ class SpiderFootDb:
             opts (dict): must specify the database file path in the '__database' key
             init (bool): initialise the database schema.
                          if the database file does not exist this option will be ignored.
+            readonly (bool): open a read-only connection of this handle's own
+                             instead of sharing the process' connection, so
+                             its queries can run alongside those of other threads.
+                             The database must already exist.
 
         Raises:
             TypeError: arg type was invalid
             ValueError: arg value was invalid
-            IOError: database I/O failed
         """
 
         if not isinstance(opts, dict):
@@ -307,15 +354,50 @@ class SpiderFootDb:
             raise ValueError("opts['__database'] is empty") from None
 
         database_path = opts['__database']
+        self.path = database_path
+
+        if readonly:
+            self.readonly = True
+            self.dbhLock = threading.RLock()
+            self.connect(database_path, readonly=True)
+            return
 
         # create database directory
         Path(database_path).parent.mkdir(exist_ok=True, parents=True)
 
+        with self.dbhLock:
+            dbh = self.connections.get((os.getpid(), database_path))
+            if dbh is not None:
+                self.conn = dbh
+                self.dbh = dbh.cursor()
+                if init:
+                    self.populateEventTypes()
+                return
+
+            self.connect(database_path, init)
+            self.connections[(os.getpid(), database_path)] = self.conn
+
+    def connect(self, database_path: str, init: bool = False, readonly: bool = False) -> None:
+        """Connect to the SQLite database file, apply connectionPragmas and
+        make sure the schema is set up.
+
+        Args:
+            database_path (str): database file path
+            init (bool): initialise the database schema.
+            readonly (bool): open the database read-only, without checking the schema.
+
+        Raises:
+            IOError: database I/O failed
+        """
+
         # connect() will create the database file if it doesn't exist, but
         # at least we can use this opportunity to ensure we have permissions to
         # read and write to such a file.
         try:
-            dbh = sqlite3.connect(database_path)
+            if readonly:
+                dbh = sqlite3.connect(f"{Path(database_path).absolute().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                dbh = sqlite3.connect(database_path, check_same_thread=False)
         except Exception as e:
             raise IOError(f"Error connecting to internal database {database_path}") from e
 
@@ -346,12 +428,21 @@ class SpiderFootDb:
                 return False
             return ret is not None
 
-        # Now we actually check to ensure the database file has the schema set
-        # up correctly.
         with self.dbhLock:
             try:
-                self.dbh.execute('SELECT COUNT(*) FROM tbl_scan_config')
+                for qry in self.connectionPragmas:
+                    self.dbh.execute(qry)
                 self.conn.create_function("REGEXP", 2, __dbregex__)
+            except sqlite3.Error as e:
+                raise IOError(f"Error configuring connection to internal database {database_path}") from e
+
+            if readonly:
+                return
+
+            # Now we actually check to ensure the database file has the schema set
+            # up correctly.
+            try:
+                self.dbh.execute('SELECT COUNT(*) FROM tbl_scan_config')
             except sqlite3.Error:
                 init = True
                 try:
@@ -374,22 +465,35 @@ class SpiderFootDb:
                                   "SpiderFoot wasn't able to migrate you, so you'll need to delete "
                                   "your SpiderFoot database in order to proceed.") from None
 
+            try:
+                for query in self.migrateSchemaQueries:
+                    self.dbh.execute(query)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                raise IOError("Tried to update the SpiderFoot database schema, but failed") from e
+
             if init:
-                for row in self.eventDetails:
-                    event = row[0]
-                    event_descr = row[1]
-                    event_raw = row[2]
-                    event_type = row[3]
-                    qry = "INSERT INTO tbl_event_types (event, event_descr, event_raw, event_type) VALUES (?, ?, ?, ?)"
+                self.populateEventTypes()
 
-                    try:
-                        self.dbh.execute(qry, (
-                            event, event_descr, event_raw, event_type
-                        ))
-                        self.conn.commit()
-                    except Exception:
-                        continue
-                self.conn.commit()
+    def populateEventTypes(self) -> None:
+        """Add any missing event types to the database."""
+
+        with self.dbhLock:
+            for row in self.eventDetails:
+                event = row[0]
+                event_descr = row[1]
+                event_raw = row[2]
+                event_type = row[3]
+                qry = "INSERT INTO tbl_event_types (event, event_descr, event_raw, event_type) VALUES (?, ?, ?, ?)"
+
+                try:
+                    self.dbh.execute(qry, (
+                        event, event_descr, event_raw, event_type
+                    ))
+                    self.conn.commit()
+                except Exception:
+                    continue
+            self.conn.commit()
 
     #
     # Back-end database operations
@@ -422,10 +526,12 @@ class SpiderFootDb:
                 raise IOError("SQL error encountered when setting up database") from e
 
     def close(self) -> None:
-        """Close the database handle."""
+        """Close the database handle, and its connection if read-only."""
 
         with self.dbhLock:
             self.dbh.close()
+            if self.readonly:
+                self.conn.close()
 
     def vacuumDB(self) -> None:
         """Vacuum the database. Clears unused database file pages.
@@ -974,6 +1080,36 @@ class SpiderFootDb:
             except sqlite3.Error as e:
                 raise IOError("SQL error encountered when fetching result events") from e
 
+    def scanResultSnapshot(self, instanceId: str) -> list:
+        """Obtain the ID, type, module, data and source ID of every event
+        of a scan, ordered by data, then as the index scanResultEvent()
+        searches for an event type orders them.
+
+        Args:
+            instanceId (str): scan instance ID
+
+        Returns:
+            list: scan results
+
+        Raises:
+            TypeError: arg type was invalid
+            IOError: database I/O failed
+        """
+
+        if not isinstance(instanceId, str):
+            raise TypeError(f"instanceId is {type(instanceId)}; expected str()") from None
+
+        qry = "SELECT c.hash, c.type, c.module, c.data, c.source_event_hash \
+            FROM tbl_scan_results c WHERE c.scan_instance_id = ? \
+            ORDER BY c.data, c.false_positive, c.generated"
+
+        with self.dbhLock:
+            try:
+                self.dbh.execute(qry, [instanceId])
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                raise IOError("SQL error encountered when fetching result events") from e
+
     def scanResultEventUnique(self, instanceId: str, eventType: str = 'ALL', filterFp: bool = False) -> list:
         """Obtain a unique list of elements.
 
@@ -1344,6 +1480,16 @@ class SpiderFootDb:
             instanceId (str): scan instance ID
             sfEvent (SpiderFootEvent): event to be stored in the database
             truncateSize (int): truncate size for event data
+        """
+        self.scanEventStoreBatch(instanceId, [sfEvent], truncateSize)
+
+    def scanEventStoreBatch(self, instanceId: str, batch: list, truncateSize: int = 0) -> None:
+        """Store a batch of events in the database, in a single transaction.
+
+        Args:
+            instanceId (str): scan instance ID
+            batch (list): events (SpiderFootEvent) to be stored in the database
+            truncateSize (int): truncate size for event data
 
         Raises:
             TypeError: arg type was invalid
@@ -1358,81 +1504,91 @@ class SpiderFootDb:
         if not instanceId:
             raise ValueError("instanceId is empty") from None
 
-        if not isinstance(sfEvent, SpiderFootEvent):
-            raise TypeError(f"sfEvent is {type(sfEvent)}; expected SpiderFootEvent()") from None
+        if not isinstance(batch, list):
+            raise TypeError(f"batch is {type(batch)}; expected list()") from None
 
-        if not isinstance(sfEvent.generated, float):
-            raise TypeError(f"sfEvent.generated is {type(sfEvent.generated)}; expected float()") from None
+        inserts = []
 
-        if not sfEvent.generated:
-            raise ValueError("sfEvent.generated is empty") from None
+        for sfEvent in batch:
+            if not isinstance(sfEvent, SpiderFootEvent):
+                raise TypeError(f"sfEvent is {type(sfEvent)}; expected SpiderFootEvent()") from None
 
-        if not isinstance(sfEvent.eventType, str):
-            raise TypeError(f"sfEvent.eventType is {type(sfEvent.eventType,)}; expected str()") from None
+            if not isinstance(sfEvent.generated, float):
+                raise TypeError(f"sfEvent.generated is {type(sfEvent.generated)}; expected float()") from None
 
-        if not sfEvent.eventType:
-            raise ValueError("sfEvent.eventType is empty") from None
+            if not sfEvent.generated:
+                raise ValueError("sfEvent.generated is empty") from None
 
-        if not isinstance(sfEvent.data, str):
-            raise TypeError(f"sfEvent.data is {type(sfEvent.data)}; expected str()") from None
+            if not isinstance(sfEvent.eventType, str):
+                raise TypeError(f"sfEvent.eventType is {type(sfEvent.eventType,)}; expected str()") from None
 
-        if not sfEvent.data:
-            raise ValueError("sfEvent.data is empty") from None
+            if not sfEvent.eventType:
+                raise ValueError("sfEvent.eventType is empty") from None
 
-        if not isinstance(sfEvent.module, str):
-            raise TypeError(f"sfEvent.module is {type(sfEvent.module)}; expected str()") from None
+            if not isinstance(sfEvent.data, str):
+                raise TypeError(f"sfEvent.data is {type(sfEvent.data)}; expected str()") from None
 
-        if not sfEvent.module and sfEvent.eventType != "ROOT":
-            raise ValueError("sfEvent.module is empty") from None
+            if not sfEvent.data:
+                raise ValueError("sfEvent.data is empty") from None
 
-        if not isinstance(sfEvent.confidence, int):
-            raise TypeError(f"sfEvent.confidence is {type(sfEvent.confidence)}; expected int()") from None
+            if not isinstance(sfEvent.module, str):
+                raise TypeError(f"sfEvent.module is {type(sfEvent.module)}; expected str()") from None
 
-        if not 0 <= sfEvent.confidence <= 100:
-            raise ValueError(f"sfEvent.confidence value is {type(sfEvent.confidence)}; expected 0 - 100") from None
+            if not sfEvent.module and sfEvent.eventType != "ROOT":
+                raise ValueError("sfEvent.module is empty") from None
 
-        if not isinstance(sfEvent.visibility, int):
-            raise TypeError(f"sfEvent.visibility is {type(sfEvent.visibility)}; expected int()") from None
+            if not isinstance(sfEvent.confidence, int):
+                raise TypeError(f"sfEvent.confidence is {type(sfEvent.confidence)}; expected int()") from None
 
-        if not 0 <= sfEvent.visibility <= 100:
-            raise ValueError(f"sfEvent.visibility value is {type(sfEvent.visibility)}; expected 0 - 100") from None
+            if not 0 <= sfEvent.confidence <= 100:
+                raise ValueError(f"sfEvent.confidence value is {type(sfEvent.confidence)}; expected 0 - 100") from None
 
-        if not isinstance(sfEvent.risk, int):
-            raise TypeError(f"sfEvent.risk is {type(sfEvent.risk)}; expected int()") from None
+            if not isinstance(sfEvent.visibility, int):
+                raise TypeError(f"sfEvent.visibility is {type(sfEvent.visibility)}; expected int()") from None
 
-        if not 0 <= sfEvent.risk <= 100:
-            raise ValueError(f"sfEvent.risk value is {type(sfEvent.risk)}; expected 0 - 100") from None
+            if not 0 <= sfEvent.visibility <= 100:
+                raise ValueError(f"sfEvent.visibility value is {type(sfEvent.visibility)}; expected 0 - 100") from None
 
-        if not isinstance(sfEvent.sourceEvent, SpiderFootEvent) and sfEvent.eventType != "ROOT":
-            raise TypeError(f"sfEvent.sourceEvent is {type(sfEvent.sourceEvent)}; expected str()") from None
+            if not isinstance(sfEvent.risk, int):
+                raise TypeError(f"sfEvent.risk is {type(sfEvent.risk)}; expected int()") from None
 
-        if not isinstance(sfEvent.sourceEventHash, str):
-            raise TypeError(f"sfEvent.sourceEventHash is {type(sfEvent.sourceEventHash)}; expected str()") from None
+            if not 0 <= sfEvent.risk <= 100:
+                raise ValueError(f"sfEvent.risk value is {type(sfEvent.risk)}; expected 0 - 100") from None
 
-        if not sfEvent.sourceEventHash:
-            raise ValueError("sfEvent.sourceEventHash is empty") from None
+            if not isinstance(sfEvent.sourceEvent, SpiderFootEvent) and sfEvent.eventType != "ROOT":
+                raise TypeError(f"sfEvent.sourceEvent is {type(sfEvent.sourceEvent)}; expected str()") from None
 
-        storeData = sfEvent.data
+            if not isinstance(sfEvent.sourceEventHash, str):
+                raise TypeError(f"sfEvent.sourceEventHash is {type(sfEvent.sourceEventHash)}; expected str()") from None
 
-        # truncate if required
-        if isinstance(truncateSize, int) and truncateSize > 0:
-            storeData = storeData[0:truncateSize]
+            if not sfEvent.sourceEventHash:
+                raise ValueError("sfEvent.sourceEventHash is empty") from None
+
+            storeData = sfEvent.data
+
+            # truncate if required
+            if isinstance(truncateSize, int) and truncateSize > 0:
+                storeData = storeData[0:truncateSize]
+
+            inserts.append((instanceId, sfEvent.hash, sfEvent.eventType, sfEvent.generated,
+                            sfEvent.confidence, sfEvent.visibility, sfEvent.risk,
+                            sfEvent.module, storeData, sfEvent.sourceEventHash))
+
+        if not inserts:
+            return
 
-        # retrieve scan results
         qry = "INSERT INTO tbl_scan_results \
             (scan_instance_id, hash, type, generated, confidence, \
             visibility, risk, module, data, source_event_hash) \
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
 
-        qvals = [instanceId, sfEvent.hash, sfEvent.eventType, sfEvent.generated,
-                 sfEvent.confidence, sfEvent.visibility, sfEvent.risk,
-                 sfEvent.module, storeData, sfEvent.sourceEventHash]
-
         with self.dbhLock:
             try:
-                self.dbh.execute(qry, qvals)
+                self.dbh.executemany(qry, inserts)
                 self.conn.commit()
             except sqlite3.Error as e:
+                # don't leave part of the batch waiting to be committed
+                self.conn.rollback()
                 raise IOError(f"SQL error encountered when storing event data ({self.dbh})") from e
 
     def scanInstanceList(self) -> list:
@@ -1598,6 +1754,9 @@ class SpiderFootDb:
     def scanElementSourcesAll(self, instanceId: str, childData: list) -> list:
         """Get the full set of upstream IDs which are parents to the supplied set of IDs.
 
+        The whole chain of sources is fetched with one recursive query per
+        chunk of up to `elementChunkSize` IDs, rather than a query per level.
+
         Args:
             instanceId (str): scan instance ID
             childData (list): TBD
@@ -1608,6 +1767,7 @@ class SpiderFootDb:
         Raises:
             TypeError: arg type was invalid
             ValueError: arg value was invalid
+            IOError: database I/O failed
         """
 
         if not isinstance(instanceId, str):
@@ -1619,56 +1779,72 @@ class SpiderFootDb:
         if not childData:
             raise ValueError("childData is empty")
 
-        # Get the first round of source IDs for the leafs
-        keepGoing = True
-        nextIds = list()
         datamap = dict()
+        # parent ID -> child IDs, kept as dict keys so they stay unique and in order
         pc = dict()
 
         for row in childData:
             # these must be unique values!
-            parentId = row[9]
-            childId = row[8]
-            datamap[childId] = row
-
-            if parentId in pc:
-                if childId not in pc[parentId]:
-                    pc[parentId].append(childId)
-            else:
-                pc[parentId] = [childId]
-
-            # parents of the leaf set
-            if parentId not in nextIds:
-                nextIds.append(parentId)
+            datamap[row[8]] = row
+            pc.setdefault(row[9], dict())[row[8]] = None
+
+        hashIds = [hashId for hashId in pc if hashId and hashId != "ROOT" and hashId.isalnum()]
+
+        # The sources of the parents, and their sources and so on, stopping at
+        # ROOT (whose source is itself). The output of this needs to be aligned
+        # with scanElementSourcesDirect.
+        qry = "WITH RECURSIVE sources(hash) AS ( \
+                SELECT hash FROM tbl_scan_results \
+                WHERE scan_instance_id = ? AND hash IN ('%s') \
+                UNION \
+                SELECT r.source_event_hash FROM tbl_scan_results r, sources \
+                WHERE r.scan_instance_id = ? AND r.hash = sources.hash \
+                AND r.source_event_hash != 'ROOT' \
+            ) \
+            SELECT ROUND(c.generated) AS generated, c.data, \
+            s.data as 'source_data', \
+            c.module, c.type, c.confidence, c.visibility, c.risk, c.hash, \
+            c.source_event_hash, t.event_descr, t.event_type, s.scan_instance_id, \
+            c.false_positive as 'fp', s.false_positive as 'parent_fp', \
+            s.type, s.module, st.event_type as 'source_entity_type' \
+            FROM tbl_scan_results c, tbl_scan_results s, tbl_event_types t, \
+            tbl_event_types st \
+            WHERE c.scan_instance_id = ? AND c.source_event_hash = s.hash AND \
+            s.scan_instance_id = c.scan_instance_id AND st.event = s.type AND \
+            t.event = c.type AND c.hash IN (SELECT hash FROM sources)"
 
-        while keepGoing:
-            parentSet = self.scanElementSourcesDirect(instanceId, nextIds)
-            nextIds = list()
-            keepGoing = False
+        rootRow = None
+        for i in range(0, len(hashIds), self.elementChunkSize):
+            chunk = hashIds[i:i + self.elementChunkSize]
+            with self.dbhLock:
+                try:
+                    self.dbh.execute(qry % "','".join(chunk), [instanceId, instanceId, instanceId])
+                    parentSet = self.dbh.fetchall()
+                except sqlite3.Error as e:
+                    raise IOError("SQL error encountered when getting source element IDs") from e
 
             for row in parentSet:
                 parentId = row[9]
                 childId = row[8]
                 datamap[childId] = row
+                pc.setdefault(parentId, dict())[childId] = None
+                if parentId == "ROOT":
+                    rootRow = row
 
-                if parentId in pc:
-                    if childId not in pc[parentId]:
-                        pc[parentId].append(childId)
-                else:
-                    pc[parentId] = [childId]
-                if parentId not in nextIds:
-                    nextIds.append(parentId)
+        # ROOT has a row of its own in the data map, for display
+        if "ROOT" in pc:
+            if rootRow is None:
+                rootRow = [row for row in childData if row[9] == "ROOT"][-1]
+            datamap["ROOT"] = rootRow
 
-                # Prevent us from looping at root
-                if parentId != "ROOT":
-                    keepGoing = True
-
-        datamap[parentId] = row
-        return [datamap, pc]
+        return [datamap, {parentId: list(childIds) for parentId, childIds in pc.items()}]
 
     def scanElementChildrenAll(self, instanceId: str, parentIds: list) -> list:
         """Get the full set of downstream IDs which are children of the supplied set of IDs.
 
+        The whole tree of children is fetched with one recursive query per
+        chunk of up to `elementChunkSize` IDs, rather than a query per level.
+
         Args:
             instanceId (str): scan instance ID
             parentIds (list): TBD
@@ -1678,6 +1854,7 @@ class SpiderFootDb:
 
         Raises:
             TypeError: arg type was invalid
+            IOError: database I/O failed
 
         Note: This function is not the same as the scanElementParent* functions.
               This function returns only ids.
@@ -1689,30 +1866,30 @@ class SpiderFootDb:
         if not isinstance(parentIds, list):
             raise TypeError(f"parentIds is {type(parentIds)}; expected list()")
 
-        datamap = list()
-        keepGoing = True
-        nextIds = list()
+        hashIds = list(dict.fromkeys(hashId for hashId in parentIds if hashId and hashId.isalnum()))
 
-        nextSet = self.scanElementChildrenDirect(instanceId, parentIds)
-        for row in nextSet:
-            datamap.append(row[8])
+        qry = "WITH RECURSIVE children(hash) AS ( \
+                SELECT c.hash FROM tbl_scan_results c, tbl_scan_results s \
+                WHERE c.scan_instance_id = ? AND s.scan_instance_id = c.scan_instance_id \
+                AND c.source_event_hash = s.hash AND s.hash IN ('%s') \
+                UNION \
+                SELECT c.hash FROM tbl_scan_results c, children \
+                WHERE c.scan_instance_id = ? AND c.source_event_hash = children.hash \
+            ) \
+            SELECT hash FROM children"
 
-        for row in nextSet:
-            if row[8] not in nextIds:
-                nextIds.append(row[8])
-
-        while keepGoing:
-            nextSet = self.scanElementChildrenDirect(instanceId, nextIds)
-            if nextSet is None or len(nextSet) == 0:
-                keepGoing = False
-                break
-
-            for row in nextSet:
-                datamap.append(row[8])
-                nextIds = list()
-                nextIds.append(row[8])
+        datamap = dict()
+        for i in range(0, len(hashIds), self.elementChunkSize):
+            chunk = hashIds[i:i + self.elementChunkSize]
+            with self.dbhLock:
+                try:
+                    self.dbh.execute(qry % "','".join(chunk), [instanceId, instanceId])
+                    for row in self.dbh.fetchall():
+                        datamap[row[0]] = None
+                except sqlite3.Error as e:
+                    raise IOError("SQL error encountered when getting child element IDs") from e
 
-        return datamap
+        return list(datamap)
 
     def correlationResultCreate(
         self,
@@ -2,6 +2,8 @@ import hashlib
 import random
 import time
 
+_random = random.SystemRandom()
+
 
 class SpiderFootEvent():
     """SpiderFootEvent object representing identified data and associated meta data.
@@ -19,21 +21,38 @@ class SpiderFootEvent():
         hash (str): Unique SHA256 hash of the event, or "ROOT"
         moduleDataSource (str): Module data source
         actualSource (str): Source data of parent event
-        __id (str): Unique ID of the event, generated using eventType, generated, module, and a random integer
+        frozen (bool): Event can no longer be modified
+        fingerprint (int): Bloom filter bits for the event type and data
+        ancestry (int): Bloom filter of this event and its source events
+
+    Note:
+        Once an event has been handed to SpiderFootPlugin.notifyListeners() it is
+        frozen, as the same instance is delivered to every module listening for
+        it and is the source event of anything produced from it. Attempting to
+        change a frozen event raises AttributeError.
     """
 
-    _generated = None
-    _eventType = None
-    _confidence = None
-    _visibility = None
-    _risk = None
-    _module = None
-    _data = None
-    _sourceEvent = None
-    _sourceEventHash = None
-    _moduleDataSource = None
-    _actualSource = None
-    __id = None
+    __slots__ = (
+        '_generated',
+        '_eventType',
+        '_confidence',
+        '_visibility',
+        '_risk',
+        '_module',
+        '_data',
+        '_sourceEvent',
+        '_sourceEventHash',
+        '_moduleDataSource',
+        '_actualSource',
+        '_frozen',
+        '_hash',
+        '_fingerprint',
+        '_ancestry',
+    )
+
+    # Size in bits of the ancestry bloom filter, and bits set per event
+    _ancestryBits = 512
+    _ancestryHashes = 3
 
     def __init__(self, eventType: str, data: str, module: str, sourceEvent: 'SpiderFootEvent') -> None:
         """Initialize SpiderFoot event object.
@@ -44,6 +63,11 @@ class SpiderFootEvent():
             module (str): Module from which the event originated
             sourceEvent (SpiderFootEvent): SpiderFootEvent event that triggered this event
         """
+        self._frozen = False
+        self._fingerprint = None
+        self._ancestry = None
+        self._moduleDataSource = None
+        self._actualSource = None
         self._generated = time.time()
         self.data = data
         self.eventType = eventType
@@ -52,7 +76,12 @@ class SpiderFootEvent():
         self.visibility = 100
         self.risk = 0
         self.sourceEvent = sourceEvent
-        self.__id = f"{self.eventType}{self.generated}{self.module}{random.SystemRandom().randint(0, 99999999)}"
+
+        # The hash is derived from a unique ID made up of the event type,
+        # creation time, module and a random integer. It is only ever needed
+        # in its hashed form, so compute it once here.
+        eventId = f"{self.eventType}{self.generated}{self.module}{_random.randint(0, 99999999)}"
+        self._hash = hashlib.sha256(eventId.encode('raw_unicode_escape')).hexdigest()
 
     @property
     def generated(self) -> float:
@@ -123,6 +152,73 @@ class SpiderFootEvent():
     def moduleDataSource(self) -> str:
         return self._moduleDataSource
 
+    @property
+    def frozen(self) -> bool:
+        """Event can no longer be modified.
+
+        Returns:
+            bool: event is frozen
+        """
+        return self._frozen
+
+    def freeze(self) -> None:
+        """Prevent any further changes to the event."""
+        self._frozen = True
+
+    def _checkMutable(self, attribute: str) -> None:
+        """Raise if the event is frozen.
+
+        Args:
+            attribute (str): name of the attribute being set
+
+        Raises:
+            AttributeError: event is frozen
+        """
+        if self._frozen:
+            raise AttributeError(f"Cannot set {attribute} on {self.eventType} event; events are read-only once delivered to modules")
+
+    @property
+    def fingerprint(self) -> int:
+        """Bloom filter bits identifying the event type and (case-insensitive) data.
+
+        Returns:
+            int: bits set for this event in an ancestry bloom filter
+        """
+        if self._fingerprint is None:
+            key = f"{self._eventType}\0{self._data.lower()}".encode('raw_unicode_escape')
+            h = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+            fingerprint = 0
+            for _ in range(self._ancestryHashes):
+                fingerprint |= 1 << (h % self._ancestryBits)
+                h //= self._ancestryBits
+            self._fingerprint = fingerprint
+        return self._fingerprint
+
+    @property
+    def ancestry(self) -> int:
+        """Bloom filter of the event types and (case-insensitive) data of this
+        event and every event above it in the chain of source events.
+
+        Built from the source event's filter, so only events whose filters
+        haven't been worked out yet are visited.
+
+        Returns:
+            int: ancestry bloom filter
+        """
+        if self._ancestry is None:
+            chain = list()
+            evt = self
+            while evt is not None and evt._ancestry is None:
+                chain.append(evt)
+                evt = evt._sourceEvent
+
+            ancestry = 0 if evt is None else evt._ancestry
+            for evt in reversed(chain):
+                ancestry |= evt.fingerprint
+                evt._ancestry = ancestry
+
+        return self._ancestry
+
     @property
     def hash(self) -> str:
         """Unique SHA256 hash of the event, or "ROOT".
@@ -130,11 +226,10 @@ class SpiderFootEvent():
         Returns:
             str: unique SHA256 hash of the event, or "ROOT"
         """
-        if self.eventType == "ROOT":
+        if self._eventType == "ROOT":
             return "ROOT"
 
-        digestStr = self.__id.encode('raw_unicode_escape')
-        return hashlib.sha256(digestStr).hexdigest()
+        return self._hash
 
     @eventType.setter
     def eventType(self, eventType: str) -> None:
@@ -147,6 +242,8 @@ class SpiderFootEvent():
             TypeError: confidence type was invalid
             ValueError: confidence value was invalid
         """
+        self._checkMutable("eventType")
+
         if not isinstance(eventType, str):
             raise TypeError(f"eventType is {type(eventType)}; expected str()")
 
@@ -154,6 +251,8 @@ class SpiderFootEvent():
             raise ValueError("eventType is empty")
 
         self._eventType = eventType
+        self._fingerprint = None
+        self._ancestry = None
 
     @confidence.setter
     def confidence(self, confidence: int) -> None:
@@ -166,6 +265,8 @@ class SpiderFootEvent():
             TypeError: confidence type was invalid
             ValueError: confidence value was invalid
         """
+        self._checkMutable("confidence")
+
         if not isinstance(confidence, int):
             raise TypeError(f"confidence is {type(confidence)}; expected int()")
 
@@ -185,6 +286,8 @@ class SpiderFootEvent():
             TypeError: visibility type was invalid
             ValueError: visibility value was invalid
         """
+        self._checkMutable("visibility")
+
         if not isinstance(visibility, int):
             raise TypeError(f"visibility is {type(visibility)}; expected int()")
 
@@ -204,6 +307,8 @@ class SpiderFootEvent():
             TypeError: risk type was invalid
             ValueError: risk value was invalid
         """
+        self._checkMutable("risk")
+
         if not isinstance(risk, int):
             raise TypeError(f"risk is {type(risk)}; expected int()")
 
@@ -223,6 +328,8 @@ class SpiderFootEvent():
             TypeError: module type was invalid
             ValueError: module value was invalid
         """
+        self._checkMutable("module")
+
         if not isinstance(module, str):
             raise TypeError(f"module is {type(module )}; expected str()")
 
@@ -242,6 +349,8 @@ class SpiderFootEvent():
             TypeError: data type was invalid
             ValueError: data value was invalid
         """
+        self._checkMutable("data")
+
         if not isinstance(data, str):
             raise TypeError(f"data is {type(data)}; expected str()")
 
@@ -249,6 +358,8 @@ class SpiderFootEvent():
             raise ValueError(f"data is empty: '{str(data)}'")
 
         self._data = data
+        self._fingerprint = None
+        self._ancestry = None
 
     @sourceEvent.setter
     def sourceEvent(self, sourceEvent: 'SpiderFootEvent') -> None:
@@ -260,6 +371,8 @@ class SpiderFootEvent():
         Raises:
             TypeError: sourceEvent type was invalid
         """
+        self._checkMutable("sourceEvent")
+
         # "ROOT" is a special "hash" reserved for elements with no parent,
         # such as targets provided via the web UI or CLI.
         if self.eventType == "ROOT":
@@ -271,14 +384,19 @@ class SpiderFootEvent():
             raise TypeError(f"sourceEvent is {type(sourceEvent)}; expected SpiderFootEvent()")
 
         self._sourceEvent = sourceEvent
-        self._sourceEventHash = self.sourceEvent.hash
+        self._sourceEventHash = sourceEvent.hash
+        self._ancestry = None
 
     @actualSource.setter
     def actualSource(self, actualSource: str) -> None:
+        self._checkMutable("actualSource")
+
         self._actualSource = actualSource
 
     @moduleDataSource.setter
     def moduleDataSource(self, moduleDataSource: str) -> None:
+        self._checkMutable("moduleDataSource")
+
         self._moduleDataSource = moduleDataSource
 
     def asDict(self) -> dict:
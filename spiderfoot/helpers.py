@@ -1,4 +1,5 @@
 #  -*- coding: utf-8 -*-
+import hashlib
 import html
 import json
 import os
@@ -10,11 +11,12 @@ import sys
 import typing
 import urllib.parse
 import uuid
+from contextlib import suppress
 from pathlib import Path
 from importlib import resources
 
 import networkx as nx
-from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 from networkx.readwrite.gexf import GEXFWriter
 import phonenumbers
 
@@ -65,6 +67,46 @@ else:
 EmptyTree = typing.Dict[None, object]
 
 
+class _LinkCollector:
+    """lxml parser target collecting the link attribute of each link tag.
+
+    The parser calls start() for each tag as it goes, so a page is parsed
+    once for every tag, without building a tree.
+    """
+
+    # Attribute holding the link, for each tag which links to something
+    tags = {
+        'a': 'href',
+        'img': 'src',
+        'script': 'src',
+        'link': 'href',
+        'area': 'href',
+        'base': 'href',
+        'form': 'action'
+    }
+
+    def __init__(self) -> None:
+        self.links = {tag: list() for tag in self.tags}
+
+    def start(self, tag: str, attrib: dict) -> None:
+        attr = self.tags.get(tag)
+        if attr is None:
+            return
+        link = attrib.get(attr)
+        if link is not None:
+            self.links[tag].append(link)
+
+    def end(self, tag: str) -> None:
+        pass
+
+    def data(self, data: str) -> None:
+        pass
+
+    def close(self) -> list:
+        # Links grouped by tag, in the order of the tags
+        return [link for links in self.links.values() for link in links]
+
+
 class SpiderFootHelpers():
     """SpiderFoot helper functions.
 
@@ -75,6 +117,10 @@ class SpiderFootHelpers():
        Eventually split this class into separate files.
     """
 
+    # Version of the module metadata manifest format, to be increased
+    # whenever the metadata kept for each module changes
+    moduleManifestVersion = 1
+
     @staticmethod
     def dataPath() -> str:
         """Returns the file system location of SpiderFoot data and configuration files.
@@ -118,12 +164,19 @@ class SpiderFootHelpers():
         return path
 
     @staticmethod
-    def loadModulesAsDict(path: str, ignore_files: typing.Optional[typing.List[str]] = None) -> dict:
+    def loadModulesAsDict(path: str, ignore_files: typing.Optional[typing.List[str]] = None, manifest: str = None) -> dict:
         """Load modules from modules directory.
 
+        The metadata of each module is kept in a manifest, so only modules
+        which are new or have changed since the manifest was written are
+        imported. A module has changed if the size or modification time of
+        its file has changed and so has the SHA256 hash of its contents.
+
         Args:
             path (str): file system path for modules directory
             ignore_files (list): List of module file names to ignore
+            manifest (str): file system path of the module metadata manifest,
+                            or None for a manifest in the cache directory
 
         Returns:
             dict: SpiderFoot modules
@@ -142,26 +195,45 @@ class SpiderFootHelpers():
         if not os.path.isdir(path):
             raise ValueError(f"Modules directory does not exist: {path}")
 
+        if manifest is None:
+            pathHash = hashlib.sha256(os.path.realpath(path).encode('utf-8')).hexdigest()
+            manifest = os.path.join(SpiderFootHelpers.cachePath(), f"modules-{pathHash[:16]}.json")
+
+        cachedEntries = SpiderFootHelpers.readModuleManifest(manifest)
+        entries = dict()
+
         sfModules = dict()
         valid_categories = ["Content Analysis", "Crawling and Scanning", "DNS",
                             "Leaks, Dumps and Breaches", "Passive DNS",
                             "Public Registries", "Real World", "Reputation Systems",
                             "Search Engines", "Secondary Networks", "Social Media"]
 
-        for filename in os.listdir(path):
+        for filename in sorted(os.listdir(path)):
             if not filename.startswith("sfp_"):
                 continue
             if not filename.endswith(".py"):
                 continue
+
+            modName = filename.split('.')[0]
+            entry = cachedEntries.get(modName)
+
             if filename in ignore_files:
+                if entry is not None:
+                    entries[modName] = entry
                 continue
 
-            modName = filename.split('.')[0]
-            sfModules[modName] = dict()
-            mod = __import__('modules.' + modName, globals(), locals(), [modName])
-            sfModules[modName]['object'] = getattr(mod, modName)()
-            mod_dict = sfModules[modName]['object'].asdict()
-            sfModules[modName].update(mod_dict)
+            stat = os.stat(os.path.join(path, filename))
+            if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                with open(os.path.join(path, filename), 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+                if entry is None or entry['sha256'] != digest:
+                    mod = __import__('modules.' + modName, globals(), locals(), [modName])
+                    # Copied through JSON so the dict is the same as when read from the manifest
+                    entry = {'sha256': digest, 'info': json.loads(json.dumps(getattr(mod, modName)().asdict()))}
+                entry = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size)
+
+            entries[modName] = entry
+            sfModules[modName] = entry['info']
 
             if len(sfModules[modName]['cats']) > 1:
                 raise SyntaxError(f"Module {modName} has multiple categories defined but only one is supported.")
@@ -169,7 +241,53 @@ class SpiderFootHelpers():
             if sfModules[modName]['cats'] and sfModules[modName]['cats'][0] not in valid_categories:
                 raise SyntaxError(f"Module {modName} has invalid category '{sfModules[modName]['cats']}'.")
 
-        return sfModules
+        if entries != cachedEntries:
+            SpiderFootHelpers.writeModuleManifest(manifest, entries)
+
+        # Entries were handed out above, so don't share them with the manifest
+        return json.loads(json.dumps(sfModules))
+
+    @staticmethod
+    def readModuleManifest(manifest: str) -> dict:
+        """Read the module metadata manifest.
+
+        Args:
+            manifest (str): file system path of the manifest
+
+        Returns:
+            dict: manifest entry of each module, keyed by module name; empty if
+                  the manifest does not exist, is unreadable or is of another version
+        """
+        try:
+            with open(manifest, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+
+        if not isinstance(data, dict) or data.get('version') != SpiderFootHelpers.moduleManifestVersion:
+            return dict()
+
+        return data.get('modules', dict())
+
+    @staticmethod
+    def writeModuleManifest(manifest: str, entries: dict) -> None:
+        """Write the module metadata manifest, replacing any existing manifest
+        at once so it is never read half-written.
+
+        Args:
+            manifest (str): file system path of the manifest
+            entries (dict): manifest entry of each module, keyed by module name
+        """
+        data = {'version': SpiderFootHelpers.moduleManifestVersion, 'modules': entries}
+        tmp = f"{manifest}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, manifest)
+        except OSError:
+            # Modules will be imported again next time, which is only slower
+            with suppress(OSError):
+                os.remove(tmp)
 
     @staticmethod
     def loadCorrelationRulesRaw(path: str, ignore_files: typing.Optional[typing.List[str]] = None) -> typing.Dict[str, str]:
@@ -806,23 +924,11 @@ class SpiderFootHelpers():
         if isinstance(domains, str):
             domains = [domains]
 
-        tags = {
-            'a': 'href',
-            'img': 'src',
-            'script': 'src',
-            'link': 'href',
-            'area': 'href',
-            'base': 'href',
-            'form': 'action'
-        }
-
-        links: typing.List[typing.Union[typing.List[str], str]] = []
-
+        # Parse the content once, collecting the links of every tag type
         try:
-            for t in list(tags.keys()):
-                for lnk in BeautifulSoup(data, features="lxml", parse_only=SoupStrainer(t)).find_all(t):
-                    if lnk.has_attr(tags[t]):
-                        links.append(lnk[tags[t]])
+            parser = etree.HTMLParser(target=_LinkCollector(), strip_cdata=False, recover=True)
+            parser.feed(data)
+            links: typing.List[str] = parser.close()
         except BaseException:
             return returnLinks
 
@@ -849,7 +955,7 @@ class SpiderFootHelpers():
                 continue
 
             # Filter in-page links
-            if re.match('.*#.[^/]+', link):
+            if '#' in link and re.match('.*#.[^/]+', link):
                 continue
 
             # Ignore mail links
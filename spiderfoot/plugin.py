@@ -5,7 +5,6 @@ import os
 import queue
 import sys
 import threading
-from time import sleep
 import traceback
 
 from .threadpool import SpiderFootThreadPool
@@ -90,6 +89,7 @@ class SpiderFootPlugin():
         __datasource__: (Unused) tracking of data sources
         __outputFilter: If set, events not matching this list are dropped
         _priority (int): Priority, smaller numbers should run first
+        _idleTimeout (float): Seconds to wait for an event before calling idle()
         errorState (bool): error state of the module
         socksProxy (str): SOCKS proxy
     """
@@ -115,6 +115,8 @@ class SpiderFootPlugin():
     __outputFilter__ = None
     # Priority, smaller numbers should run first
     _priority = 1
+    # Seconds to wait for an event before calling idle(), or None to wait forever
+    _idleTimeout = None
     # Plugin meta information
     meta = None
     # Error state of the module
@@ -139,6 +141,8 @@ class SpiderFootPlugin():
         self._log = None
         # Shared thread pool for all modules
         self.sharedThreadPool = None
+        # Worker processes to handle events in, for CPU-bound modules
+        self.processPool = None
 
     @property
     def log(self):
@@ -309,6 +313,51 @@ class SpiderFootPlugin():
         """
         return dict()
 
+    def _storeOnly(self, sfEvent) -> bool:
+        """Check whether an event should only be stored, not passed on to
+        other modules.
+
+        Look back to ensure the original notification for an element
+        is what's linked to children. For instance, sfp_dns may find
+        xyz.abc.com, and then sfp_ripe obtains some raw data for the
+        same, and then sfp_dns finds xyz.abc.com in there, we should
+        suppress the notification of that to other modules, as the
+        original xyz.abc.com notification from sfp_dns will trigger
+        those modules anyway. This also avoids messy iterations that
+        traverse many many levels.
+
+        storeOnly is used in this case so that the source to dest
+        relationship is made, but no further events are triggered
+        from dest, as we are already operating on dest's original
+        notification from one of the upstream events.
+
+        Args:
+            sfEvent (SpiderFootEvent): event
+
+        Returns:
+            bool: an event with the same type and data (ignoring case)
+                appears above the event's source event
+        """
+        sourceEvent = sfEvent.sourceEvent
+        if sourceEvent is None or sourceEvent.sourceEvent is None:
+            return False
+
+        # The ancestry bloom filter rules out nearly every event without
+        # walking the chain; possible matches are confirmed below, stopping
+        # as soon as nothing further up the chain can match.
+        fingerprint = sfEvent.fingerprint
+        eventData = None
+        prevEvent = sourceEvent.sourceEvent
+        while prevEvent is not None and prevEvent.ancestry & fingerprint == fingerprint:
+            if prevEvent.eventType == sfEvent.eventType:
+                if eventData is None:
+                    eventData = sfEvent.data.lower()
+                if prevEvent.data.lower() == eventData:
+                    return True
+            prevEvent = prevEvent.sourceEvent
+
+        return False
+
     def notifyListeners(self, sfEvent) -> None:
         """Call the handleEvent() method of every other plug-in listening for
         events from this plug-in. Remember that those plug-ins will be called
@@ -334,34 +383,15 @@ class SpiderFootPlugin():
         if self.__outputFilter__ and eventName not in ['ROOT', self.getTarget().targetType, self.__outputFilter__]:
             return
 
-        storeOnly = False  # Under some conditions, only store and don't notify
-
         if not eventData:
             return
 
         if self.checkForStop():
             return
 
-        # Look back to ensure the original notification for an element
-        # is what's linked to children. For instance, sfp_dns may find
-        # xyz.abc.com, and then sfp_ripe obtains some raw data for the
-        # same, and then sfp_dns finds xyz.abc.com in there, we should
-        # suppress the notification of that to other modules, as the
-        # original xyz.abc.com notification from sfp_dns will trigger
-        # those modules anyway. This also avoids messy iterations that
-        # traverse many many levels.
-
-        # storeOnly is used in this case so that the source to dest
-        # relationship is made, but no further events are triggered
-        # from dest, as we are already operating on dest's original
-        # notification from one of the upstream events.
-
-        prevEvent = sfEvent.sourceEvent
-        while prevEvent is not None:
-            if prevEvent.sourceEvent is not None and prevEvent.sourceEvent.eventType == sfEvent.eventType and prevEvent.sourceEvent.data.lower() == eventData.lower():
-                storeOnly = True
-                break
-            prevEvent = prevEvent.sourceEvent
+        # The same event instance is delivered to every listening module,
+        # so it must not change from here on.
+        sfEvent.freeze()
 
         # output to queue if applicable
         if self.outgoingEventQueue is not None:
@@ -370,6 +400,9 @@ class SpiderFootPlugin():
         else:
             self._listenerModules.sort(key=lambda m: m._priority)
 
+            # Under some conditions, only store and don't notify
+            storeOnly = self._storeOnly(sfEvent)
+
             for listener in self._listenerModules:
                 if eventName not in listener.watchedEvents() and '*' not in listener.watchedEvents():
                     continue
@@ -495,9 +528,17 @@ class SpiderFootPlugin():
 
         return
 
+    def idle(self):
+        """Called from the module's thread when no event has arrived for
+        _idleTimeout seconds, for modules which hold on to work between events
+        Overridden by the implementer
+        """
+
+        return
+
     def threadWorker(self) -> None:
         try:
-            # create new database handle since we're in our own thread
+            # database handle for this thread; the connection itself is shared
             from spiderfoot import SpiderFootDb
             self.setDbh(SpiderFootDb(self.opts))
             self.sf._dbh = self.__sfdb__
@@ -507,17 +548,27 @@ class SpiderFootPlugin():
                 return
 
             while not self.checkForStop():
+                incomingEventQueue = self.incomingEventQueue
+                if incomingEventQueue is None:
+                    break
+                # block until there is something to do; None is put on the
+                # queue by the scanner to wake us up when the scan is stopping.
                 try:
-                    sfEvent = self.incomingEventQueue.get_nowait()
+                    sfEvent = incomingEventQueue.get(timeout=self._idleTimeout)
                 except queue.Empty:
-                    sleep(.3)
+                    self.idle()
+                    continue
+                if sfEvent is None:
                     continue
                 if sfEvent == 'FINISHED':
                     self.sf.debug(f"{self.__name__}.threadWorker() got \"FINISHED\" from incomingEventQueue.")
-                    self.poolExecute(self.finish)
+                    self.poolExecute(self._processTask, self.finish)
                 else:
                     self.sf.debug(f"{self.__name__}.threadWorker() got event, {sfEvent.eventType}, from incomingEventQueue.")
-                    self.poolExecute(self.handleEvent, sfEvent)
+                    if self.processPool is None:
+                        self.poolExecute(self._processTask, self.handleEvent, sfEvent)
+                    else:
+                        self.poolExecute(self._processTask, self._handleEventInProcess, sfEvent)
         except KeyboardInterrupt:
             self.sf.debug(f"Interrupted module {self.__name__}.")
             self._stopScanning = True
@@ -538,6 +589,23 @@ class SpiderFootPlugin():
                 # if there are leftover objects in the queue, the scan will hang.
                 self.incomingEventQueue = None
 
+    def _processTask(self, callback, *args) -> None:
+        """Run a callback for an event received from the scanner, then tell
+        the scanner the task is done.
+
+        The module name is put on the outgoing queue after any events
+        produced by the callback, so by the time the scanner sees it,
+        everything this task produced has already been dispatched.
+
+        Args:
+            callback: function to call
+            args: args (passed through to callback)
+        """
+        try:
+            callback(*args)
+        finally:
+            self.outgoingEventQueue.put(self.__name__)
+
     def poolExecute(self, callback, *args, **kwargs) -> None:
         """Execute a callback with the given args.
         If we're in a storage module, execute normally.
@@ -559,4 +627,26 @@ class SpiderFootPlugin():
     def setSharedThreadPool(self, sharedThreadPool) -> None:
         self.sharedThreadPool = sharedThreadPool
 
+    def setProcessPool(self, processPool) -> None:
+        """Handle events in worker processes rather than in the scan process,
+        for modules which keep no state between events.
+
+        As many events as there are processes may be handled at once.
+
+        Args:
+            processPool (SpiderFootProcessPool): worker processes
+        """
+        self.processPool = processPool
+        self.maxThreads = max(self.maxThreads, processPool.processes)
+
+    def _handleEventInProcess(self, sfEvent) -> None:
+        """Handle an event in a worker process, then notify listeners of
+        the events produced.
+
+        Args:
+            sfEvent (SpiderFootEvent): event
+        """
+        for evt in self.processPool.handleEvent(self.__name__, sfEvent):
+            self.notifyListeners(evt)
+
 # end of SpiderFootPlugin class
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import math
+import queue
+import threading
+
+
+class SpiderFootPortScanner:
+    """TCP connect scanner shared by every module in a scan.
+
+    Connections are made on an event loop running in a thread of its own,
+    so any number of modules can scan at once while the number of sockets
+    open across all of them stays within maxSockets. The banner of each
+    open port is read as soon as its connection is made.
+
+    scan() yields the open ports of each IP address as soon as every port
+    of the IP address has been tried:
+
+        for ip, openPorts in sf.portScanner.scan(ips, [22, 80], 5):
+            for port, banner in openPorts.items():
+                ...
+
+    Attributes:
+        maxSockets (int): maximum number of sockets open at once
+        bannerSize (int): maximum bytes of banner read from each open port
+    """
+
+    def __init__(self, maxSockets: int = 256, bannerSize: int = 4096) -> None:
+        """Initialize the SpiderFootPortScanner class.
+
+        Args:
+            maxSockets (int): maximum number of sockets open at once
+            bannerSize (int): maximum bytes of banner read from each open port
+        """
+        self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.maxSockets = maxSockets
+        self.bannerSize = bannerSize
+        self.loop = None
+        self.semaphore = None
+        self._lock = threading.Lock()
+
+    def getLoop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop making connections, starting it if it is
+        not running yet.
+
+        Returns:
+            asyncio.AbstractEventLoop: event loop
+        """
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, name="SpiderFootPortScanner", daemon=True).start()
+            return self.loop
+
+    def close(self) -> None:
+        """Stop the event loop making connections."""
+        with self._lock:
+            if self.loop is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop = None
+            self.semaphore = None
+
+    def scan(self, ips: list, ports: list, timeout: float, portsAtOnce: int = None):
+        """Try to connect to ports of IP addresses.
+
+        Closing the generator cancels the connections not made yet.
+
+        Args:
+            ips (list): IP addresses
+            ports (list): TCP ports to try on each IP address, in order
+            timeout (float): seconds to wait for each connection, and for each banner
+            portsAtOnce (int): maximum number of ports tried at once on one IP address
+
+        Yields:
+            tuple: IP address, and the banner (bytes, empty if none was sent) of
+                   each open port, keyed by port
+        """
+        if not ips or not ports:
+            return
+
+        results = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self.scanAll(ips, ports, timeout, portsAtOnce or len(ports), results),
+            self.getLoop()
+        )
+
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                yield result
+            future.result()
+        finally:
+            future.cancel()
+
+    async def scanAll(self, ips: list, ports: list, timeout: float, portsAtOnce: int, results: queue.Queue) -> None:
+        """Try to connect to ports of IP addresses, putting the open ports of
+        each IP address on a queue as soon as every port has been tried.
+
+        Args:
+            ips (list): IP addresses
+            ports (list): TCP ports to try on each IP address
+            timeout (float): seconds to wait for each connection, and for each banner
+            portsAtOnce (int): maximum number of ports tried at once on one IP address
+            results (queue.Queue): queue of results, ending with None
+        """
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.maxSockets)
+
+        portsAtOnce = min(portsAtOnce, len(ports), self.maxSockets)
+
+        # Enough IP addresses at once to use every socket, but no more, so
+        # the coroutines waiting for a socket stay few.
+        ipsAtOnce = min(len(ips), math.ceil(self.maxSockets / portsAtOnce))
+
+        ipIter = iter(ips)
+
+        async def scanIps() -> None:
+            for ip in ipIter:
+                results.put((ip, await self.scanIp(ip, ports, timeout, portsAtOnce)))
+
+        try:
+            await asyncio.gather(*[scanIps() for _ in range(ipsAtOnce)])
+        finally:
+            results.put(None)
+
+    async def scanIp(self, ip: str, ports: list, timeout: float, portsAtOnce: int) -> dict:
+        """Try to connect to ports of an IP address.
+
+        Args:
+            ip (str): IP address
+            ports (list): TCP ports
+            timeout (float): seconds to wait for each connection, and for each banner
+            portsAtOnce (int): maximum number of ports tried at once
+
+        Returns:
+            dict: banner of each open port, keyed by port
+        """
+        openPorts = dict()
+        portIter = iter(ports)
+
+        async def tryPorts() -> None:
+            for port in portIter:
+                banner = await self.tryPort(ip, port, timeout)
+                if banner is not None:
+                    openPorts[port] = banner
+
+        await asyncio.gather(*[tryPorts() for _ in range(portsAtOnce)])
+
+        return {port: openPorts[port] for port in ports if port in openPorts}
+
+    async def tryPort(self, ip: str, port: int, timeout: float) -> bytes:
+        """Try to connect to a port, and read its banner.
+
+        Args:
+            ip (str): IP address
+            port (int): TCP port
+            timeout (float): seconds to wait for the connection, and for the banner
+
+        Returns:
+            bytes: banner, empty if none was sent, or None if the port is not open
+        """
+        async with self.semaphore:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+            except (OSError, asyncio.TimeoutError):
+                return None
+
+            try:
+                return await asyncio.wait_for(reader.read(self.bannerSize), timeout)
+            except (OSError, asyncio.TimeoutError):
+                return b''
+            finally:
+                writer.close()
@@ -0,0 +1,269 @@
+import logging
+import multiprocessing as mp
+import multiprocessing.queues
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler
+
+from .event import SpiderFootEvent
+
+# Module instances of a worker process, keyed by module name
+_workerModules = dict()
+
+# Options of each module and the scan target, set in each worker process
+_workerConfig = dict()
+
+
+class _EventCollector(list):
+    """Stands in for the outgoing event queue of a module in a worker process."""
+
+    def put(self, item) -> None:
+        self.append(item)
+
+
+def _initWorker(moduleOpts: dict, target, loggingQueue) -> None:
+    """Set up a worker process.
+
+    Args:
+        moduleOpts (dict): options of each module, keyed by module name
+        target (SpiderFootTarget): scan target
+        loggingQueue (Queue): queue of the scan's log handler, or None
+    """
+    if loggingQueue is not None:
+        from .logger import logWorkerSetup
+        logWorkerSetup(loggingQueue)
+
+    _workerConfig['opts'] = moduleOpts
+    _workerConfig['target'] = target
+
+
+def _workerModule(modName: str):
+    """Module instance of this worker process, set up on first use.
+
+    Args:
+        modName (str): module name
+
+    Returns:
+        SpiderFootPlugin: module
+    """
+    mod = _workerModules.get(modName)
+    if mod is not None:
+        return mod
+
+    from sflib import SpiderFoot
+
+    opts = _workerConfig['opts'][modName]
+    module = __import__('modules.' + modName, globals(), locals(), [modName])
+    mod = getattr(module, modName)()
+    mod.__name__ = modName
+    mod.setup(SpiderFoot(opts), opts)
+    mod.setTarget(_workerConfig['target'])
+    _workerModules[modName] = mod
+    return mod
+
+
+def _workerHandleEvent(modName: str, packedEvent: tuple) -> list:
+    """Run handleEvent() of a module in a worker process.
+
+    Args:
+        modName (str): module name
+        packedEvent (tuple): event, as packed by packEvent()
+
+    Returns:
+        list: events produced, as packed by packResults()
+    """
+    mod = _workerModule(modName)
+    event = unpackEvent(packedEvent)
+
+    # The module hands its events to notifyListeners(), which puts them on
+    # the outgoing queue when both queues are set.
+    collector = _EventCollector()
+    mod.outgoingEventQueue = collector
+    mod.incomingEventQueue = collector
+    mod.handleEvent(event)
+
+    return packResults(collector, event)
+
+
+def packEvent(event: SpiderFootEvent) -> tuple:
+    """Pack an event, and the type, data and module of its source event,
+    into a tuple to send to a worker process.
+
+    The rest of the chain of source events stays behind, so the size of
+    the tuple doesn't grow as the scan goes deeper.
+
+    Args:
+        event (SpiderFootEvent): event
+
+    Returns:
+        tuple: packed event
+    """
+    source = event.sourceEvent
+    if source is None:
+        sourceFields = (None, None, None)
+    else:
+        sourceFields = (source.eventType, source.data, source.module)
+
+    return (
+        event.eventType, event.data, event.module,
+        event.confidence, event.visibility, event.risk,
+        event.moduleDataSource, event.actualSource,
+    ) + sourceFields
+
+
+def unpackEvent(packedEvent: tuple) -> SpiderFootEvent:
+    """Build an event from a tuple made by packEvent().
+
+    Args:
+        packedEvent (tuple): packed event
+
+    Returns:
+        SpiderFootEvent: event, with a source event of the type, data and module sent
+    """
+    (eventType, data, module, confidence, visibility, risk,
+     moduleDataSource, actualSource, sourceType, sourceData, sourceModule) = packedEvent
+
+    root = SpiderFootEvent("ROOT", sourceData or data, "", None)
+    if sourceType is None or sourceType == "ROOT":
+        source = root
+    else:
+        source = SpiderFootEvent(sourceType, sourceData, sourceModule, root)
+
+    if eventType == "ROOT":
+        return root
+
+    event = SpiderFootEvent(eventType, data, module, source)
+    event.confidence = confidence
+    event.visibility = visibility
+    event.risk = risk
+    event.moduleDataSource = moduleDataSource
+    event.actualSource = actualSource
+    return event
+
+
+def packResults(events: list, sourceEvent: SpiderFootEvent) -> list:
+    """Pack the events produced from an event.
+
+    Each packed event refers to its source event by position: -1 for the
+    event which was handled, otherwise the position of an earlier event
+    in the list.
+
+    Args:
+        events (list): events produced, in the order they were produced
+        sourceEvent (SpiderFootEvent): event which was handled
+
+    Returns:
+        list: packed events
+    """
+    positions = {id(sourceEvent): -1}
+    packed = list()
+    for i, event in enumerate(events):
+        positions[id(event)] = i
+        packed.append((
+            event.eventType, event.data, event.module,
+            event.confidence, event.visibility, event.risk,
+            event.moduleDataSource, event.actualSource,
+            positions.get(id(event.sourceEvent), -1),
+        ))
+    return packed
+
+
+def unpackResults(packedEvents: list, sourceEvent: SpiderFootEvent) -> list:
+    """Build the events made by packResults(), linked to the event which
+    was handled in the scan process.
+
+    Args:
+        packedEvents (list): packed events
+        sourceEvent (SpiderFootEvent): event which was handled
+
+    Returns:
+        list: events
+    """
+    events = list()
+    for (eventType, data, module, confidence, visibility, risk,
+         moduleDataSource, actualSource, sourcePosition) in packedEvents:
+        source = sourceEvent if sourcePosition < 0 else events[sourcePosition]
+        event = SpiderFootEvent(eventType, data, module, source)
+        event.confidence = confidence
+        event.visibility = visibility
+        event.risk = risk
+        event.moduleDataSource = moduleDataSource
+        event.actualSource = actualSource
+        events.append(event)
+    return events
+
+
+class SpiderFootProcessPool:
+    """Runs handleEvent() of CPU-bound modules in worker processes.
+
+    Module threads otherwise all share one core under the GIL, so modules
+    spending their time matching regular expressions against web content
+    hold up modules waiting on the network. Each worker process sets up
+    its own instance of each module the first time it is sent an event
+    for it. Events are sent as tuples of their fields and the fields of
+    their source event, and the events produced come back the same way, to
+    be linked to the original event and notified from the scan process.
+
+    Only modules which keep no state between events can run this way, as
+    the events of a module are spread over every worker process. Such
+    modules have the "cpubound" flag in their meta.
+
+    Attributes:
+        processes (int): number of worker processes
+    """
+
+    def __init__(self, processes: int, moduleOpts: dict, target) -> None:
+        """Initialize the SpiderFootProcessPool class.
+
+        Args:
+            processes (int): number of worker processes
+            moduleOpts (dict): options of each module to run, keyed by module name
+            target (SpiderFootTarget): scan target
+        """
+        self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.processes = int(processes)
+
+        # The large lists of modules and correlation rules in the scan
+        # options aren't used by modules, so don't copy them to every process.
+        opts = dict()
+        for modName, modOpts in moduleOpts.items():
+            opts[modName] = {k: v for k, v in modOpts.items() if k not in ('__modules__', '__correlationrules__')}
+
+        # Worker processes are spawned rather than forked, as forking the
+        # scan process would copy the locks held by its other threads.
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=mp.get_context("spawn"),
+            initializer=_initWorker,
+            initargs=(opts, target, self.loggingQueue())
+        )
+
+    @staticmethod
+    def loggingQueue():
+        """Queue the scan process sends its log records to, if worker
+        processes can send theirs there too.
+
+        Returns:
+            Queue: multiprocessing queue, or None
+        """
+        for handler in logging.getLogger("spiderfoot").handlers:
+            if isinstance(handler, QueueHandler) and isinstance(handler.queue, multiprocessing.queues.Queue):
+                return handler.queue
+        return None
+
+    def handleEvent(self, modName: str, event: SpiderFootEvent) -> list:
+        """Run handleEvent() of a module on an event in a worker process.
+
+        Args:
+            modName (str): module name
+            event (SpiderFootEvent): event
+
+        Returns:
+            list: events produced by the module, with the event as their source
+        """
+        future = self.executor.submit(_workerHandleEvent, modName, packEvent(event))
+        return unpackResults(future.result(), event)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, dropping events not yet handled."""
+        self.log.debug(f"Shutting down process pool with {self.processes} processes")
+        self.executor.shutdown(wait=True, cancel_futures=True)
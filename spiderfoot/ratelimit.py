@@ -0,0 +1,232 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class SpiderFootRateLimiter:
+    """Rate limits on requests to hosts, shared by every module in a scan.
+
+    Each rate limited host has a token bucket holding one token, refilled
+    every interval seconds. Taking a token reserves the next free slot for
+    the host, so concurrent callers are spaced out in the order they
+    arrived, and a caller only waits as long as its slot is away.
+
+    Modules declare the hosts they throttle in meta['rateLimits'], mapping
+    each host to the seconds between requests, or to the name of a module
+    option holding the seconds:
+
+        meta = {
+            ...
+            'rateLimits': {
+                'api.shodan.io': 1,
+                'leakix.net': 'delay',
+            },
+        }
+
+    SpiderFoot.fetchUrl() takes a token before each request to a host with
+    a limit, and backs off any host answering HTTP 429 Too Many Requests.
+
+    Attributes:
+        buckets (dict): RateLimitBucket of each rate limited host
+    """
+
+    # Seconds to back off a host answering 429 without a Retry-After header
+    defaultRetryAfter = 1
+
+    def __init__(self) -> None:
+        """Initialize the SpiderFootRateLimiter class."""
+        self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.buckets = dict()
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> 'RateLimitBucket':
+        """Return the bucket of a host, creating an unlimited one if the
+        host has none.
+
+        Args:
+            host (str): host name
+
+        Returns:
+            RateLimitBucket: bucket
+        """
+        host = host.lower()
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = RateLimitBucket(0)
+            return bucket
+
+    def setLimit(self, host: str, interval: float) -> None:
+        """Allow at most one request to a host every interval seconds.
+
+        If the host already has a limit, the stricter of the two is kept.
+
+        Args:
+            host (str): host name
+            interval (float): seconds between requests
+
+        Raises:
+            TypeError: arg type was invalid
+            ValueError: arg value was invalid
+        """
+        if not isinstance(host, str):
+            raise TypeError(f"host is {type(host)}; expected str()")
+
+        if not host:
+            raise ValueError("host is empty")
+
+        interval = float(interval)
+        if interval < 0:
+            raise ValueError(f"interval {interval} is negative")
+
+        bucket = self.bucket(host)
+        with bucket.lock:
+            bucket.interval = max(bucket.interval, interval)
+
+    def setLimitsFromModule(self, module) -> None:
+        """Apply the rate limits a module declares in meta['rateLimits'].
+
+        Args:
+            module (SpiderFootPlugin): module, after its options are set up
+        """
+        for host, interval in module.meta.get('rateLimits', {}).items():
+            if isinstance(interval, str):
+                interval = module.opts[interval]
+            self.setLimit(host, interval)
+
+    def acquire(self, host: str) -> float:
+        """Wait until a request may be made to a host.
+
+        Returns straight away for hosts without a limit or a back off.
+
+        Args:
+            host (str): host name
+
+        Returns:
+            float: seconds waited
+        """
+        if not host:
+            return 0
+
+        bucket = self.buckets.get(host.lower())
+        if bucket is None:
+            return 0
+
+        wait = bucket.take()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def backoff(self, host: str, seconds: float) -> None:
+        """Hold off requests to a host, such as on HTTP 429.
+
+        Args:
+            host (str): host name
+            seconds (float): seconds from now to hold off requests for
+        """
+        self.log.debug(f"Backing off requests to {host} for {seconds}s")
+        self.bucket(host).holdOff(seconds)
+
+    def checkResponse(self, host: str, code: int, retryAfter: str = None) -> None:
+        """Back off a host if it answered HTTP 429 Too Many Requests.
+
+        The host is backed off for as long as its Retry-After header asks,
+        given in seconds or as an HTTP date, or defaultRetryAfter seconds.
+
+        Args:
+            host (str): host name
+            code (int): HTTP status code
+            retryAfter (str): Retry-After header value
+        """
+        if int(code) != 429:
+            return
+
+        seconds = self.defaultRetryAfter
+        if retryAfter:
+            try:
+                seconds = float(retryAfter)
+            except ValueError:
+                try:
+                    seconds = parsedate_to_datetime(retryAfter).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    self.log.debug(f"Could not parse Retry-After header from {host}: {retryAfter}")
+
+        self.backoff(host, max(seconds, 0))
+
+    def stats(self) -> dict:
+        """Request statistics of each host with a limit or a back off.
+
+        Returns:
+            dict: per host, the requests made, the seconds spent waiting
+                  for tokens and the effective requests per second
+        """
+        with self._lock:
+            buckets = dict(self.buckets)
+
+        ret = dict()
+        for host, bucket in buckets.items():
+            with bucket.lock:
+                if not bucket.requests:
+                    continue
+                elapsed = bucket.last - bucket.first
+                ret[host] = {
+                    'requests': bucket.requests,
+                    'waited': bucket.waited,
+                    'rate': (bucket.requests - 1) / elapsed if elapsed > 0 else 0.0,
+                }
+        return ret
+
+
+class RateLimitBucket:
+    """Single token bucket of one host.
+
+    Attributes:
+        interval (float): seconds for the bucket to refill
+        lock (threading.Lock): lock on the bucket state
+        next (float): monotonic time the next token is available
+        requests (int): number of tokens taken
+        waited (float): total seconds callers waited for tokens
+        first (float): monotonic time of the first token taken
+        last (float): monotonic time of the last token taken
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the RateLimitBucket class.
+
+        Args:
+            interval (float): seconds for the bucket to refill
+        """
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next = 0.0
+        self.requests = 0
+        self.waited = 0.0
+        self.first = None
+        self.last = None
+
+    def take(self) -> float:
+        """Reserve the next token.
+
+        Returns:
+            float: seconds until the token is available
+        """
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next)
+            self.next = slot + self.interval
+            self.requests += 1
+            self.waited += slot - now
+            if self.first is None:
+                self.first = slot
+            self.last = slot
+            return slot - now
+
+    def holdOff(self, seconds: float) -> None:
+        """Make no tokens available for some seconds from now.
+
+        Args:
+            seconds (float): seconds to hold off for
+        """
+        with self.lock:
+            self.next = max(self.next, time.monotonic() + seconds)
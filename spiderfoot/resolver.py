@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import threading
+import time
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+from .ratelimit import RateLimitBucket
+
+
+class SpiderFootResolver:
+    """DNS resolver with a cache shared by every module in a scan.
+
+    Answers are cached for as long as their TTL, up to maxTtl seconds.
+    Names which do not exist, or have no records of the type asked for,
+    are cached for as long as the negative TTL in the response, so they
+    are not looked up again either. Failed lookups, such as timeouts, are
+    not cached.
+
+    Lookups return the names the query went through, following CNAME
+    records from the name looked up to the canonical name, and the
+    records found:
+
+        names, addrs = resolver.query('www.example.com', 'A')
+
+    queryMany() looks up many names concurrently on an event loop, and
+    queryAsync() can be awaited from one.
+
+    Attributes:
+        resolver (dns.resolver.Resolver): resolver for blocking lookups
+        asyncResolver (dns.asyncresolver.Resolver): resolver for lookups on an event loop
+        concurrency (int): default maximum number of lookups run at once by queryMany()
+    """
+
+    # Seconds to wait for an answer, across retries and name servers
+    defaultTimeout = 5
+
+    # Longest seconds to cache an answer, however long its TTL
+    maxTtl = 3600
+
+    # Seconds to cache a name which does not exist when the response does
+    # not say for how long
+    defaultNegativeTtl = 300
+
+    # Maximum number of answers cached
+    maxEntries = 100000
+
+    def __init__(self, nameservers: list = None, port: int = 53, timeout: float = None, concurrency: int = 100) -> None:
+        """Initialize the SpiderFootResolver class.
+
+        Args:
+            nameservers (list): IP addresses of the name servers to query, or None for the system name servers
+            port (int): port the name servers listen on
+            timeout (float): seconds to wait for an answer
+            concurrency (int): default maximum number of lookups run at once by queryMany()
+        """
+        self.log = logging.getLogger(f"spiderfoot.{__name__}")
+        self.concurrency = concurrency
+        self.cache = dict()
+        self.lock = threading.Lock()
+
+        self.counters = {
+            'queries': 0,
+            'hits': 0,
+            'nxdomain': 0,
+            'timeouts': 0,
+            'errors': 0,
+        }
+
+        try:
+            self.resolver = dns.resolver.Resolver(configure=not nameservers)
+        except dns.resolver.NoResolverConfiguration as e:
+            self.log.warning(f"Unable to read the system name servers, DNS lookups will fail: {e}")
+            self.resolver = dns.resolver.Resolver(configure=False)
+
+        if nameservers:
+            self.resolver.nameservers = list(nameservers)
+
+        self.resolver.port = port
+        self.resolver.lifetime = self.defaultTimeout if timeout is None else timeout
+
+        self.asyncResolver = dns.asyncresolver.Resolver(configure=False)
+        self.asyncResolver.nameservers = self.resolver.nameservers
+        self.asyncResolver.port = self.resolver.port
+        self.asyncResolver.lifetime = self.resolver.lifetime
+
+    def query(self, name: str, rdtype: str = 'A') -> tuple:
+        """Look up records of a name.
+
+        Args:
+            name (str): name to look up
+            rdtype (str): record type, such as A, AAAA, PTR or MX
+
+        Returns:
+            tuple: names the query went through, and record values, each
+                   without trailing dots; two empty lists if the lookup failed
+        """
+        key = (name.lower().rstrip('.'), rdtype.upper())
+
+        cached = self.cached(key)
+        if cached is not None:
+            return cached
+
+        try:
+            answer = self.resolver.resolve(f"{key[0]}.", key[1], raise_on_no_answer=False)
+        except Exception as e:
+            return self.failed(key, e)
+
+        return self.answered(key, answer)
+
+    async def queryAsync(self, name: str, rdtype: str = 'A') -> tuple:
+        """Look up records of a name without blocking the event loop.
+
+        Args:
+            name (str): name to look up
+            rdtype (str): record type, such as A, AAAA, PTR or MX
+
+        Returns:
+            tuple: names the query went through, and record values, as query() does
+        """
+        key = (name.lower().rstrip('.'), rdtype.upper())
+
+        cached = self.cached(key)
+        if cached is not None:
+            return cached
+
+        try:
+            answer = await self.asyncResolver.resolve(f"{key[0]}.", key[1], raise_on_no_answer=False)
+        except Exception as e:
+            return self.failed(key, e)
+
+        return self.answered(key, answer)
+
+    def queryMany(self, names: list, rdtype: str = 'A', callback=None, concurrency: int = None, maxRate: float = 0) -> dict:
+        """Look up records of many names concurrently.
+
+        Answers are passed to the callback as soon as they arrive, so
+        callers can act on them while the remaining lookups run. Must not
+        be called from a running event loop; await queryAsync() there
+        instead.
+
+        Args:
+            names (list): names to look up
+            rdtype (str): record type, such as A, AAAA, PTR or MX
+            callback (callable): called from the calling thread with each name and its answer
+                                 as it arrives, and must not start an event loop itself;
+                                 returning False cancels the remaining lookups
+            concurrency (int): maximum number of lookups run at once, or None for the resolver default
+            maxRate (float): maximum number of lookups started per second, 0 for no limit
+
+        Returns:
+            dict: names the query went through and record values of each name looked up, keyed by name
+        """
+        if not names:
+            return dict()
+
+        async def queryAll() -> dict:
+            semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+            bucket = RateLimitBucket(1 / maxRate) if maxRate else None
+            results = dict()
+
+            async def queryOne(name: str) -> tuple:
+                async with semaphore:
+                    if bucket is not None:
+                        await asyncio.sleep(bucket.take())
+                    return name, await self.queryAsync(name, rdtype)
+
+            tasks = [asyncio.ensure_future(queryOne(name)) for name in names]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    name, answer = await task
+                    results[name] = answer
+                    if callback is not None and callback(name, answer) is False:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            return results
+
+        results = asyncio.run(queryAll())
+        return {name: results[name] for name in names if name in results}
+
+    def cached(self, key: tuple) -> tuple:
+        """Return a cached answer which has not expired.
+
+        Args:
+            key (tuple): lower case name and record type
+
+        Returns:
+            tuple: names and record values, or None if not cached
+        """
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+
+            if entry[0] <= time.monotonic():
+                del self.cache[key]
+                return None
+
+            self.counters['hits'] += 1
+            return list(entry[1]), list(entry[2])
+
+    def store(self, key: tuple, ttl: float, names: list, records: list) -> None:
+        """Cache an answer.
+
+        Args:
+            key (tuple): lower case name and record type
+            ttl (float): seconds to cache the answer for
+            names (list): names the query went through
+            records (list): record values
+        """
+        ttl = min(ttl, self.maxTtl)
+        if ttl <= 0:
+            return
+
+        now = time.monotonic()
+        with self.lock:
+            if len(self.cache) >= self.maxEntries:
+                self.cache = {k: v for k, v in self.cache.items() if v[0] > now}
+                # Still full of live answers, so drop the oldest half
+                if len(self.cache) >= self.maxEntries:
+                    self.cache = dict(list(self.cache.items())[len(self.cache) // 2:])
+
+            self.cache[key] = (now + ttl, names, records)
+
+    def answered(self, key: tuple, answer: dns.resolver.Answer) -> tuple:
+        """Cache and return the answer to a lookup.
+
+        Args:
+            key (tuple): lower case name and record type
+            answer (dns.resolver.Answer): answer
+
+        Returns:
+            tuple: names and record values
+        """
+        with self.lock:
+            self.counters['queries'] += 1
+
+        names = [str(rrset.name).rstrip('.') for rrset in answer.chaining_result.cnames]
+        names.append(str(answer.canonical_name).rstrip('.'))
+
+        records = list()
+        if answer.rrset is not None:
+            records = [rdata.to_text().rstrip('.') for rdata in answer.rrset]
+
+        self.store(key, answer.expiration - time.time(), names, records)
+
+        return list(names), list(records)
+
+    def failed(self, key: tuple, error: Exception) -> tuple:
+        """Count a failed lookup, caching names which do not exist.
+
+        Args:
+            key (tuple): lower case name and record type
+            error (Exception): exception raised by the lookup
+
+        Returns:
+            tuple: two empty lists
+        """
+        with self.lock:
+            self.counters['queries'] += 1
+            if isinstance(error, dns.resolver.NXDOMAIN):
+                self.counters['nxdomain'] += 1
+            elif isinstance(error, dns.exception.Timeout):
+                self.counters['timeouts'] += 1
+            else:
+                self.counters['errors'] += 1
+
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            self.store(key, self.negativeTtl(error), list(), list())
+        else:
+            self.log.debug(f"Unable to look up {key[1]} records of {key[0]}: {error}")
+
+        return list(), list()
+
+    def negativeTtl(self, error: dns.resolver.NXDOMAIN) -> float:
+        """Seconds to cache a name which does not exist, from the SOA
+        record of the response.
+
+        Args:
+            error (dns.resolver.NXDOMAIN): exception raised by the lookup
+
+        Returns:
+            float: seconds
+        """
+        try:
+            for response in error.responses().values():
+                return response.resolve_chaining().minimum_ttl
+        except Exception as e:
+            self.log.debug(f"Unable to find negative TTL: {e}")
+
+        return self.defaultNegativeTtl
+
+    def stats(self) -> dict:
+        """Statistics of the resolver.
+
+        Returns:
+            dict: answers cached, and the lookups sent, cache hits, names
+                  not found, timeouts and other failed lookups
+        """
+        with self.lock:
+            ret = {'entries': len(self.cache)}
+            ret.update(self.counters)
+            return ret
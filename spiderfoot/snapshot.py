@@ -0,0 +1,234 @@
+import heapq
+import logging
+import threading
+from array import array
+
+from spiderfoot import SpiderFootDb
+
+
+class SpiderFootScanSnapshot:
+    """Read-only, in-memory snapshot of the events of a scan, held as
+    columns.
+
+    Events are loaded once, in the order SpiderFootDb.scanResultEvent()
+    returns them (by data), and stored as parallel columns indexed by the
+    position of the event: its ID, type, module and data, with repeated
+    values sharing one string, the position of its source and the entity
+    type of its type. A set of events is a list of positions, so sets of
+    events can be selected and filtered without building a dict for each
+    event, testing each distinct value of a field once however many events
+    share it:
+
+        snapshot = SpiderFootScanSnapshot(dbh, scanId)
+        hosts = snapshot.select(eventType=['INTERNET_NAME'])
+        hosts = snapshot.filter(hosts, 'module', lambda module: module != 'sfp_dnsbrute')
+
+    The snapshot isn't changed once loaded, so it can be shared by threads.
+
+    Attributes:
+        scanId (str): scan instance ID
+        ids (list): ID of each event
+        types (list): type of each event
+        modules (list): module that generated each event
+        data (list): data of each event
+        entityTypes (list): entity type of the type of each event, or None if the type is unknown
+        sources (array): position of the source of each event, or -1 if it isn't in the scan
+    """
+
+    log = logging.getLogger("spiderfoot.snapshot")
+
+    def __init__(self, dbh: SpiderFootDb, scanId: str) -> None:
+        """Load the events of a scan.
+
+        Args:
+            dbh (SpiderFootDb): database handle
+            scanId (str): scan instance ID
+
+        Raises:
+            TypeError: argument type was invalid
+        """
+        if not isinstance(dbh, SpiderFootDb):
+            raise TypeError(f"dbh is {type(dbh)}; expected SpiderFootDb()")
+
+        if not isinstance(scanId, str):
+            raise TypeError(f"scanId is {type(scanId)}; expected str()")
+
+        self.scanId = scanId
+        entityTypeMap = {t[1]: t[3] for t in dbh.eventTypes()}
+
+        self.ids = list()
+        self.types = list()
+        self.modules = list()
+        self.data = list()
+        sourceIds = list()
+        values = dict()
+        for eventId, eventType, module, data, sourceId in dbh.scanResultSnapshot(scanId):
+            self.ids.append(eventId)
+            self.types.append(values.setdefault(eventType, eventType))
+            self.modules.append(values.setdefault(module, module))
+            self.data.append(values.setdefault(data, data))
+            sourceIds.append(sourceId)
+
+        positions = {eventId: i for i, eventId in enumerate(self.ids)}
+        self.sources = array('q', (positions.get(sourceId, -1) for sourceId in sourceIds))
+        self.entityTypes = [entityTypeMap.get(t) for t in self.types]
+
+        # positions of the events scanResultEvent() returns, which have a
+        # known type and a source in the scan, by type
+        self._byType = dict()
+        for i, eventType in enumerate(self.types):
+            if self.sources[i] >= 0 and eventType in entityTypeMap:
+                self._byType.setdefault(eventType, array('q')).append(i)
+
+        self._children = None
+        self._childrenLock = threading.Lock()
+
+        self.log.debug(f"Loaded {len(self.ids)} events of scan {scanId}")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, field: str) -> list:
+        """Column of values of a field of the events.
+
+        Args:
+            field (str): id, type, module, data or entity_type
+
+        Returns:
+            list: value of the field for each event
+
+        Raises:
+            KeyError: there is no such field
+        """
+        return {
+            'id': self.ids,
+            'type': self.types,
+            'module': self.modules,
+            'data': self.data,
+            'entity_type': self.entityTypes
+        }[field]
+
+    def select(self, eventType='ALL', srcModule=None, data=None) -> list:
+        """Positions of the events SpiderFootDb.scanResultEvent() would
+        return for the same criteria.
+
+        Args:
+            eventType (str|list): filter by event type
+            srcModule (str|list): filter by the generating module
+            data (str|list): filter by the data
+
+        Returns:
+            list: positions of the events
+        """
+        # Events with the same data are in the order of the index the
+        # database would search: by type, then module, then position.
+        if eventType == 'ALL':
+            selected = sorted(i for positions in self._byType.values() for i in positions)
+        else:
+            eventTypes = sorted(set(eventType)) if isinstance(eventType, list) else [eventType]
+            selected = list(heapq.merge(*[self._byType.get(t, ()) for t in eventTypes], key=self.data.__getitem__))
+
+        if srcModule:
+            modules = set(srcModule) if isinstance(srcModule, list) else {srcModule}
+            selected = [i for i in selected if self.modules[i] in modules]
+            if eventType == 'ALL':
+                selected.sort(key=lambda i: (self.data[i], self.modules[i], self.types[i]))
+
+        if data:
+            values = set(data) if isinstance(data, list) else {data}
+            selected = [i for i in selected if self.data[i] in values]
+
+        return selected
+
+    def source(self, index: int) -> list:
+        """Position of the source of an event, as a list of none or one,
+        the way SpiderFootDb.scanElementSourcesDirect() finds it: only if
+        the source's type is known.
+
+        Args:
+            index (int): position of the event
+
+        Returns:
+            list: position of the source
+        """
+        source = self.sources[index]
+        if source < 0 or self.entityTypes[source] is None:
+            return []
+        return [source]
+
+    def children(self, index: int) -> array:
+        """Positions of the events found from an event, in the order
+        SpiderFootDb.scanResultEvent() returns them.
+
+        Args:
+            index (int): position of the event
+
+        Returns:
+            array: positions of the children
+        """
+        if self._children is None:
+            self._indexChildren()
+        offsets, children = self._children
+        return children[offsets[index]:offsets[index + 1]]
+
+    def _indexChildren(self) -> None:
+        """Index the children of every event, the first time they're needed."""
+        with self._childrenLock:
+            if self._children is not None:
+                return
+
+            counts = array('q', bytes(8 * (len(self.ids) + 1)))
+            selected = sorted(i for positions in self._byType.values() for i in positions)
+            for i in selected:
+                counts[self.sources[i] + 1] += 1
+            for i in range(len(self.ids)):
+                counts[i + 1] += counts[i]
+
+            children = array('q', bytes(8 * len(selected)))
+            fill = array('q', counts)
+            for i in selected:
+                source = self.sources[i]
+                children[fill[source]] = i
+                fill[source] += 1
+
+            self._children = (counts, children)
+
+    def filter(self, indices: list, field: str, keep, entities: dict = None) -> list:
+        """Events of a set whose field has a value keep() accepts.
+
+        keep() is called once for each distinct value of the field in the
+        set. For a field of the sources, children or entities of the events
+        (e.g. source.type), events are kept if the field of any of them is
+        accepted.
+
+        Args:
+            indices (list): positions of the events
+            field (str): field to test
+            keep (function): function returning True for values to keep
+            entities (dict): positions of the entities of each event, for entity fields
+
+        Returns:
+            list: positions of the events kept
+        """
+        if "." not in field:
+            column = self.column(field)
+            kept = {v for v in {column[i] for i in indices} if keep(v)}
+            return [i for i in indices if column[i] in kept]
+
+        key, field = field.split(".")
+        column = self.column(field)
+        if key == 'source':
+            related = self.source
+        elif key == 'child':
+            related = self.children
+        elif key == 'entity':
+            entities = entities or dict()
+
+            def related(i: int) -> list:
+                return entities.get(i, ())
+        else:
+            raise KeyError(key)
+
+        relatives = {i: related(i) for i in indices}
+        kept = {v for v in {column[r] for rs in relatives.values() for r in rs} if keep(v)}
+        return [i for i in indices if any(column[r] in kept for r in relatives[i])]
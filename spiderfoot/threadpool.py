@@ -1,7 +1,7 @@
 import queue
 import logging
 import threading
-from time import sleep
+from collections import deque
 from contextlib import suppress
 
 
@@ -9,6 +9,13 @@ class SpiderFootThreadPool:
     """
     Each thread in the pool is spawned only once, and reused for best performance.
 
+    Function calls are queued per task name (usually the module which
+    submitted them), and idle workers sleep on a condition variable until
+    a call is queued. Task names take turns to have calls run, so one busy
+    module cannot starve the others; a task name with a higher weight has
+    that many calls run each turn. Submitting blocks, without polling,
+    while a task name has maxThreads calls queued or running.
+
     Example 1: using map()
         with SpiderFootThreadPool(self.opts["_maxthreads"]) as pool:
             # callback("a", "arg1"), callback("b", "arg1"), ...
@@ -36,7 +43,7 @@ class SpiderFootThreadPool:
 
         Args:
             threads (int): Max number of threads
-            qsize (int): Queue size
+            qsize (int): Max number of queued function calls per task name
             name (str): Name
         """
         self.log = logging.getLogger(f"spiderfoot.{__name__}")
@@ -45,12 +52,30 @@ class SpiderFootThreadPool:
         self.pool = [None] * self.threads
         self.name = str(name)
         self.inputThread = None
-        self.inputQueues = dict()
         self.outputQueues = dict()
         self._stop = False
+        self._started = False
         self._lock = threading.Lock()
+        # notified when a function call is queued, or the pool is stopped
+        self._taskReady = threading.Condition(self._lock)
+        # notified when no function calls are queued or running
+        self._idle = threading.Condition(self._lock)
+        # per task name: queued calls, running calls, weight, calls left
+        # this turn, and condition notified when a call finishes
+        self._queued = dict()
+        self._running = dict()
+        self._weights = dict()
+        self._credits = dict()
+        self._taskDone = dict()
+        # task names with queued calls, in turn order
+        self._ready = deque()
+        self._pending = 0
 
     def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
         self.log.debug(f'Starting thread pool "{self.name}" with {self.threads:,} threads')
         for i in range(self.threads):
             t = ThreadPoolWorker(pool=self, name=f"{self.name}_worker_{i + 1}")
@@ -64,10 +89,17 @@ class SpiderFootThreadPool:
     @stop.setter
     def stop(self, val: bool):
         assert val in (True, False), "stop must be either True or False"
-        for t in self.pool:
-            with suppress(Exception):
-                t.stop = val
-        self._stop = val
+        with self._lock:
+            for t in self.pool:
+                with suppress(Exception):
+                    t.stop = val
+            self._stop = val
+            if val:
+                # wake up idle workers, blocked submitters and waiters
+                self._taskReady.notify_all()
+                self._idle.notify_all()
+                for taskDone in self._taskDone.values():
+                    taskDone.notify_all()
 
     def shutdown(self, wait: bool = True) -> dict:
         """Shut down the pool.
@@ -81,56 +113,54 @@ class SpiderFootThreadPool:
         results = dict()
         self.log.debug(f'Shutting down thread pool "{self.name}" with wait={wait}')
         if wait:
-            while not self.finished and not self.stop:
-                with self._lock:
-                    outputQueues = list(self.outputQueues)
-                for taskName in outputQueues:
-                    moduleResults = list(self.results(taskName))
-                    try:
-                        results[taskName] += moduleResults
-                    except KeyError:
-                        results[taskName] = moduleResults
-                sleep(.1)
+            with suppress(AttributeError):
+                self.inputThread.join()
+            with self._lock:
+                while self._pending and not self._stop:
+                    self._idle.wait()
         self.stop = True
-        # make sure input queues are empty
+        # drop function calls which have not started
         with self._lock:
-            inputQueues = list(self.inputQueues.values())
-        for q in inputQueues:
-            with suppress(Exception):
-                while 1:
-                    q.get_nowait()
-            with suppress(Exception):
-                q.close()
-        # make sure output queues are empty
-        with self._lock:
-            outputQueues = list(self.outputQueues.items())
-        for taskName, q in outputQueues:
-            moduleResults = list(self.results(taskName))
-            try:
-                results[taskName] += moduleResults
-            except KeyError:
-                results[taskName] = moduleResults
-            with suppress(Exception):
-                q.close()
+            for taskName, tasks in self._queued.items():
+                self._pending -= len(tasks)
+                tasks.clear()
+                self._taskDone[taskName].notify_all()
+            self._ready.clear()
+            outputQueues = list(self.outputQueues)
+        for taskName in outputQueues:
+            results[taskName] = list(self.results(taskName))
         return results
 
     def submit(self, callback, *args, **kwargs) -> None:
         """Submit a function call to the pool.
-        The "taskName" and "maxThreads" arguments are optional.
+        The "taskName", "maxThreads" and "weight" arguments are optional.
+
+        Blocks while the task has maxThreads function calls queued or
+        running, or qsize calls queued.
 
         Args:
             callback (function): callback function
             *args: Passed through to callback
-            **kwargs: Passed through to callback, except for taskName and maxThreads
+            **kwargs: Passed through to callback, except for taskName, maxThreads and weight
         """
-        taskName = kwargs.get('taskName', 'default')
+        taskName = kwargs.pop('taskName', 'default')
         maxThreads = kwargs.pop('maxThreads', 100)
-        # block if this module's thread limit has been reached
-        while self.countQueuedTasks(taskName) >= maxThreads:
-            sleep(.01)
-            continue
+        weight = kwargs.pop('weight', 1)
         self.log.debug(f"Submitting function \"{callback.__name__}\" from module \"{taskName}\" to thread pool \"{self.name}\"")
-        self.inputQueue(taskName).put((callback, args, kwargs))
+        with self._lock:
+            tasks = self._taskQueue(taskName)
+            # block if this module's thread limit has been reached
+            while not self._stop and (len(tasks) + self._running[taskName] >= maxThreads or len(tasks) >= self.qsize):
+                self._taskDone[taskName].wait()
+            if self._stop:
+                return
+            self._weights[taskName] = max(1, int(weight))
+            if not tasks:
+                self._credits[taskName] = self._weights[taskName]
+                self._ready.append(taskName)
+            tasks.append((callback, args, kwargs))
+            self._pending += 1
+            self._taskReady.notify()
 
     def countQueuedTasks(self, taskName: str) -> int:
         """For the specified task, returns the number of queued function calls
@@ -142,29 +172,77 @@ class SpiderFootThreadPool:
         Returns:
             int: the number of queued function calls plus the number of functions which are currently executing
         """
-        queuedTasks = 0
-        with suppress(Exception):
-            queuedTasks += self.inputQueues[taskName].qsize()
-        runningTasks = 0
-        for t in self.pool:
-            with suppress(Exception):
-                if t.taskName == taskName:
-                    runningTasks += 1
-        return queuedTasks + runningTasks
-
-    def inputQueue(self, taskName: str = "default") -> str:
-        try:
-            return self.inputQueues[taskName]
-        except KeyError:
-            self.inputQueues[taskName] = queue.Queue(self.qsize)
-            return self.inputQueues[taskName]
+        with self._lock:
+            return len(self._queued.get(taskName, ())) + self._running.get(taskName, 0)
+
+    def _taskQueue(self, taskName: str) -> deque:
+        """Queued function calls of a task, creating its state if the task is
+        new. Must be called with the lock held.
 
-    def outputQueue(self, taskName: str = "default") -> str:
+        Args:
+            taskName (str): Name of task
+
+        Returns:
+            deque: queued function calls
+        """
         try:
-            return self.outputQueues[taskName]
+            return self._queued[taskName]
         except KeyError:
-            self.outputQueues[taskName] = queue.Queue(self.qsize)
-            return self.outputQueues[taskName]
+            self._queued[taskName] = deque()
+            self._running[taskName] = 0
+            self._taskDone[taskName] = threading.Condition(self._lock)
+            return self._queued[taskName]
+
+    def nextTask(self) -> tuple:
+        """Wait for a queued function call, and mark it as running.
+
+        The task name at the head of the turn order has up to its weight in
+        calls run before it moves to the back.
+
+        Returns:
+            tuple: task name, callback, args and kwargs, or None if the pool is stopping
+        """
+        with self._lock:
+            while not self._stop and not self._ready:
+                self._taskReady.wait()
+            if self._stop:
+                return None
+
+            taskName = self._ready[0]
+            tasks = self._queued[taskName]
+            callback, args, kwargs = tasks.popleft()
+            self._running[taskName] += 1
+            self._credits[taskName] -= 1
+            if not tasks:
+                self._ready.popleft()
+            elif self._credits[taskName] <= 0:
+                self._credits[taskName] = self._weights[taskName]
+                self._ready.rotate(-1)
+
+            # a queue slot is free
+            self._taskDone[taskName].notify_all()
+            return taskName, callback, args, kwargs
+
+    def taskDone(self, taskName: str) -> None:
+        """Mark a running function call as finished.
+
+        Args:
+            taskName (str): Name of task
+        """
+        with self._lock:
+            self._running[taskName] -= 1
+            self._pending -= 1
+            self._taskDone[taskName].notify_all()
+            if not self._pending:
+                self._idle.notify_all()
+
+    def outputQueue(self, taskName: str = "default") -> queue.Queue:
+        with self._lock:
+            try:
+                return self.outputQueues[taskName]
+            except KeyError:
+                self.outputQueues[taskName] = queue.Queue()
+                return self.outputQueues[taskName]
 
     def map(self, callback, iterable, *args, **kwargs) -> None:  # noqa: A003
         """map.
@@ -179,44 +257,63 @@ class SpiderFootThreadPool:
             return values from completed callback function
         """
         taskName = kwargs.get("taskName", "default")
+        with self._lock:
+            self._taskQueue(taskName)
         self.inputThread = threading.Thread(target=self.feedQueue, args=(callback, iterable, args, kwargs))
         self.inputThread.start()
         self.start()
-        sleep(.1)
         yield from self.results(taskName, wait=True)
 
     def results(self, taskName: str = "default", wait: bool = False) -> None:
+        """Results of the function calls of a task.
+
+        Args:
+            taskName (str): Name of task
+            wait (bool): Whether to wait until every function call of the task, and
+                         every call still to be submitted by map(), has finished
+
+        Yields:
+            return values from completed callback function
+        """
+        output = self.outputQueue(taskName)
         while 1:
-            result = False
-            with suppress(Exception):
+            with suppress(queue.Empty):
                 while 1:
-                    yield self.outputQueue(taskName).get_nowait()
-                    result = True
-            if self.countQueuedTasks(taskName) == 0 or not wait:
+                    yield output.get_nowait()
+            if not wait:
                 break
-            if not result:
-                # sleep briefly to save CPU
-                sleep(.1)
+            with self._lock:
+                tasks = self._taskQueue(taskName)
+                if output.empty() and not self._running[taskName] and not tasks:
+                    if self._stop or self.inputThread is None or not self.inputThread.is_alive():
+                        break
+                if output.empty():
+                    self._taskDone[taskName].wait()
 
     def feedQueue(self, callback, iterable, args, kwargs) -> None:
-        for i in iterable:
-            if self.stop:
-                break
-            self.submit(callback, i, *args, **kwargs)
+        taskName = kwargs.get("taskName", "default")
+        try:
+            for i in iterable:
+                if self.stop:
+                    break
+                self.submit(callback, i, *args, **kwargs)
+        finally:
+            # wake up results() to see that nothing more will be submitted
+            with self._lock:
+                self._taskQueue(taskName)
+                self._taskDone[taskName].notify_all()
 
     @property
     def finished(self):
         if self.stop:
             return True
 
-        finishedThreads = [not t.busy for t in self.pool if t is not None]
         try:
             inputThreadAlive = self.inputThread.is_alive()
         except AttributeError:
             inputThreadAlive = False
 
-        inputQueuesEmpty = [q.empty() for q in self.inputQueues.values()]
-        return not inputThreadAlive and all(inputQueuesEmpty) and all(finishedThreads)
+        return not inputThreadAlive and not self._pending
 
     def __enter__(self):
         return self
@@ -238,33 +335,24 @@ class ThreadPoolWorker(threading.Thread):
         super().__init__(name=name)
 
     def run(self) -> None:
-        # Round-robin through each module's input queue
         while not self.stop:
-            ran = False
-            with self.pool._lock:
-                inputQueues = list(self.pool.inputQueues.values())
-            for q in inputQueues:
-                if self.stop:
-                    break
+            task = self.pool.nextTask()
+            if task is None:
+                break
+
+            self.taskName, callback, args, kwargs = task
+            self.busy = True
+            try:
+                saveResult = kwargs.pop("saveResult", False)
                 try:
-                    self.busy = True
-                    callback, args, kwargs = q.get_nowait()
-                    self.taskName = kwargs.pop("taskName", "default")
-                    saveResult = kwargs.pop("saveResult", False)
-                    try:
-                        result = callback(*args, **kwargs)
-                        ran = True
-                    except Exception:  # noqa: B902
-                        import traceback
-                        self.log.error(f'Error in thread worker {self.name}: {traceback.format_exc()}')
-                        break
-                    if saveResult:
-                        self.pool.outputQueue(self.taskName).put(result)
-                except queue.Empty:
-                    self.busy = False
-                finally:
-                    self.busy = False
-                    self.taskName = ""
-            # sleep briefly to save CPU
-            if not ran:
-                sleep(.05)
+                    result = callback(*args, **kwargs)
+                except Exception:  # noqa: B902
+                    import traceback
+                    self.log.error(f'Error in thread worker {self.name}: {traceback.format_exc()}')
+                    continue
+                if saveResult:
+                    self.pool.outputQueue(self.taskName).put(result)
+            finally:
+                self.busy = False
+                self.pool.taskDone(self.taskName)
+                self.taskName = ""
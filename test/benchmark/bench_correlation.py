@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_correlation
+# Purpose:      Benchmark running the correlation rules against a scan.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark running the correlation rules against a scan.
+
+Stores a synthetic scan of hosts, IP addresses, open ports, vulnerabilities
+and malicious host reports in a temporary database, then times processing
+every rule in the correlations directory with each number of workers, with
+the rules collecting events from the database, as they used to, and from a
+snapshot of the scan loaded once for all rules. Reports the time taken for
+each, including loading the snapshot, and the time taken by the slowest
+rules with one worker.
+
+The default scan of about 500,000 events takes around half an hour to
+process from the database; pass --modes snapshot to skip it, or fewer
+--hosts.
+
+Usage:
+    python3 -m test.benchmark.bench_correlation [--hosts 94000] [--workers 1,4] [--modes database,snapshot]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from spiderfoot import SpiderFootCorrelator, SpiderFootDb, SpiderFootEvent, SpiderFootHelpers, SpiderFootScanSnapshot
+
+
+def storeSyntheticScan(dbh: SpiderFootDb, scanId: str, hosts: int) -> int:
+    """Store a synthetic scan of events.
+
+    Args:
+        dbh (SpiderFootDb): database handle
+        scanId (str): scan instance ID
+        hosts (int): number of hosts to store events for
+
+    Returns:
+        int: number of events stored
+    """
+    rand = random.Random(1)  # noqa: DUO102
+    root = SpiderFootEvent("ROOT", "example.com", "", None)
+    target = SpiderFootEvent("INTERNET_NAME", "example.com", "SpiderFoot UI", root)
+    events = [root, target]
+    count = 0
+    for i in range(hosts):
+        host = SpiderFootEvent("INTERNET_NAME", f"host{i}.example.com", rand.choice(["sfp_dnsbrute", "sfp_crt", "sfp_spider"]), target)
+        ip = SpiderFootEvent("IP_ADDRESS", f"10.{i // 65536}.{i // 256 % 256}.{i % 256}", "sfp_dnsresolve", host)
+        events.extend([host, ip, SpiderFootEvent("TCP_PORT_OPEN", f"{ip.data}:{rand.choice([22, 80, 443, 3389])}", "sfp_portscan_tcp", ip)])
+        events.append(SpiderFootEvent("WEBSERVER_BANNER", rand.choice(["nginx", "Apache", "IIS"]), "sfp_spider", host))
+        events.append(SpiderFootEvent("COUNTRY_NAME", rand.choice(["United States", "Germany", "Japan"]), "sfp_geoinfo", ip))
+        if rand.random() < 0.1:
+            for module in rand.sample(["sfp_alienvault", "sfp_abusech", "sfp_spamhaus"], 2):
+                events.append(SpiderFootEvent("MALICIOUS_INTERNET_NAME", host.data, module, host))
+        if rand.random() < 0.1:
+            events.append(SpiderFootEvent("VULNERABILITY_CVE_CRITICAL", f"CVE-2021-{i}", "sfp_shodan", ip))
+        if len(events) >= 10000:
+            dbh.scanEventStoreBatch(scanId, events)
+            count += len(events)
+            events = list()
+    dbh.scanEventStoreBatch(scanId, events)
+    return count + len(events)
+
+
+def processRules(correlator: SpiderFootCorrelator, workers: int, snapshot: bool) -> tuple:
+    """Process every rule, timing each as it completes.
+
+    Args:
+        correlator (SpiderFootCorrelator): correlator
+        workers (int): number of rules to process concurrently
+        snapshot (bool): collect events from a snapshot of the scan
+
+    Returns:
+        tuple: seconds taken, number of correlations and seconds until each rule completed since the last
+    """
+    results = 0
+    ruleTimes = dict()
+    start = last = time.perf_counter()
+    for rule, result in correlator.process_rules(workers, snapshot=snapshot):
+        now = time.perf_counter()
+        ruleTimes[rule['id']] = now - last
+        last = now
+        results += len(result or {})
+    return time.perf_counter() - start, results, ruleTimes
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark running the correlation rules against a scan.")
+    p.add_argument("--hosts", type=int, default=94000, help="Number of hosts to store events for.")
+    p.add_argument("--workers", type=str, default="1,4", help="Numbers of workers to time, comma-separated.")
+    p.add_argument("--modes", type=str, default="database,snapshot", help="Where rules collect events from, comma-separated.")
+    p.add_argument("--rules", type=int, default=10, help="Number of the slowest rules to report.")
+    args = p.parse_args()
+
+    correlations_dir = os.path.dirname(os.path.abspath(__file__)) + '/../../correlations/'
+    ruleset = SpiderFootHelpers.loadCorrelationRulesRaw(correlations_dir, ['template.yaml'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dbh = SpiderFootDb({'__database': f"{tmp}/spiderfoot.db"})
+        scanId = str(uuid.uuid4())
+        dbh.scanInstanceCreate(scanId, "benchmark", "example.com")
+        count = storeSyntheticScan(dbh, scanId, args.hosts)
+
+        start = time.perf_counter()
+        SpiderFootScanSnapshot(dbh, scanId)
+        print(f"events: {count:,}  rules: {len(ruleset)}  snapshot loaded in {time.perf_counter() - start:.2f}s")
+
+        ruleTimes = dict()
+        for mode in args.modes.split(","):
+            for workers in [int(w) for w in args.workers.split(",")]:
+                # a new correlator, so each run loads its own snapshot
+                correlator = SpiderFootCorrelator(dbh, ruleset, scanId)
+                elapsed, results, times = processRules(correlator, workers, mode == "snapshot")
+                if workers == 1:
+                    ruleTimes[mode] = times
+                print(f"{mode:8s}  workers: {workers:3d}  {elapsed:8.2f}s  {results:,} correlations")
+
+        if ruleTimes:
+            slowest = max(ruleTimes.values(), key=lambda times: sum(times.values()))
+            print(f"\n{'slowest rules with 1 worker':40s}" + "".join(f"  {mode:>8s}" for mode in ruleTimes))
+            for rule in sorted(slowest, key=slowest.get, reverse=True)[:args.rules]:
+                print(f"{rule:40s}" + "".join(f"  {ruleTimes[mode].get(rule, 0):7.2f}s" for mode in ruleTimes))
+
+
+if __name__ == "__main__":
+    main()
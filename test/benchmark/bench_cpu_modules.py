@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_cpu_modules
+# Purpose:      Benchmark handling events in CPU-bound modules with worker processes.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark handling events in CPU-bound modules with worker processes.
+
+Sends synthetic web content events to the modules flagged as CPU-bound, run
+as they are in a scan (module threads handing events to the shared thread
+pool), and times how long they take to handle them all with each number of
+worker processes; 0 handles them in this process. Events per second should
+scale with the number of processes up to the number of CPU cores.
+
+Usage:
+    python3 -m test.benchmark.bench_cpu_modules [--events 200] [--processes 0,1,2,4]
+"""
+
+import argparse
+import os
+import queue
+import random
+import tempfile
+import time
+
+from sflib import SpiderFoot
+from spiderfoot import SpiderFootEvent, SpiderFootHelpers, SpiderFootProcessPool, SpiderFootTarget, SpiderFootThreadPool
+
+MODULES = ['sfp_base64', 'sfp_creditcard', 'sfp_email', 'sfp_hashes', 'sfp_iban', 'sfp_names']
+
+TLDS = "// ===BEGIN ICANN DOMAINS===\n\ncom\nnet\norg\n\n// // ===END ICANN DOMAINS===\n"
+
+
+def syntheticContent(rand: random.Random, size: int) -> str:
+    """Create synthetic web content with a few things for modules to find.
+
+    Args:
+        rand (random.Random): random number generator
+        size (int): approximate number of characters
+
+    Returns:
+        str: web content
+    """
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "Jane", "Smith", "<div>", "</div>", "<a href=\"/about\">"]
+    parts = list()
+    length = 0
+    while length < size:
+        part = rand.choice(words)
+        if rand.random() < 0.002:
+            part = rand.choice([
+                f"user{rand.randint(0, 999)}@example.com",
+                "4111 1111 1111 1111",
+                "GB82 WEST 1234 5698 7654 32",
+                "d41d8cd98f00b204e9800998ecf8427e",
+                "https://example.com/?q=c3BpZGVyZm9vdCBzeW50aGV0aWMgZGF0YQ==",
+            ])
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+
+def loadModules(opts: dict, target: SpiderFootTarget) -> list:
+    """Set up the CPU-bound modules which can be set up here.
+
+    Args:
+        opts (dict): options
+        target (SpiderFootTarget): scan target
+
+    Returns:
+        list: modules
+    """
+    mods = list()
+    for modName in MODULES:
+        try:
+            module = __import__('modules.' + modName, globals(), locals(), [modName])
+            mod = getattr(module, modName)()
+            mod.__name__ = modName
+            mod.setup(SpiderFoot(opts), dict(opts))
+            mod.setTarget(target)
+        except Exception as e:
+            print(f"skipping {modName}: {e}")
+            continue
+        mods.append(mod)
+    return mods
+
+
+def run(events: list, processes: int, opts: dict, target: SpiderFootTarget) -> tuple:
+    """Time the CPU-bound modules handling events.
+
+    Args:
+        events (list): events to send to every module
+        processes (int): number of worker processes, 0 to handle events in this process
+        opts (dict): options
+        target (SpiderFootTarget): scan target
+
+    Returns:
+        tuple: number of modules, seconds taken and number of events produced
+    """
+    mods = loadModules(opts, target)
+    threadPool = SpiderFootThreadPool(threads=len(mods) * max(1, processes), name='benchmark')
+    threadPool.start()
+    processPool = None
+    if processes:
+        processPool = SpiderFootProcessPool(processes, {mod.__name__: opts for mod in mods}, target)
+
+    outgoing = queue.Queue()
+    for mod in mods:
+        mod.setSharedThreadPool(threadPool)
+        if processPool is not None:
+            mod.setProcessPool(processPool)
+        mod.incomingEventQueue = queue.Queue()
+        mod.outgoingEventQueue = outgoing
+
+    try:
+        if processPool is not None:
+            # start the worker processes before timing
+            for mod in mods:
+                processPool.handleEvent(mod.__name__, events[0])
+
+        for mod in mods:
+            mod.start()
+
+        start = time.perf_counter()
+        for event in events:
+            for mod in mods:
+                mod.incomingEventQueue.put(event)
+
+        done = produced = 0
+        while done < len(events) * len(mods):
+            item = outgoing.get()
+            if isinstance(item, str):
+                done += 1
+            else:
+                produced += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        for mod in mods:
+            mod._stopScanning = True
+            mod.incomingEventQueue.put(None)
+        threadPool.shutdown()
+        if processPool is not None:
+            processPool.shutdown()
+
+    return len(mods), elapsed, produced
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark handling events in CPU-bound modules with worker processes.")
+    p.add_argument("--events", type=int, default=200, help="Number of web content events to send to each module.")
+    p.add_argument("--size", type=int, default=50000, help="Approximate characters of content in each event.")
+    p.add_argument("--processes", type=str, default="0,1,2,4", help="Numbers of worker processes to time, comma-separated.")
+    args = p.parse_args()
+
+    rand = random.Random(1)  # noqa: DUO102
+    root = SpiderFootEvent("ROOT", "example.com", "", None)
+    events = list()
+    for i in range(args.events):
+        url = f"https://example.com/page{i}"
+        evt = SpiderFootEvent("TARGET_WEB_CONTENT", syntheticContent(rand, args.size), "sfp_spider", root)
+        evt.actualSource = url
+        evt.freeze()
+        events.append(evt)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        opts = {
+            '_debug': False,
+            '__database': os.path.join(tmp, "spiderfoot.db"),
+            '_internettlds': TLDS.splitlines(),
+            '_genericusers': ",".join(SpiderFootHelpers.usernamesFromWordlists(['generic-usernames'])),
+        }
+        target = SpiderFootTarget("example.com", "INTERNET_NAME")
+
+        print(f"events: {args.events:,} x {args.size:,} characters  cpus: {os.cpu_count()}")
+        for processes in [int(n) for n in args.processes.split(",")]:
+            modules, elapsed, produced = run(events, processes, opts, target)
+            rate = args.events * modules / elapsed
+            print(f"processes: {processes:3d}  {elapsed:7.2f}s  {rate:8.1f} events/s  {produced:,} events produced by {modules} modules")
+
+
+if __name__ == "__main__":
+    main()
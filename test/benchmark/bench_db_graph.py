@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_db_graph
+# Purpose:      Benchmark walking the graph of stored scan events.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark walking the graph of stored scan events.
+
+Stores a synthetic scan of events, each linked to a recent earlier event as
+its source so chains of parents build up, in a temporary database. Then
+times SpiderFootDb.scanElementSourcesAll() from every IP_ADDRESS event (as
+the web UI's discovery path does) and SpiderFootDb.scanElementChildrenAll()
+from the target.
+
+Usage:
+    python3 -m test.benchmark.bench_db_graph [--events 100000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import uuid
+
+from spiderfoot import SpiderFootDb, SpiderFootEvent
+
+
+def syntheticScan(count: int) -> list:
+    """Create a synthetic scan of events.
+
+    Args:
+        count (int): number of events to create
+
+    Returns:
+        list: events
+    """
+    rand = random.Random(1)  # noqa: DUO102
+    root = SpiderFootEvent("ROOT", "example.com", "", None)
+    events = [root, SpiderFootEvent("INTERNET_NAME", "example.com", "SpiderFoot UI", root)]
+    for i in range(count):
+        # link to one of the last few hundred events, building deep chains
+        source = events[max(1, len(events) - rand.randint(1, 500))]
+        events.append(SpiderFootEvent(rand.choice(['INTERNET_NAME', 'IP_ADDRESS']), f"host{i}.example.com", "sfp_benchmark", source))
+    return events
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark walking the graph of stored scan events.")
+    p.add_argument("--events", type=int, default=100000, help="Number of events to store.")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dbh = SpiderFootDb({'__database': f"{tmp}/spiderfoot.db"})
+        scanId = str(uuid.uuid4())
+        dbh.scanInstanceCreate(scanId, "benchmark", "example.com")
+        events = syntheticScan(args.events)
+        dbh.scanEventStoreBatch(scanId, events)
+
+        leafSet = dbh.scanResultEvent(scanId, 'IP_ADDRESS')
+        start = time.perf_counter()
+        datamap, pc = dbh.scanElementSourcesAll(scanId, leafSet)
+        sourcesElapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        children = dbh.scanElementChildrenAll(scanId, [events[1].hash])
+        childrenElapsed = time.perf_counter() - start
+
+    print(f"events:                 {len(events):,}")
+    print(f"scanElementSourcesAll:  {sourcesElapsed:.3f}s ({len(leafSet):,} leaves, {len(datamap):,} elements)")
+    print(f"scanElementChildrenAll: {childrenElapsed:.3f}s ({len(children):,} children)")
+
+
+if __name__ == "__main__":
+    main()
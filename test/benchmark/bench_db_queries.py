@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_db_queries
+# Purpose:      Benchmark the scan result queries used by the web UI and
+#               correlation rules.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark the scan result queries used by the web UI and correlation rules.
+
+Stores a synthetic scan in a temporary database, then times each query and
+shows the indexes it uses, as reported by EXPLAIN QUERY PLAN.
+
+Usage:
+    python3 -m test.benchmark.bench_db_queries [--events 1000000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import uuid
+from unittest import mock
+
+from spiderfoot import SpiderFootDb, SpiderFootEvent
+
+EVENT_TYPES = ['INTERNET_NAME', 'IP_ADDRESS', 'DOMAIN_NAME', 'LINKED_URL_INTERNAL', 'RAW_RIR_DATA',
+               'TCP_PORT_OPEN', 'EMAILADDR', 'WEBSERVER_BANNER', 'AFFILIATE_INTERNET_NAME', 'SSL_CERTIFICATE_RAW']
+
+
+def storeSyntheticScan(dbh: SpiderFootDb, scanId: str, count: int) -> list:
+    """Store a synthetic scan of events.
+
+    Args:
+        dbh (SpiderFootDb): database handle
+        scanId (str): scan instance ID
+        count (int): number of events to store
+
+    Returns:
+        list: hashes of a sample of the events
+    """
+    rand = random.Random(1)  # noqa: DUO102
+    root = SpiderFootEvent("ROOT", "example.com", "", None)
+    events = [root, SpiderFootEvent("INTERNET_NAME", "example.com", "SpiderFoot UI", root)]
+    recent = list(events[1:])
+    for _ in range(count):
+        source = recent[-rand.randint(1, len(recent))]
+        evt = SpiderFootEvent(rand.choice(EVENT_TYPES), f"host{rand.randint(0, count // 3)}.example.com", f"sfp_module{rand.randint(0, 80)}", source)
+        evt.freeze()
+        events.append(evt)
+        recent.append(evt)
+        if len(recent) > 1000:
+            recent.pop(0)
+        if len(events) >= 10000:
+            dbh.scanEventStoreBatch(scanId, events)
+            events = list()
+    dbh.scanEventStoreBatch(scanId, events)
+    return [evt.hash for evt in recent[:100]]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the scan result queries used by the web UI and correlation rules.")
+    p.add_argument("--events", type=int, default=1000000, help="Number of events to store.")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dbh = SpiderFootDb({'__database': f"{tmp}/spiderfoot.db"})
+        scanId = str(uuid.uuid4())
+        dbh.scanInstanceCreate(scanId, "benchmark", "example.com")
+        hashes = storeSyntheticScan(dbh, scanId, args.events)
+
+        queries = {
+            'scanResultEvent(type)': lambda: dbh.scanResultEvent(scanId, 'INTERNET_NAME'),
+            'scanResultEvent(types, filterFp)': lambda: dbh.scanResultEvent(scanId, ['IP_ADDRESS', 'EMAILADDR'], filterFp=True),
+            'scanResultEvent(srcModule)': lambda: dbh.scanResultEvent(scanId, srcModule='sfp_module1'),
+            'scanResultEvent(data)': lambda: dbh.scanResultEvent(scanId, 'INTERNET_NAME', data=['example.com']),
+            'scanResultEvent(sourceId)': lambda: dbh.scanResultEvent(scanId, sourceId=hashes),
+            'scanResultSummary(type)': lambda: dbh.scanResultSummary(scanId, 'type'),
+            'scanResultSummary(module)': lambda: dbh.scanResultSummary(scanId, 'module'),
+            'scanResultSummary(entity)': lambda: dbh.scanResultSummary(scanId, 'entity'),
+            'scanResultEventUnique(ALL)': lambda: dbh.scanResultEventUnique(scanId),
+            'scanResultEventUnique(type)': lambda: dbh.scanResultEventUnique(scanId, 'INTERNET_NAME', True),
+            'scanResultHistory': lambda: dbh.scanResultHistory(scanId),
+            'scanElementSourcesDirect': lambda: dbh.scanElementSourcesDirect(scanId, hashes),
+            'scanElementChildrenDirect': lambda: dbh.scanElementChildrenDirect(scanId, hashes),
+        }
+
+        cursor = dbh.dbh
+        dbh.dbh = mock.MagicMock(wraps=cursor)
+
+        print(f"events: {args.events:,}")
+        for name, query in queries.items():
+            start = time.perf_counter()
+            rows = query()
+            elapsed = time.perf_counter() - start
+
+            qry, qvars = dbh.dbh.execute.call_args.args
+            plan = [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {qry}", qvars).fetchall()]
+            indexes = sorted({step.split(" INDEX ")[1].split(" ")[0] for step in plan if " INDEX idx_" in step})
+            sorts = sum(1 for step in plan if "TEMP B-TREE" in step)
+
+            print(f"{name:34s} {elapsed * 1000:9.1f} ms {len(rows):9,} rows  {sorts} sorts  {', '.join(indexes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_event
+# Purpose:      Benchmark SpiderFootEvent memory use and creation throughput.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark SpiderFootEvent memory use and creation throughput.
+
+Builds a synthetic scan of events, each linked to a recent earlier event as
+its source (so chains of parents build up as they do in a real scan), and
+reports events created per second and memory used per event while all
+events are kept alive.
+
+Usage:
+    python3 -m test.benchmark.bench_event [--events 1000000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from spiderfoot import SpiderFootEvent
+
+EVENT_TYPES = ['INTERNET_NAME', 'DOMAIN_NAME', 'IP_ADDRESS', 'NETBLOCK_OWNER', 'TCP_PORT_OPEN', 'RAW_RIR_DATA']
+
+
+def syntheticScan(count: int) -> list:
+    """Create a synthetic scan of events.
+
+    Args:
+        count (int): number of events to create
+
+    Returns:
+        list: events
+    """
+    rand = random.Random(1)  # noqa: DUO102
+    root = SpiderFootEvent("ROOT", "example.com", "", None)
+    events = [SpiderFootEvent("INTERNET_NAME", "example.com", "SpiderFoot UI", root)]
+    for i in range(count - 1):
+        # link to one of the last few hundred events, building deep chains
+        source = events[max(0, len(events) - rand.randint(1, 500))]
+        evt = SpiderFootEvent(rand.choice(EVENT_TYPES), f"host{i}.example.com", "sfp_benchmark", source)
+        # what storage does with every event
+        evt.hash
+        evt.sourceEventHash
+        events.append(evt)
+    return events
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark SpiderFootEvent memory use and creation throughput.")
+    p.add_argument("--events", type=int, default=1000000, help="Number of events to create.")
+    args = p.parse_args()
+
+    gc.collect()
+    start = time.perf_counter()
+    events = syntheticScan(args.events)
+    elapsed = time.perf_counter() - start
+    del events
+    gc.collect()
+
+    tracemalloc.start()
+    events = syntheticScan(args.events)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"events:           {len(events):,}")
+    print(f"events/sec:       {args.events / elapsed:,.0f}")
+    print(f"bytes/event:      {size / args.events:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_link_extraction
+# Purpose:      Benchmark extracting links from web pages.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark extracting links from web pages.
+
+Times finding the link attributes in a corpus of HTML pages the way
+SpiderFootHelpers.extractLinksFromHtml() used to, parsing each page once for
+each type of link tag with BeautifulSoup, and the way it does now, parsing
+each page once, then times the whole of extractLinksFromHtml(), and reports
+pages per second for each. Pass a directory of saved web pages with
+--corpus; without one, synthetic pages are used.
+
+Usage:
+    python3 -m test.benchmark.bench_link_extraction [--corpus DIR] [--pages 200]
+"""
+
+import argparse
+import glob
+import os
+import random
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+from spiderfoot import SpiderFootHelpers
+from spiderfoot.helpers import _LinkCollector
+
+TAGS = {
+    'a': 'href',
+    'img': 'src',
+    'script': 'src',
+    'link': 'href',
+    'area': 'href',
+    'base': 'href',
+    'form': 'action'
+}
+
+
+def syntheticPage(rand: random.Random, size: int) -> str:
+    """Create a synthetic web page with links of every type.
+
+    Args:
+        rand (random.Random): random number generator
+        size (int): approximate number of characters
+
+    Returns:
+        str: web page
+    """
+    parts = ['<!DOCTYPE html><html><head><title>Example</title>',
+             '<link rel="stylesheet" href="/static/site.css"><script src="/static/site.js"></script></head><body>']
+    length = 0
+    while length < size:
+        part = rand.choice([
+            f'<p>Lorem ipsum dolor sit amet {rand.randint(0, 9999)}, consectetur adipiscing elit.</p>',
+            f'<a href="/page{rand.randint(0, 999)}.html">page</a>',
+            f'<a href="https://www.example.com/docs/{rand.randint(0, 999)}#section">docs</a>',
+            f'<img src="//cdn.example.com/img/{rand.randint(0, 999)}.png" alt="">',
+            '<div class="nav"><ul><li><a href="../about/">About</a></li><li><a href="mailto:info@example.com">Mail</a></li></ul></div>',
+            '<form action="/search" method="get"><input name="q"></form>',
+            '<script>var x = "/api/" + id + "/";</script>',
+        ])
+        parts.append(part)
+        length += len(part)
+    parts.append('</body></html>')
+    return "".join(parts)
+
+
+def loadCorpus(corpus: str, pages: int) -> list:
+    """Load web pages from a directory.
+
+    Args:
+        corpus (str): directory of HTML files
+        pages (int): maximum number of pages
+
+    Returns:
+        list: web pages
+    """
+    files = sorted(glob.glob(os.path.join(corpus, '**', '*.htm*'), recursive=True))
+    random.Random(1).shuffle(files)  # noqa: DUO102
+    data = list()
+    for path in files[:pages]:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            data.append(f.read())
+    return data
+
+
+def parsePerTag(url: str, data: str, domains: list) -> list:
+    """Find link attributes the way extractLinksFromHtml() used to.
+
+    Args:
+        url (str): URL of the page
+        data (str): web page
+        domains (list): domains of the target
+
+    Returns:
+        list: links
+    """
+    links = list()
+    for t in TAGS:
+        for lnk in BeautifulSoup(data, features="lxml", parse_only=SoupStrainer(t)).find_all(t):
+            if lnk.has_attr(TAGS[t]):
+                links.append(lnk[TAGS[t]])
+    return links
+
+
+def parseOnce(url: str, data: str, domains: list) -> list:
+    """Find link attributes the way extractLinksFromHtml() does now.
+
+    Args:
+        url (str): URL of the page
+        data (str): web page
+        domains (list): domains of the target
+
+    Returns:
+        list: links
+    """
+    parser = etree.HTMLParser(target=_LinkCollector(), strip_cdata=False, recover=True)
+    parser.feed(data)
+    return parser.close()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark extracting links from web pages.")
+    p.add_argument("--corpus", type=str, help="Directory of saved web pages.")
+    p.add_argument("--pages", type=int, default=200, help="Number of pages.")
+    p.add_argument("--size", type=int, default=50000, help="Approximate characters in each synthetic page.")
+    args = p.parse_args()
+
+    if args.corpus:
+        pages = loadCorpus(args.corpus, args.pages)
+    else:
+        rand = random.Random(1)  # noqa: DUO102
+        pages = [syntheticPage(rand, args.size) for _ in range(args.pages)]
+
+    url = "https://www.example.com/dir/index.html"
+    size = sum(len(page) for page in pages)
+    print(f"pages: {len(pages):,}  {size / len(pages) / 1024:.1f} KB per page")
+
+    for label, func in [
+        ("parsed per tag", parsePerTag),
+        ("parsed once", parseOnce),
+        ("extractLinksFromHtml", SpiderFootHelpers.extractLinksFromHtml),
+    ]:
+        links = 0
+        start = time.perf_counter()
+        for page in pages:
+            links += len(func(url, page, ["example.com"]))
+        elapsed = time.perf_counter() - start
+        print(f"{label:20s}  {elapsed:7.2f}s  {len(pages) / elapsed:8.1f} pages/s  {links:,} links")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_module_loading
+# Purpose:      Benchmark loading module metadata at start-up.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark loading module metadata at start-up.
+
+Loads the metadata of every module in the modules directory, as sf.py does
+at start-up, in a new Python process each time: first without a module
+metadata manifest, so every module is imported, then with the manifest the
+first run wrote. Reports the time taken, the peak memory used by the process
+and the number of modules imported.
+
+Usage:
+    python3 -m test.benchmark.bench_module_loading [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+
+# Run in a new process, so nothing has been imported yet
+LOAD_MODULES = """
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+from spiderfoot import SpiderFootHelpers
+modules = SpiderFootHelpers.loadModulesAsDict(sys.argv[1], ['sfp_template.py'], sys.argv[2])
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(modules),
+    'imported': sum(1 for name in sys.modules if name.startswith('modules.')),
+}))
+"""
+
+
+def loadModules(modDir: str, manifest: str) -> dict:
+    """Load module metadata in a new process.
+
+    Args:
+        modDir (str): modules directory
+        manifest (str): module metadata manifest
+
+    Returns:
+        dict: seconds taken, peak memory in KB, modules loaded and modules imported
+    """
+    root = os.path.dirname(os.path.abspath(__file__)) + '/../../'
+    out = subprocess.run([sys.executable, "-c", LOAD_MODULES, modDir, manifest], cwd=root, check=True, capture_output=True, text=True)  # noqa: S603
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark loading module metadata at start-up.")
+    p.add_argument("--runs", type=int, default=3, help="Number of times to load with the manifest.")
+    args = p.parse_args()
+
+    modDir = os.path.dirname(os.path.abspath(__file__)) + '/../../modules/'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, "modules.json")
+        runs = [("no manifest", loadModules(modDir, manifest))]
+        runs += [("manifest", loadModules(modDir, manifest)) for _ in range(args.runs)]
+
+        for label, run in runs:
+            print(f"{label:12s}  {run['seconds']:6.3f}s  {run['maxrss'] // 1024:4d} MB peak RSS  "
+                  f"{run['modules']} modules loaded, {run['imported']} imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_module_setup
+# Purpose:      Benchmark giving every module its options at the start of a scan.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark giving every module its options at the start of a scan.
+
+Sets up every module with scan options the size of a real scan's (the
+metadata of every module, the correlation rules and a TLD list the size of
+the Mozilla public suffix list), as the scanner does at the start of a
+scan, in a new Python process each time: first deep-copying the global
+options for each module as the scanner used to, then sharing them between
+modules with SpiderFootConfig. Reports the time taken and the memory
+allocated setting up the modules.
+
+Usage:
+    python3 -m test.benchmark.bench_module_setup [--tlds 10000]
+"""
+
+import argparse
+import json
+import os
+import subprocess  # noqa: S404
+import sys
+
+# Run in a new process, so each run starts with nothing allocated
+SETUP_MODULES = """
+import json
+import os
+import resource
+import sys
+import time
+from copy import deepcopy
+
+import yaml
+
+from sflib import SpiderFoot
+from spiderfoot import SpiderFootConfig, SpiderFootHelpers
+
+mode, tlds = sys.argv[1], int(sys.argv[2])
+root = os.getcwd()
+
+config = {
+    '_debug': False,
+    '_useragent': "SpiderFoot",
+    '_fetchtimeout': 5,
+    '_genericusers': ",".join(SpiderFootHelpers.usernamesFromWordlists(['generic-usernames'])),
+    '_internettlds': ["// ===BEGIN ICANN DOMAINS==="] + [f"tld{i}" for i in range(tlds)] + ["// ===END ICANN DOMAINS==="],
+    '__database': os.devnull,
+}
+config['__modules__'] = SpiderFootHelpers.loadModulesAsDict(root + '/modules/', ['sfp_template.py'])
+rules = SpiderFootHelpers.loadCorrelationRulesRaw(root + '/correlations/', ['template.yaml'])
+config['__correlationrules__'] = [yaml.safe_load(raw) for raw in rules.values()]
+config['_modulesenabled'] = list(config['__modules__'])
+
+mods = list()
+for modName in config['__modules__']:
+    module = __import__('modules.' + modName, globals(), locals(), [modName])
+    mods.append((modName, getattr(module, modName)()))
+
+sf = SpiderFoot(config)
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+
+if mode == "shared":
+    globalConfig = SpiderFootConfig.freeze(config)
+
+modconfig = dict()
+failed = 0
+for modName, mod in mods:
+    if mode == "shared":
+        modconfig[modName] = SpiderFootConfig(globalConfig, deepcopy(config['__modules__'][modName]['opts']))
+    else:
+        modconfig[modName] = deepcopy(config['__modules__'][modName]['opts'])
+        for opt in list(config.keys()):
+            modconfig[modName][opt] = deepcopy(config[opt])
+    try:
+        mod.setup(sf, modconfig[modName])
+    except Exception:
+        failed += 1
+
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'growth': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline,
+    'modules': len(mods) - failed,
+}))
+"""
+
+
+def setupModules(mode: str, tlds: int) -> dict:
+    """Set up every module in a new process.
+
+    Args:
+        mode (str): "copied" to deep-copy global options for each module, "shared" to share them
+        tlds (int): number of rules in the TLD list
+
+    Returns:
+        dict: seconds taken, peak memory in KB, peak memory growth in KB and modules set up
+    """
+    root = os.path.dirname(os.path.abspath(__file__)) + '/../../'
+    out = subprocess.run([sys.executable, "-c", SETUP_MODULES, mode, str(tlds)], cwd=root, check=True, capture_output=True, text=True)  # noqa: S603
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark giving every module its options at the start of a scan.")
+    p.add_argument("--tlds", type=int, default=10000, help="Number of rules in the synthetic TLD list.")
+    args = p.parse_args()
+
+    for mode in ["copied", "shared"]:
+        run = setupModules(mode, args.tlds)
+        print(f"{mode:8s}  {run['modules']} modules  {run['seconds']:6.3f}s  "
+              f"{run['maxrss'] // 1024:4d} MB peak RSS  (+{run['growth'] // 1024} MB setting up modules)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_public_suffix
+# Purpose:      Benchmark looking host names up in the Internet TLD list.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark looking host names up in the Internet TLD list.
+
+Times hostDomain(), isDomain() and validHost() on a synthetic TLD list the
+size of the Mozilla public suffix list, first parsing the list on every call
+as they used to, then with the public suffix list SpiderFoot shares between
+calls, and reports the cost of each call.
+
+Usage:
+    python3 -m test.benchmark.bench_public_suffix [--calls 20000] [--tlds 10000]
+"""
+
+import argparse
+import random
+import time
+
+from publicsuffixlist import PublicSuffixList
+
+from sflib import SpiderFoot
+
+
+def syntheticTlds(rand: random.Random, count: int) -> list:
+    """Create a synthetic TLD list, with some wildcard and exception rules.
+
+    Args:
+        rand (random.Random): random number generator
+        count (int): number of rules
+
+    Returns:
+        list: lines of the TLD list
+    """
+    lines = ["// ===BEGIN ICANN DOMAINS===", "", "com", "net", "org", "co.uk"]
+    for i in range(count):
+        rule = f"tld{i}"
+        if rand.random() < 0.3:
+            rule = f"{rand.choice(['gov', 'edu', 'ac', 'city'])}.{rule}"
+        if rand.random() < 0.01:
+            lines.append(f"*.{rule}")
+            lines.append(f"!www.{rule}")
+        else:
+            lines.append(rule)
+    lines += ["", "// ===END ICANN DOMAINS==="]
+    return lines
+
+
+def syntheticHosts(rand: random.Random, count: int, tlds: int) -> list:
+    """Create synthetic host names, some of them not under a known TLD.
+
+    Args:
+        rand (random.Random): random number generator
+        count (int): number of host names
+        tlds (int): number of rules in the TLD list
+
+    Returns:
+        list: host names
+    """
+    hosts = list()
+    for i in range(count):
+        tld = rand.choice(["com", "net", "co.uk", f"tld{rand.randrange(tlds)}", "invalid"])
+        hosts.append(rand.choice([f"example{i}.{tld}", f"www.example{i}.{tld}", f"mail.dev.example{i}.{tld}"]))
+    return hosts
+
+
+def parseEveryCall(hosts: list, tldList: list) -> None:
+    """Look host names up the way the helpers did before the list was shared.
+
+    Args:
+        hosts (list): host names
+        tldList (list): lines of the TLD list
+    """
+    for host in hosts:
+        PublicSuffixList(tldList, only_icann=True).privatesuffix(host)
+        PublicSuffixList(tldList, only_icann=True, accept_unknown=False).privatesuffix(host)
+        PublicSuffixList(tldList, only_icann=True, accept_unknown=False).privatesuffix(host)
+
+
+def sharedList(hosts: list, tldList: list) -> None:
+    """Look host names up with the helpers.
+
+    Args:
+        hosts (list): host names
+        tldList (list): lines of the TLD list
+    """
+    sf = SpiderFoot(dict())
+    for host in hosts:
+        sf.hostDomain(host, tldList)
+        sf.isDomain(host, tldList)
+        sf.validHost(host, tldList)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark looking host names up in the Internet TLD list.")
+    p.add_argument("--calls", type=int, default=20000, help="Number of host names to look up with each helper.")
+    p.add_argument("--tlds", type=int, default=10000, help="Number of rules in the synthetic TLD list.")
+    p.add_argument("--parsed-calls", type=int, default=20, help="Number of host names to look up parsing the list every call.")
+    args = p.parse_args()
+
+    rand = random.Random(1)  # noqa: DUO102
+    tldList = syntheticTlds(rand, args.tlds)
+    hosts = syntheticHosts(rand, args.calls, args.tlds)
+
+    print(f"TLD list: {len(tldList):,} lines")
+    for label, func, count in [
+        ("parsed every call", parseEveryCall, args.parsed_calls),
+        ("shared (first use)", sharedList, 1),
+        ("shared", sharedList, args.calls),
+    ]:
+        start = time.perf_counter()
+        func(hosts[:count], tldList)
+        elapsed = time.perf_counter() - start
+        perCall = elapsed / (count * 3) * 1e6
+        print(f"{label:20s}  {count * 3:7,} calls  {elapsed:8.3f}s  {perCall:10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
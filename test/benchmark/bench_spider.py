@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Name:         bench_spider
+# Purpose:      Benchmark crawling a site with sfp_spider.
+#
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""Benchmark crawling a site with sfp_spider.
+
+Generates a static site of linked pages, serves it from a local HTTP server
+which waits a while before each response, as a remote site would, and
+crawls it with sfp_spider fetching each number of pages at once from the
+site; 1 fetches one page at a time, as sfp_spider used to. Then crawls it
+again with the pages cached by the first crawl, so the server answers
+304 Not Modified for unchanged pages, and reports pages per second and the
+responses of the server for each crawl.
+
+Usage:
+    python3 -m test.benchmark.bench_spider [--pages 300] [--latency 0.02] [--concurrency 1,4,8]
+"""
+
+import argparse
+import collections
+import functools
+import os
+import queue
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from sflib import SpiderFoot
+from spiderfoot import SpiderFootEvent, SpiderFootTarget
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    """Serves the site after a delay, counting the response codes sent."""
+
+    latency = 0
+    codes = collections.Counter()
+
+    def send_response(self, code, message=None) -> None:
+        SlowHandler.codes[int(code)] += 1
+        super().send_response(code, message)
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def do_HEAD(self) -> None:
+        time.sleep(self.latency)
+        super().do_HEAD()
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        pass
+
+
+def writeSite(root: str, base: str, pages: int, fanout: int) -> None:
+    """Write a static site of pages each linking to fanout pages below it,
+    to the site's index and to an image.
+
+    Links are absolute, as SpiderFoot drops the port of the site from
+    relative links.
+
+    Args:
+        root (str): directory to write the site to
+        base (str): URL of the site
+        pages (int): number of pages
+        fanout (int): number of pages linked from each page
+    """
+    for i in range(pages):
+        children = [c for c in range(i * fanout + 1, i * fanout + fanout + 1) if c < pages]
+        links = "".join(f'<li><a href="{base}/page{c}.html">Page {c}</a></li>' for c in children)
+        with open(os.path.join(root, f"page{i}.html"), "w") as f:
+            f.write(
+                f'<!DOCTYPE html><html><head><title>Page {i}</title><link rel="stylesheet" href="{base}/style.css"></head>'
+                f'<body><a href="{base}/page0.html">Home</a><a href="{base}/index.html#top">Top</a><img src="{base}/logo.png">'
+                f'<a href="mailto:info@localhost">Mail</a><ul>{links}</ul>'
+                f'<p>{"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 50}</p></body></html>'
+            )
+    os.link(os.path.join(root, "page0.html"), os.path.join(root, "index.html"))
+    with open(os.path.join(root, "style.css"), "w") as f:
+        f.write("body { font-family: sans-serif; }")
+
+
+def crawl(url: str, opts: dict, concurrency: int) -> tuple:
+    """Crawl a site with sfp_spider.
+
+    Args:
+        url (str): URL to start from
+        opts (dict): options
+        concurrency (int): number of pages to fetch at once from the site
+
+    Returns:
+        tuple: seconds taken and number of pages fetched
+    """
+    from modules.sfp_spider import sfp_spider
+
+    module = sfp_spider()
+    module.__name__ = "sfp_spider"
+    module.setup(SpiderFoot(opts), dict(opts, hostconcurrency=concurrency))
+    module.setTarget(SpiderFootTarget("localhost", "INTERNET_NAME"))
+    module.incomingEventQueue = queue.Queue()
+    module.outgoingEventQueue = queue.Queue()
+
+    root = SpiderFootEvent("ROOT", "localhost", "", None)
+    evt = SpiderFootEvent("LINKED_URL_INTERNAL", url, "sfp_example", root)
+
+    start = time.perf_counter()
+    module.handleEvent(evt)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(module.fetchedPages)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark crawling a site with sfp_spider.")
+    p.add_argument("--pages", type=int, default=300, help="Number of pages in the site, and to crawl.")
+    p.add_argument("--fanout", type=int, default=8, help="Number of pages linked from each page.")
+    p.add_argument("--latency", type=float, default=0.02, help="Seconds the server waits before each response.")
+    p.add_argument("--concurrency", type=str, default="1,4,8", help="Numbers of pages to fetch at once, comma-separated.")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        site = os.path.join(tmp, "site")
+        os.mkdir(site)
+
+        SlowHandler.latency = args.latency
+        server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(SlowHandler, directory=site))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://localhost:{server.server_address[1]}"
+        writeSite(site, base, args.pages, args.fanout)
+
+        opts = {
+            '_debug': False,
+            '__logging': False,
+            '_useragent': "SpiderFoot",
+            '_fetchtimeout': 5,
+            '_socks1type': '',
+            '_internettlds': "// ===BEGIN ICANN DOMAINS===\n\ncom\n\n// // ===END ICANN DOMAINS===\n".splitlines(),
+            '__database': os.path.join(tmp, "spiderfoot.db"),
+            'maxpages': args.pages,
+            'maxlevels': 10,
+        }
+
+        print(f"site: {args.pages:,} pages  latency: {args.latency * 1000:.0f}ms")
+        runs = [(f"{n} at once", int(n), False) for n in args.concurrency.split(",")]
+        runs.append((f"{runs[-1][1]} at once, cached", runs[-1][1], True))
+        for label, concurrency, cached in runs:
+            # keep the pages cached by crawls out of the user's cache
+            if not cached:
+                os.environ['SPIDERFOOT_CACHE'] = os.path.join(tmp, f"cache{concurrency}")
+            SlowHandler.codes.clear()
+            elapsed, pages = crawl(base + "/index.html", opts, concurrency)
+            codes = ", ".join(f"{count:,} x {code}" for code, count in sorted(SlowHandler.codes.items()))
+            print(f"{label:20s}  {elapsed:7.2f}s  {pages / elapsed:7.1f} pages/s  {pages:,} pages  ({codes})")
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import pytest
 import unittest
+import uuid
+from unittest import mock
 
 from modules.sfp__stor_db import sfp__stor_db
 from sflib import SpiderFoot
+from spiderfoot import SpiderFootDb, SpiderFootEvent
 
 
 @pytest.mark.usefixtures
@@ -25,3 +28,79 @@ class TestModuleStor_db(unittest.TestCase):
     def test_producedEvents_should_return_list(self):
         module = sfp__stor_db()
         self.assertIsInstance(module.producedEvents(), list)
+
+    def test_handleEvent_should_store_events_in_batches(self):
+        sf = SpiderFoot(self.default_options)
+        sfdb = SpiderFootDb(self.default_options, False)
+        instance_id = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(instance_id, "example scan name", "example scan target")
+
+        module = sfp__stor_db()
+        module.setup(sf, {'maxbatchsize': 3, 'maxbatchdelay': 60})
+        module.setDbh(sfdb)
+        module.setScanId(instance_id)
+
+        root_event = SpiderFootEvent('ROOT', 'example data', '', None)
+        module.handleEvent(root_event)
+        for i in range(3):
+            module.handleEvent(SpiderFootEvent('IP_ADDRESS', f'127.0.0.{i}', 'example module', root_event))
+
+        self.assertEqual(len(sfdb.scanResultEvent(instance_id, 'IP_ADDRESS')), 2)
+
+        module.finish()
+        self.assertEqual(len(sfdb.scanResultEvent(instance_id, 'IP_ADDRESS')), 3)
+        self.assertEqual(module.stats['rows'], 4)
+        self.assertEqual(module.stats['batches'], 2)
+
+        sfdb.scanInstanceDelete(instance_id)
+
+    def test_storeBatch_invalid_event_should_store_other_events(self):
+        sf = SpiderFoot(self.default_options)
+        sfdb = SpiderFootDb(self.default_options, False)
+        instance_id = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(instance_id, "example scan name", "example scan target")
+
+        module = sfp__stor_db()
+        module.setup(sf, {'maxbatchsize': 100, 'maxbatchdelay': 60})
+        module.setDbh(sfdb)
+        module.setScanId(instance_id)
+
+        root_event = SpiderFootEvent('ROOT', 'example data', '', None)
+        module.handleEvent(root_event)
+        for i in range(3):
+            module.handleEvent(SpiderFootEvent('IP_ADDRESS', f'127.0.0.{i}', 'example module', root_event))
+        module.batch[2]._confidence = 101
+
+        module.storeBatch()
+
+        self.assertEqual(module.batch, [])
+        self.assertEqual(sorted(row[1] for row in sfdb.scanResultEvent(instance_id, 'IP_ADDRESS')), ['127.0.0.0', '127.0.0.2'])
+        self.assertEqual(module.stats['rows'], 3)
+
+        sfdb.scanInstanceDelete(instance_id)
+
+    def test_storeBatch_failed_write_should_keep_events(self):
+        sf = SpiderFoot(self.default_options)
+        sfdb = SpiderFootDb(self.default_options, False)
+        instance_id = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(instance_id, "example scan name", "example scan target")
+
+        module = sfp__stor_db()
+        module.setup(sf, {'maxbatchsize': 100, 'maxbatchdelay': 60})
+        module.setDbh(sfdb)
+        module.setScanId(instance_id)
+
+        root_event = SpiderFootEvent('ROOT', 'example data', '', None)
+        module.handleEvent(root_event)
+        module.handleEvent(SpiderFootEvent('IP_ADDRESS', '127.0.0.1', 'example module', root_event))
+
+        with mock.patch.object(sfdb, 'scanEventStoreBatch', side_effect=IOError("database is locked")):
+            with self.assertRaises(IOError):
+                module.storeBatch()
+        self.assertEqual(len(module.batch), 2)
+
+        module.storeBatch()
+        self.assertEqual(module.batch, [])
+        self.assertEqual(len(sfdb.scanResultEvent(instance_id, 'IP_ADDRESS')), 1)
+
+        sfdb.scanInstanceDelete(instance_id)
@@ -1,8 +1,10 @@
 import pytest
+import socket
 import unittest
 
 from modules.sfp_portscan_tcp import sfp_portscan_tcp
 from sflib import SpiderFoot
+from spiderfoot import SpiderFootEvent, SpiderFootTarget
 
 
 @pytest.mark.usefixtures
@@ -24,3 +26,51 @@ class TestModulePortscanTcp(unittest.TestCase):
     def test_producedEvents_should_return_list(self):
         module = sfp_portscan_tcp()
         self.assertIsInstance(module.producedEvents(), list)
+
+    def test_handleEvent_event_data_ip_address_with_open_port_should_return_event(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+        port = server.getsockname()[1]
+
+        sf = SpiderFoot(self.default_options)
+        self.addCleanup(sf.portScanner.close)
+
+        module = sfp_portscan_tcp()
+        module.setup(sf, {'ports': [str(port)], 'timeout': 1})
+
+        target_value = '127.0.0.1'
+        target_type = 'IP_ADDRESS'
+        target = SpiderFootTarget(target_value, target_type)
+        module.setTarget(target)
+
+        def new_notifyListeners(self, event):
+            expected = 'TCP_PORT_OPEN'
+            if str(event.eventType) != expected:
+                raise Exception(f"{event.eventType} != {expected}")
+
+            expected = f"127.0.0.1:{port}"
+            if str(event.data) != expected:
+                raise Exception(f"{event.data} != {expected}")
+
+            raise Exception("OK")
+
+        module.notifyListeners = new_notifyListeners.__get__(module, sfp_portscan_tcp)
+
+        event_type = 'ROOT'
+        event_data = 'example data'
+        event_module = ''
+        source_event = ''
+        evt = SpiderFootEvent(event_type, event_data, event_module, source_event)
+
+        event_type = 'IP_ADDRESS'
+        event_data = '127.0.0.1'
+        event_module = 'example module'
+        source_event = evt
+        evt = SpiderFootEvent(event_type, event_data, event_module, source_event)
+
+        with self.assertRaises(Exception) as cm:
+            module.handleEvent(evt)
+
+        self.assertEqual("OK", str(cm.exception))
@@ -1,5 +1,6 @@
 import pytest
 import unittest
+from unittest import mock
 
 from modules.sfp_spider import sfp_spider
 from sflib import SpiderFoot
@@ -24,3 +25,19 @@ class TestModuleSpider(unittest.TestCase):
     def test_producedEvents_should_return_list(self):
         module = sfp_spider()
         self.assertIsInstance(module.producedEvents(), list)
+
+    def test_fetchPage_should_only_cache_pages_within_cachemaxsize(self):
+        sf = SpiderFoot(self.default_options)
+        module = sfp_spider()
+        module.opts = dict(module.opts, _fetchtimeout=5, _useragent="SpiderFoot")
+        module.setup(sf, dict(cachepages=True, cachemaxsize=10))
+
+        for content, cached in [("small page", True), ("a larger page", False)]:
+            with self.subTest(content=content):
+                fetched = {'code': "200", 'status': "OK", 'content': content, 'headers': {'etag': '"1"'}, 'realurl': "https://spiderfoot.net/"}
+                with mock.patch.object(sf, 'fetchUrl', return_value=fetched), \
+                        mock.patch.object(sf, 'cacheGet', return_value=None) as cacheGet, \
+                        mock.patch.object(sf, 'cachePut') as cachePut:
+                    self.assertEqual(module.fetchPage("https://spiderfoot.net/"), fetched)
+                cacheGet.assert_called_once_with(module.cacheLabel("https://spiderfoot.net/"), module.opts['cacheage'])
+                self.assertEqual(cachePut.called, cached)
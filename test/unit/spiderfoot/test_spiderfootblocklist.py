@@ -0,0 +1,69 @@
+# test_spiderfootblocklist.py
+import unittest
+
+from spiderfoot import SpiderFootBlocklist
+
+
+class TestSpiderFootBlocklist(unittest.TestCase):
+    """
+    Test SpiderFootBlocklist
+    """
+
+    def setUp(self):
+        SpiderFootBlocklist.parsed.clear()
+
+    def test_contains_should_match_listed_host_names(self):
+        blocklist = SpiderFootBlocklist(["Example.com", "", "123.example.net"])
+        self.assertIn("example.com", blocklist)
+        self.assertIn("EXAMPLE.COM", blocklist)
+        self.assertIn("123.example.net", blocklist)
+        self.assertNotIn("sub.example.com", blocklist)
+        self.assertNotIn("", blocklist)
+        self.assertNotIn(None, blocklist)
+        self.assertEqual(len(blocklist), 2)
+
+    def test_contains_should_match_ip_addresses_within_listed_networks(self):
+        blocklist = SpiderFootBlocklist(["1.1.1.1", "10.0.0.0/24", "10.0.1.0/24", "2001:db8::/32"])
+        self.assertIn("1.1.1.1", blocklist)
+        self.assertNotIn("1.1.1.2", blocklist)
+        self.assertIn("10.0.0.0", blocklist)
+        self.assertIn("10.0.1.255", blocklist)
+        self.assertNotIn("10.0.2.0", blocklist)
+        self.assertIn("2001:DB8::1", blocklist)
+        self.assertNotIn("2001:db9::1", blocklist)
+        self.assertNotIn("0.0.0.1", blocklist)
+        self.assertEqual(len(blocklist), 4)
+
+    def test_matchNetwork_should_return_listed_ip_address_within_network(self):
+        blocklist = SpiderFootBlocklist(["1.1.1.1", "1.1.1.7", "10.0.0.0/16", "2001:db8::5"])
+        self.assertEqual(blocklist.matchNetwork("1.1.1.0/24"), "1.1.1.1")
+        self.assertEqual(blocklist.matchNetwork("1.1.1.4/30"), "1.1.1.7")
+        self.assertIsNone(blocklist.matchNetwork("1.1.1.8/29"))
+        self.assertEqual(blocklist.matchNetwork("10.0.5.0/24"), "10.0.5.0")
+        self.assertEqual(blocklist.matchNetwork("0.0.0.0/0"), "1.1.1.1")
+        self.assertEqual(blocklist.matchNetwork("2001:db8::/64"), "2001:db8::5")
+        self.assertIsNone(blocklist.matchNetwork("::/96"))
+        self.assertIsNone(blocklist.matchNetwork("invalid netblock"))
+
+    def test_fromData_should_parse_data_once(self):
+        calls = list()
+
+        def parse(data):
+            calls.append(data)
+            return data.split('\n')
+
+        data = "example.com\n1.1.1.1"
+        blocklist = SpiderFootBlocklist.fromData("label", data, parse)
+        self.assertIn("1.1.1.1", blocklist)
+        self.assertIs(SpiderFootBlocklist.fromData("label", data, parse), blocklist)
+        self.assertIs(SpiderFootBlocklist.fromData("label", "example.com\n1.1.1." + "1", parse), blocklist)
+        self.assertEqual(len(calls), 1)
+
+        updated = SpiderFootBlocklist.fromData("label", "example.org", parse)
+        self.assertIn("example.org", updated)
+        self.assertNotIn("example.com", updated)
+        self.assertEqual(len(calls), 2)
+
+    def test_fromData_should_return_none_if_data_cannot_be_parsed(self):
+        self.assertIsNone(SpiderFootBlocklist.fromData("label", "data", lambda data: None))
+        self.assertNotIn("label", SpiderFootBlocklist.parsed)
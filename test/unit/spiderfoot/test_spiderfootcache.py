@@ -0,0 +1,127 @@
+# test_spiderfootcache.py
+import os
+import tempfile
+import time
+import unittest
+
+from spiderfoot import SpiderFootCache
+
+
+class TestSpiderFootCache(unittest.TestCase):
+    """
+    Test SpiderFootCache
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = f"{tmp.name}/cache.db"
+
+    def test_get_should_return_cached_data(self):
+        cache = SpiderFootCache(self.path)
+        self.assertIsNone(cache.get("label"))
+
+        cache.put("label", "data")
+        self.assertEqual(cache.get("label"), "data")
+        self.assertEqual(cache.get("label", 3600), "data")
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['memoryHits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['sizeWritten'], 4)
+
+    def test_get_should_read_data_cached_by_another_cache(self):
+        SpiderFootCache(self.path).put("label", "data")
+
+        cache = SpiderFootCache(self.path)
+        self.assertEqual(cache.get("label"), "data")
+        self.assertEqual(cache.get("label"), "data")
+        self.assertEqual(cache.stats()['diskHits'], 1)
+        self.assertEqual(cache.stats()['memoryHits'], 1)
+
+    def test_get_argument_maxAge_should_ignore_older_data(self):
+        SpiderFootCache(self.path).put("label", "data")
+        time.sleep(0.1)
+
+        for cache in [SpiderFootCache(self.path), SpiderFootCache(self.path)]:
+            cache.get("label")
+            self.assertIsNone(cache.get("label", 0.05))
+            self.assertEqual(cache.get("label", 60), "data")
+
+    def test_put_should_evict_least_recently_used_data_from_memory(self):
+        cache = SpiderFootCache(self.path, memorySize=10)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+        cache.put("d", "d" * 20)
+
+        self.assertEqual(list(cache.memory.keys()), [cache.key("a"), cache.key("c")])
+        self.assertEqual(cache.memoryUsed, 8)
+        self.assertEqual(cache.get("b"), "bbbb")
+        self.assertEqual(cache.get("d"), "d" * 20)
+
+    def test_put_should_evict_least_recently_used_data_from_disk(self):
+        cache = SpiderFootCache(self.path, memorySize=0, maxSize=10)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+
+        self.assertEqual(cache.get("a"), "aaaa")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "cccc")
+        self.assertEqual(cache.stats()['size'], 8)
+        self.assertEqual(cache.stats()['evicted'], 1)
+
+    def test_put_should_count_the_size_of_data_on_disk(self):
+        cache = SpiderFootCache(self.path, memorySize=0, maxSize=10)
+        cache.put("a", "aaaa")
+        cache.put("a", "aaaaaaaa")
+        cache.put("b", "bb")
+
+        self.assertEqual(cache.size, 10)
+        self.assertEqual(cache.stats()['evicted'], 0)
+        self.assertEqual(SpiderFootCache(self.path).size, cache.stats()['size'])
+
+        cache.put("c", "cc")
+        self.assertEqual(cache.size, 4)
+        self.assertEqual(cache.size, cache.stats()['size'])
+
+        cache.purge()
+        self.assertEqual(cache.size, 0)
+
+    def test_stats_argument_allProcesses_should_count_saved_stats(self):
+        for _ in range(2):
+            cache = SpiderFootCache(self.path)
+            cache.put("label", "data")
+            cache.get("label")
+            cache.get("other label")
+            cache.saveStats()
+            cache.saveStats()
+
+        cache = SpiderFootCache(self.path)
+        cache.get("label")
+        stats = cache.stats(allProcesses=True)
+        self.assertEqual(stats['memoryHits'], 2)
+        self.assertEqual(stats['diskHits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['sizeWritten'], 8)
+        self.assertEqual(cache.stats()['diskHits'], 1)
+        self.assertEqual(cache.stats()['memoryHits'], 0)
+
+    def test_purge_should_remove_all_cached_data(self):
+        cache = SpiderFootCache(self.path)
+        cache.put("a", "aaaa")
+        oldCacheFile = f"{os.path.dirname(self.path)}/{cache.key('b')}"
+        with open(oldCacheFile, "w") as f:
+            f.write("bbbb")
+
+        self.assertEqual(cache.purge(), 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertFalse(os.path.exists(oldCacheFile))
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_shared_should_return_the_same_cache(self):
+        self.assertIs(SpiderFootCache.shared(), SpiderFootCache.shared())
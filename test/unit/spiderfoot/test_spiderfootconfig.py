@@ -0,0 +1,51 @@
+# test_spiderfootconfig.py
+import pickle
+import unittest
+
+from spiderfoot import SpiderFootConfig
+
+
+class TestSpiderFootConfig(unittest.TestCase):
+    """
+    Test SpiderFootConfig
+    """
+
+    def test_freeze_should_return_read_only_options(self):
+        opts = {'_useragent': "SpiderFoot", '_internettlds': ["com", "net"]}
+        frozen = SpiderFootConfig.freeze(opts)
+
+        self.assertEqual(frozen['_internettlds'], ("com", "net"))
+        with self.assertRaises(TypeError):
+            frozen['_useragent'] = "changed"
+
+        opts['_useragent'] = "changed"
+        self.assertEqual(frozen['_useragent'], "SpiderFoot")
+
+    def test_global_options_should_override_module_options(self):
+        globalOpts = SpiderFootConfig.freeze({'_useragent': "SpiderFoot", '_fetchtimeout': 5})
+        config = SpiderFootConfig(globalOpts, {'api_key': "key", '_fetchtimeout': 30})
+
+        self.assertEqual(config['_fetchtimeout'], 5)
+        self.assertEqual(config['api_key'], "key")
+        self.assertEqual(sorted(config), ['_fetchtimeout', '_useragent', 'api_key'])
+        self.assertEqual(len(config), 3)
+        self.assertIn('api_key', config)
+        self.assertNotIn('missing', config)
+        with self.assertRaises(KeyError):
+            config['missing']
+
+    def test_modules_should_share_global_options(self):
+        tlds = ["com", "net"]
+        globalOpts = SpiderFootConfig.freeze({'_internettlds': tlds})
+        first = SpiderFootConfig(globalOpts, {'opt': 1})
+        second = SpiderFootConfig(globalOpts, {'opt': 2})
+
+        self.assertIs(first['_internettlds'], second['_internettlds'])
+
+        moduleOpts = {'opt': 1}
+        moduleOpts.update(first)
+        self.assertEqual(moduleOpts, {'opt': 1, '_internettlds': ("com", "net")})
+
+    def test_pickle_should_return_dict_of_options(self):
+        config = SpiderFootConfig(SpiderFootConfig.freeze({'_debug': False}), {'opt': 1})
+        self.assertEqual(pickle.loads(pickle.dumps(config)), {'_debug': False, 'opt': 1})
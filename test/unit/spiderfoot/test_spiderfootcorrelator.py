@@ -1,7 +1,9 @@
 # test_spiderfootcorrelator.py
+import os
 import unittest
+import uuid
 
-from spiderfoot import SpiderFootCorrelator, SpiderFootDb
+from spiderfoot import SpiderFootCorrelator, SpiderFootDb, SpiderFootEvent, SpiderFootHelpers
 
 
 class TestSpiderFootCorrelator(unittest.TestCase):
@@ -37,6 +39,84 @@ class TestSpiderFootCorrelator(unittest.TestCase):
         with self.assertRaises(ValueError):
             correlator.run_correlations()
 
+    def storeExampleScan(self, sfdb: SpiderFootDb) -> str:
+        scanId = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(scanId, "example scan name", "example.com")
+
+        root = SpiderFootEvent("ROOT", "example.com", "", None)
+        target = SpiderFootEvent("INTERNET_NAME", "example.com", "SpiderFoot UI", root)
+        events = [root, target]
+        for i in range(20):
+            host = SpiderFootEvent("INTERNET_NAME", f"host{i}.example.com", "sfp_dnsbrute", target)
+            ip = SpiderFootEvent("IP_ADDRESS", f"192.0.2.{i}", "sfp_dnsresolve", host)
+            events.extend([host, ip, SpiderFootEvent("TCP_PORT_OPEN", f"192.0.2.{i}:3389", "sfp_portscan_tcp", ip)])
+            if i % 2:
+                events.append(SpiderFootEvent("MALICIOUS_INTERNET_NAME", f"host{i}.example.com", "sfp_alienvault", host))
+                events.append(SpiderFootEvent("MALICIOUS_INTERNET_NAME", f"host{i}.example.com", "sfp_abusech", host))
+            if i % 3:
+                events.append(SpiderFootEvent("VULNERABILITY_CVE_CRITICAL", f"CVE-2021-{i}", "sfp_shodan", ip))
+        sfdb.scanEventStoreBatch(scanId, events)
+        sfdb.scanInstanceSet(scanId, status="FINISHED")
+        return scanId
+
+    def test_process_rules_with_workers_should_match_sequential_results(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        scanId = self.storeExampleScan(sfdb)
+        correlations_dir = os.path.dirname(os.path.abspath(__file__)) + '/../../../correlations/'
+        ruleset = SpiderFootHelpers.loadCorrelationRulesRaw(correlations_dir, ['template.yaml'])
+        correlator = SpiderFootCorrelator(sfdb, ruleset, scanId)
+
+        expected = {rule['id']: results for rule, results in correlator.process_rules(1)}
+        self.assertTrue(any(expected.values()))
+
+        results = {rule['id']: results for rule, results in correlator.process_rules(4)}
+        self.assertEqual(results, expected)
+
+    def test_process_rules_with_snapshot_should_match_database_results(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        scanId = self.storeExampleScan(sfdb)
+        correlations_dir = os.path.dirname(os.path.abspath(__file__)) + '/../../../correlations/'
+        ruleset = SpiderFootHelpers.loadCorrelationRulesRaw(correlations_dir, ['template.yaml'])
+        correlator = SpiderFootCorrelator(sfdb, ruleset, scanId)
+
+        expected = {rule['id']: results for rule, results in correlator.process_rules(1, snapshot=False)}
+        self.assertIsNone(correlator.snapshot)
+        self.assertTrue(any(expected.values()))
+
+        for workers in [1, 4]:
+            with self.subTest(workers=workers):
+                results = {rule['id']: results for rule, results in correlator.process_rules(workers)}
+                self.assertIsNotNone(correlator.snapshot)
+                self.assertEqual(results, expected)
+
+    def test_event_keep_should_keep_events_matching_last_pattern(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        correlator = SpiderFootCorrelator(sfdb, {})
+        event = {'type': "INTERNET_NAME", 'data': "www.example.com", 'source': [{'data': "example.com"}]}
+
+        self.assertTrue(correlator.event_keep(event, 'type', ["INTERNET_NAME"], 'exact'))
+        self.assertFalse(correlator.event_keep(event, 'type', ["not INTERNET_NAME"], 'exact'))
+        self.assertTrue(correlator.event_keep(event, 'type', ["not IP_ADDRESS", "not  AFFILIATE_INTERNET_NAME"], 'exact'))
+        self.assertTrue(correlator.event_keep(event, 'data', ["^WWW\\."], 'regex'))
+        self.assertFalse(correlator.event_keep(event, 'data', ["not www", "example"], 'regex'))
+        self.assertFalse(correlator.event_keep(event, 'data', ["example\\.net", "not \\.org$", "example\\.net"], 'regex'))
+        self.assertTrue(correlator.event_keep(event, 'source.data', ["^example"], 'regex'))
+        self.assertFalse(correlator.event_keep(event, 'data', ["www.example.com"], 'unknown'))
+
+    def test_run_correlations_with_workers_should_store_correlations(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        correlations_dir = os.path.dirname(os.path.abspath(__file__)) + '/../../../correlations/'
+        ruleset = SpiderFootHelpers.loadCorrelationRulesRaw(correlations_dir, ['template.yaml'])
+
+        titles = list()
+        for workers in [1, 4]:
+            scanId = self.storeExampleScan(sfdb)
+            SpiderFootCorrelator(sfdb, ruleset, scanId).run_correlations(workers)
+            titles.append(sorted(row[1] for row in sfdb.scanCorrelationList(scanId)))
+
+        self.assertTrue(titles[0])
+        self.assertEqual(titles[1], titles[0])
+
     def test_build_db_criteria_argument_matchrule_invalid_type_should_raise_TypeError(self):
         sfdb = SpiderFootDb(self.default_options, False)
         correlator = SpiderFootCorrelator(sfdb, {})
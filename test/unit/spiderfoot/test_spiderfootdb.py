@@ -1,6 +1,8 @@
 # test_spiderfootdb.py
 import pytest
 import unittest
+import uuid
+from unittest import mock
 
 from spiderfoot import SpiderFootDb, SpiderFootEvent
 
@@ -44,6 +46,116 @@ class TestSpiderFootDb(unittest.TestCase):
         sfdb = SpiderFootDb(self.default_options, False)
         self.assertIsInstance(sfdb, SpiderFootDb)
 
+    def test_init_should_share_one_connection_per_database(self):
+        """
+        Test __init__(self, opts, init=False)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+        sfdb2 = SpiderFootDb(self.default_options, False)
+        self.assertIs(sfdb.conn, sfdb2.conn)
+        self.assertIsNot(sfdb.dbh, sfdb2.dbh)
+
+        sfdb.close()
+        self.assertIsInstance(sfdb2.eventTypes(), list)
+
+    def test_init_readonly_should_open_a_read_only_connection_of_its_own(self):
+        """
+        Test __init__(self, opts, init=False, readonly=True)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+        sfdb_ro = SpiderFootDb(self.default_options, readonly=True)
+        self.assertIsNot(sfdb.conn, sfdb_ro.conn)
+        self.assertIsNot(sfdb.dbhLock, sfdb_ro.dbhLock)
+        self.assertEqual(sfdb_ro.path, self.default_options['__database'])
+        self.assertIsInstance(sfdb_ro.eventTypes(), list)
+
+        with self.assertRaises(IOError):
+            sfdb_ro.scanInstanceCreate(str(uuid.uuid4()), "example scan name", "example scan target")
+
+        sfdb_ro.close()
+        self.assertIsInstance(sfdb.eventTypes(), list)
+
+    def test_init_should_apply_connection_pragmas(self):
+        """
+        Test __init__(self, opts, init=False)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+        pragmas = {
+            'synchronous': 1,  # NORMAL
+            'temp_store': 2,  # MEMORY
+            'busy_timeout': 30000,
+        }
+        for pragma, value in pragmas.items():
+            with self.subTest(pragma=pragma):
+                self.assertEqual(sfdb.dbh.execute(f"PRAGMA {pragma}").fetchone()[0], value)
+
+    def test_scan_result_queries_should_use_indexes(self):
+        """
+        Test the query plans of the scan result queries used by the web UI
+        and correlation rules.
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+        cursor = sfdb.dbh
+        sfdb.dbh = mock.MagicMock(wraps=cursor)
+
+        instance_id = "example instance id"
+        hashes = ["a" * 64, "b" * 64]
+        queries = {
+            'scanResultEvent': (
+                lambda: sfdb.scanResultEvent(instance_id, 'INTERNET_NAME'),
+                ['SEARCH c USING INDEX idx_scan_results_type_data (scan_instance_id=? AND type=?)'],
+            ),
+            'scanResultEvent srcModule': (
+                lambda: sfdb.scanResultEvent(instance_id, srcModule='example module'),
+                ['SEARCH c USING INDEX idx_scan_results_module_data (scan_instance_id=? AND module=?)'],
+            ),
+            'scanResultEvent sourceId': (
+                lambda: sfdb.scanResultEvent(instance_id, sourceId=hashes),
+                ['idx_scan_results_srchash (scan_instance_id=? AND source_event_hash=?)'],
+            ),
+            'scanResultSummary type': (
+                lambda: sfdb.scanResultSummary(instance_id, 'type'),
+                ['SEARCH r USING COVERING INDEX idx_scan_results_type_data (scan_instance_id=?)'],
+            ),
+            'scanResultSummary module': (
+                lambda: sfdb.scanResultSummary(instance_id, 'module'),
+                ['SEARCH r USING COVERING INDEX idx_scan_results_module_data (scan_instance_id=?)'],
+            ),
+            'scanResultEventUnique': (
+                lambda: sfdb.scanResultEventUnique(instance_id, 'INTERNET_NAME', True),
+                ['USING COVERING INDEX idx_scan_results_type_data (scan_instance_id=? AND type=?)'],
+            ),
+            'scanResultHistory': (
+                lambda: sfdb.scanResultHistory(instance_id),
+                ['USING COVERING INDEX'],
+            ),
+            'scanElementSourcesDirect': (
+                lambda: sfdb.scanElementSourcesDirect(instance_id, hashes),
+                ['SEARCH c USING INDEX idx_scan_results_hash (scan_instance_id=? AND hash=?)'],
+            ),
+            'scanElementChildrenDirect': (
+                lambda: sfdb.scanElementChildrenDirect(instance_id, hashes),
+                ['SEARCH c USING INDEX idx_scan_results_srchash (scan_instance_id=? AND source_event_hash=?)'],
+            ),
+        }
+
+        for name, (query, expected_plan) in queries.items():
+            with self.subTest(query=name):
+                query()
+                qry, qvars = sfdb.dbh.execute.call_args.args
+                plan = "\n".join(row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {qry}", qvars).fetchall())
+                for step in expected_plan:
+                    self.assertIn(step, plan)
+                self.assertNotIn("SCAN c", plan)
+                self.assertNotIn("SCAN r", plan)
+                self.assertNotIn("SCAN tbl_scan_results", plan)
+
+        # results for a single type come back in order from the index
+        sfdb.scanResultEvent(instance_id, 'INTERNET_NAME')
+        qry, qvars = sfdb.dbh.execute.call_args.args
+        plan = "\n".join(row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {qry}", qvars).fetchall())
+        self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan)
+
     @unittest.skip("todo")
     def test_create_should_create_database_schema(self):
         """
@@ -1052,6 +1164,38 @@ class TestSpiderFootDb(unittest.TestCase):
                     event.sourceEvent = invalid_type
                     sfdb.scanEventStore(instance_id, event)
 
+    def test_scanEventStoreBatch_should_store_scan_events(self):
+        """
+        Test scanEventStoreBatch(self, instanceId, batch, truncateSize=0)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+
+        instance_id = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(instance_id, "example scan name", "example scan target")
+
+        source_event = SpiderFootEvent('ROOT', 'example data', '', None)
+        events = [SpiderFootEvent('IP_ADDRESS', f'127.0.0.{i}', 'example module', source_event) for i in range(5)]
+        sfdb.scanEventStoreBatch(instance_id, [source_event] + events, 7)
+
+        results = sfdb.scanResultEvent(instance_id, 'IP_ADDRESS')
+        self.assertEqual(len(results), 5)
+        self.assertEqual({row[1] for row in results}, {'127.0.0'})
+
+        sfdb.scanInstanceDelete(instance_id)
+
+    def test_scanEventStoreBatch_argument_batch_of_invalid_type_should_raise_TypeError(self):
+        """
+        Test scanEventStoreBatch(self, instanceId, batch, truncateSize=0)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+
+        instance_id = "example instance id"
+        invalid_types = [None, "", dict(), int()]
+        for invalid_type in invalid_types:
+            with self.subTest(invalid_type=invalid_type):
+                with self.assertRaises(TypeError):
+                    sfdb.scanEventStoreBatch(instance_id, invalid_type)
+
     def test_scanInstanceList_should_return_a_list(self):
         """
         Test scanInstanceList(self)
@@ -1211,6 +1355,45 @@ class TestSpiderFootDb(unittest.TestCase):
         with self.assertRaises(ValueError):
             sfdb.scanElementSourcesAll(instance_id, child_data)
 
+    def test_scanElementSourcesAll_should_return_all_sources_of_the_child_events(self):
+        """
+        Test scanElementSourcesAll(self, instanceId, childData)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+
+        instance_id = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(instance_id, "example scan name", "example scan target")
+
+        root_event = SpiderFootEvent('ROOT', 'example.com', '', None)
+        target_event = SpiderFootEvent('INTERNET_NAME', 'example.com', 'SpiderFoot UI', root_event)
+        events = [root_event, target_event]
+        for i in range(30):
+            events.append(SpiderFootEvent('INTERNET_NAME', f'host{i}.example.com', 'example module', events[1 + i // 2]))
+        unrelated_event = SpiderFootEvent('IP_ADDRESS', '127.0.0.1', 'example module', target_event)
+        sfdb.scanEventStoreBatch(instance_id, events + [unrelated_event])
+
+        leaf_set = [row for row in sfdb.scanResultEvent(instance_id, 'INTERNET_NAME') if row[1] in ['host28.example.com', 'host29.example.com']]
+        self.assertEqual(len(leaf_set), 2)
+
+        datamap, pc = sfdb.scanElementSourcesAll(instance_id, leaf_set)
+
+        expected_pc = dict()
+        for leaf in [events[-2], events[-1]]:
+            evt = leaf
+            while evt.eventType != 'ROOT':
+                children = expected_pc.setdefault(evt.sourceEvent.hash, [])
+                if evt.hash not in children:
+                    children.append(evt.hash)
+                evt = evt.sourceEvent
+
+        self.assertEqual({k: sorted(v) for k, v in pc.items()}, {k: sorted(v) for k, v in expected_pc.items()})
+        self.assertEqual(set(datamap.keys()), {evt for children in expected_pc.values() for evt in children} | {'ROOT'})
+        self.assertNotIn(unrelated_event.hash, datamap)
+        for row in datamap.values():
+            self.assertIn(len(row), [15, 18])
+
+        sfdb.scanInstanceDelete(instance_id)
+
     def test_scanElementChildrenAll_should_return_a_list(self):
         """
         Test scanElementChildrenAll(self, instanceId, parentIds)
@@ -1223,6 +1406,39 @@ class TestSpiderFootDb(unittest.TestCase):
 
         self.assertEqual('TBD', 'TBD')
 
+    def test_scanElementChildrenAll_should_return_all_children_of_the_parent_events(self):
+        """
+        Test scanElementChildrenAll(self, instanceId, parentIds)
+        """
+        sfdb = SpiderFootDb(self.default_options, False)
+
+        instance_id = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(instance_id, "example scan name", "example scan target")
+
+        root_event = SpiderFootEvent('ROOT', 'example.com', '', None)
+        target_event = SpiderFootEvent('INTERNET_NAME', 'example.com', 'SpiderFoot UI', root_event)
+        events = [root_event, target_event]
+        for i in range(30):
+            events.append(SpiderFootEvent('INTERNET_NAME', f'host{i}.example.com', 'example module', events[1 + i // 2]))
+        sfdb.scanEventStoreBatch(instance_id, events)
+
+        # host0 and host1 are the children of the target; host2 and host3 of host0, ...
+        parent = events[2]
+        expected = set()
+        pending = [parent]
+        while pending:
+            evt = pending.pop()
+            for child in events[2:]:
+                if child.sourceEvent is evt:
+                    expected.add(child.hash)
+                    pending.append(child)
+
+        children = sfdb.scanElementChildrenAll(instance_id, [parent.hash])
+        self.assertEqual(len(children), len(expected))
+        self.assertEqual(set(children), expected)
+
+        sfdb.scanInstanceDelete(instance_id)
+
     def test_scanElementChildrenAll_argument_instanceId_of_invalid_type_should_raise_TypeError(self):
         """
         Test scanElementChildrenAll(self, instanceId, parentIds)
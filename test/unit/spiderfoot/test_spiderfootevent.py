@@ -361,3 +361,64 @@ class TestSpiderFootEvent(unittest.TestCase):
         evt_hash = evt.hash
 
         self.assertIsInstance(evt_hash, str)
+
+    def test_freeze_should_prevent_changes_to_event(self):
+        event_type = 'ROOT'
+        event_data = 'example event data'
+        module = 'example module'
+        source_event = SpiderFootEvent(event_type, event_data, module, "ROOT")
+
+        event_type = 'example non-root event type'
+        evt = SpiderFootEvent(event_type, event_data, module, source_event)
+        self.assertFalse(evt.frozen)
+        evt.risk = 50
+
+        evt.freeze()
+        self.assertTrue(evt.frozen)
+
+        attributes = {
+            'eventType': 'example event type',
+            'data': 'example changed data',
+            'module': 'example changed module',
+            'confidence': 10,
+            'visibility': 10,
+            'risk': 10,
+            'sourceEvent': source_event,
+            'actualSource': 'example actual source',
+            'moduleDataSource': 'example module data source',
+        }
+        for attribute, value in attributes.items():
+            with self.subTest(attribute=attribute):
+                with self.assertRaises(AttributeError):
+                    setattr(evt, attribute, value)
+
+        self.assertEqual(evt.data, event_data)
+        self.assertEqual(evt.risk, 50)
+
+    def test_hash_attribute_nonroot_event_should_not_change(self):
+        event_type = 'ROOT'
+        event_data = 'example event data'
+        module = 'example module'
+        source_event = SpiderFootEvent(event_type, event_data, module, "ROOT")
+
+        event_type = 'not ROOT'
+        evt = SpiderFootEvent(event_type, event_data, module, source_event)
+        evt2 = SpiderFootEvent(event_type, event_data, module, evt)
+
+        self.assertEqual(evt.hash, evt.hash)
+        self.assertEqual(len(evt.hash), 64)
+        self.assertNotEqual(evt.hash, evt2.hash)
+        self.assertEqual(evt2.sourceEventHash, evt.hash)
+
+    def test_ancestry_should_include_source_events(self):
+        source_event = SpiderFootEvent('ROOT', 'example event data', 'example module', None)
+        evt = SpiderFootEvent('INTERNET_NAME', 'www.example.com', 'example module', source_event)
+        evt2 = SpiderFootEvent('IP_ADDRESS', '127.0.0.1', 'example module', evt)
+        same = SpiderFootEvent('INTERNET_NAME', 'WWW.Example.com', 'example module', source_event)
+
+        self.assertIsInstance(evt.fingerprint, int)
+        self.assertEqual(evt.fingerprint, same.fingerprint)
+        self.assertNotEqual(evt.fingerprint, evt2.fingerprint)
+        for ancestor in [source_event, evt, evt2]:
+            self.assertEqual(evt2.ancestry & ancestor.fingerprint, ancestor.fingerprint)
+        self.assertEqual(source_event.ancestry, source_event.fingerprint)
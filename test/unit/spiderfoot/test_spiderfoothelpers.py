@@ -1,5 +1,8 @@
 # test_spiderfoot.py
+import json
+import os
 import pytest
+import tempfile
 import unittest
 
 from spiderfoot import SpiderFootHelpers
@@ -20,6 +23,48 @@ class TestSpiderFootHelpers(unittest.TestCase):
         log_path = SpiderFootHelpers.logPath()
         self.assertIsInstance(log_path, str)
 
+    def loadModules(self, manifest):
+        mod_dir = os.path.dirname(os.path.abspath(__file__)) + '/../../../modules/'
+        return SpiderFootHelpers.loadModulesAsDict(mod_dir, ['sfp_template.py'], manifest)
+
+    def updateManifest(self, manifest, modName, **entry):
+        with open(manifest) as f:
+            data = json.load(f)
+        data['modules'][modName].update(entry)
+        with open(manifest, 'w') as f:
+            json.dump(data, f)
+
+    def test_loadModulesAsDict_should_read_modules_from_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = f"{tmp}/modules.json"
+            modules = self.loadModules(manifest)
+            self.assertIn('sfp_email', modules)
+            self.assertNotIn('sfp_template', modules)
+            self.assertNotIn('object', modules['sfp_email'])
+            self.assertIn('EMAILADDR', modules['sfp_email']['provides'])
+
+            info = dict(modules['sfp_email'], name="From manifest")
+            self.updateManifest(manifest, 'sfp_email', info=info)
+            self.assertEqual(self.loadModules(manifest)['sfp_email']['name'], "From manifest")
+
+            # Modification time changed, but not the contents
+            self.updateManifest(manifest, 'sfp_email', mtime=0)
+            self.assertEqual(self.loadModules(manifest)['sfp_email']['name'], "From manifest")
+            with open(manifest) as f:
+                self.assertNotEqual(json.load(f)['modules']['sfp_email']['mtime'], 0)
+
+    def test_loadModulesAsDict_should_reload_changed_modules(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = f"{tmp}/modules.json"
+            name = self.loadModules(manifest)['sfp_email']['name']
+
+            self.updateManifest(manifest, 'sfp_email', mtime=0, sha256="0", info={'name': "Stale"})
+            self.assertEqual(self.loadModules(manifest)['sfp_email']['name'], name)
+
+            with open(manifest, 'w') as f:
+                f.write("not json")
+            self.assertEqual(self.loadModules(manifest)['sfp_email']['name'], name)
+
     def test_target_type(self):
         target_type = SpiderFootHelpers.targetTypeFromString("0.0.0.0")
         self.assertEqual('IP_ADDRESS', target_type)
@@ -177,6 +222,29 @@ class TestSpiderFootHelpers(unittest.TestCase):
             }
         )
 
+    def test_extractLinksFromHtml_argument_data_containing_each_link_tag_should_return_a_dict_of_urls(self):
+        url = 'http://spiderfoot.net/dir/'
+        parse_links = SpiderFootHelpers.extractLinksFromHtml(
+            url,
+            '<html><head><base href="http://spiderfoot.net/base/"><link href="/style.css"><script src="/app.js"></script></head>'
+            '<body><a href="a.html">a</a><a name="no-href"></a><img src="//spiderfoot.net/img.png"><map><area href="/area"></map>'
+            '<form action="/search"></form><script>var s = "<a href=\'/in-script\'>";</script></body></html>',
+            ['spiderfoot.net']
+        )
+
+        self.assertEqual(
+            list(parse_links),
+            [
+                'http://spiderfoot.net/dir/a.html',
+                'http://spiderfoot.net/img.png',
+                'http://spiderfoot.net/app.js',
+                'http://spiderfoot.net/style.css',
+                'http://spiderfoot.net/area',
+                'http://spiderfoot.net/base/',
+                'http://spiderfoot.net/search',
+            ]
+        )
+
     def test_extractLinksFromHtml_invalid_url_should_raise_TypeError(self):
         invalid_types = [None, bytes(), list(), dict()]
         for invalid_type in invalid_types:
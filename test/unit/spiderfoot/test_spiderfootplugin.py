@@ -1,5 +1,7 @@
 # test_spiderfootplugin.py
 import pytest
+import random
+import queue
 import unittest
 
 from sflib import SpiderFoot
@@ -369,3 +371,62 @@ class TestSpiderFootPlugin(unittest.TestCase):
         sfp.sf = sf
 
         sfp.start()
+
+    def test_processTask_should_report_task_done_after_callback(self):
+        """
+        Test _processTask(self, callback, *args)
+        """
+        sfp = SpiderFootPlugin()
+        sfp.__name__ = "example module"
+        sfp.outgoingEventQueue = queue.Queue()
+
+        def callback(x):
+            sfp.outgoingEventQueue.put(x)
+
+        def failing_callback():
+            raise ValueError("example error")
+
+        sfp._processTask(callback, "example event")
+        with self.assertRaises(ValueError):
+            sfp._processTask(failing_callback)
+
+        self.assertEqual(sfp.outgoingEventQueue.get_nowait(), "example event")
+        self.assertEqual(sfp.outgoingEventQueue.get_nowait(), "example module")
+        self.assertEqual(sfp.outgoingEventQueue.get_nowait(), "example module")
+
+    def test_storeOnly_should_match_walking_the_source_event_chain(self):
+        """
+        Test _storeOnly(self, sfEvent)
+        """
+        def walkSourceEvents(sfEvent):
+            prevEvent = sfEvent.sourceEvent
+            while prevEvent is not None:
+                if prevEvent.sourceEvent is not None and prevEvent.sourceEvent.eventType == sfEvent.eventType and prevEvent.sourceEvent.data.lower() == sfEvent.data.lower():
+                    return True
+                prevEvent = prevEvent.sourceEvent
+            return False
+
+        sfp = SpiderFootPlugin()
+
+        event_types = ['INTERNET_NAME', 'DOMAIN_NAME', 'IP_ADDRESS']
+        event_data = ['example.com', 'EXAMPLE.com', 'www.example.com', '127.0.0.1']
+        rand = random.Random(1)  # noqa: DUO102
+
+        root = SpiderFootEvent('ROOT', 'example.com', '', None)
+        events = [root]
+        store_only = 0
+        for i in range(5000):
+            source = events[max(0, len(events) - rand.randint(1, 50))]
+            evt = SpiderFootEvent(rand.choice(event_types), rand.choice(event_data), 'example module', source)
+            if i % 2:
+                evt.freeze()
+            with self.subTest(i=i):
+                self.assertEqual(sfp._storeOnly(evt), walkSourceEvents(evt))
+            store_only += walkSourceEvents(evt)
+            events.append(evt)
+
+        self.assertGreater(store_only, 0)
+        self.assertLess(store_only, 5000)
+
+        unique = SpiderFootEvent('INTERNET_NAME', 'unique.example.com', 'example module', events[-1])
+        self.assertFalse(sfp._storeOnly(unique))
@@ -0,0 +1,88 @@
+# test_spiderfootportscanner.py
+import socket
+import threading
+import time
+import unittest
+
+from spiderfoot import SpiderFootPortScanner
+
+
+class TestSpiderFootPortScanner(unittest.TestCase):
+    """
+    Test SpiderFootPortScanner
+    """
+
+    def listen(self, banner: bytes = None, ip: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen on a local port, sending a banner to each connection, or
+        keeping connections open without sending anything."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind((ip, port))
+        server.listen(16)
+        self.addCleanup(server.close)
+
+        def accept():
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except OSError:
+                    return
+                self.connections.append(conn)
+                self.addCleanup(conn.close)
+                if banner is not None:
+                    conn.sendall(banner)
+                    conn.close()
+
+        threading.Thread(target=accept, daemon=True).start()
+        return server.getsockname()[1]
+
+    def closedPort(self) -> int:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        return port
+
+    def setUp(self):
+        self.connections = list()
+        self.scanner = SpiderFootPortScanner()
+        self.addCleanup(self.scanner.close)
+
+    def test_scan_should_return_open_ports_and_banners(self):
+        bannerPort = self.listen(b"SSH-2.0-OpenSSH_8.9\r\n")
+        silentPort = self.listen()
+        closedPort = self.closedPort()
+
+        results = list(self.scanner.scan(["127.0.0.1"], [closedPort, silentPort, bannerPort], 0.5))
+        self.assertEqual(results, [("127.0.0.1", {silentPort: b"", bannerPort: b"SSH-2.0-OpenSSH_8.9\r\n"})])
+
+    def test_scan_should_return_each_ip_address(self):
+        ips = ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+        port = self.listen(b"banner", ips[0])
+        for ip in ips[1:]:
+            self.listen(b"banner", ip, port)
+
+        results = dict(self.scanner.scan(ips, [port], 1))
+        self.assertEqual(sorted(results.keys()), ips)
+        for ip in ips:
+            self.assertEqual(results[ip], {port: b"banner"})
+
+        self.assertEqual(list(self.scanner.scan([], [port], 1)), [])
+
+    def test_scan_should_open_at_most_maxSockets_sockets(self):
+        scanner = SpiderFootPortScanner(maxSockets=2)
+        self.addCleanup(scanner.close)
+        ports = [self.listen() for _ in range(4)]
+
+        start = time.monotonic()
+        results = list(scanner.scan(["127.0.0.1"], ports, 0.3))
+        self.assertGreaterEqual(time.monotonic() - start, 0.6)
+        self.assertEqual(results, [("127.0.0.1", {port: b"" for port in ports})])
+
+    def test_scan_should_stop_when_closed(self):
+        port = self.listen()
+        scan = self.scanner.scan([f"127.0.0.{i}" for i in range(1, 21)], [port], 0.5, portsAtOnce=1)
+        next(scan)
+        scan.close()
+
+        time.sleep(1)
+        self.assertLess(len(self.connections), 20)
@@ -0,0 +1,73 @@
+# test_spiderfootprocesspool.py
+import pytest
+import unittest
+
+from modules.sfp_email import sfp_email
+from spiderfoot import SpiderFootEvent, SpiderFootProcessPool, SpiderFootTarget
+from spiderfoot.processpool import packEvent, packResults, unpackEvent, unpackResults
+
+
+@pytest.mark.usefixtures
+class TestSpiderFootProcessPool(unittest.TestCase):
+    """
+    Test SpiderFootProcessPool
+    """
+
+    def event(self):
+        root = SpiderFootEvent("ROOT", "example.com", "", None)
+        url = SpiderFootEvent("LINKED_URL_INTERNAL", "https://example.com/contact", "sfp_spider", root)
+        event = SpiderFootEvent("TARGET_WEB_CONTENT", "Mail bob@example.com or alice@example.net", "sfp_spider", url)
+        event.actualSource = url.data
+        event.moduleDataSource = "Target Website"
+        event.confidence = 90
+        return event
+
+    def test_unpackEvent_should_return_event_with_its_source(self):
+        event = self.event()
+        unpacked = unpackEvent(packEvent(event))
+
+        for attr in ['eventType', 'data', 'module', 'confidence', 'visibility', 'risk', 'moduleDataSource', 'actualSource']:
+            self.assertEqual(getattr(unpacked, attr), getattr(event, attr))
+        self.assertEqual(unpacked.sourceEvent.eventType, "LINKED_URL_INTERNAL")
+        self.assertEqual(unpacked.sourceEvent.data, "https://example.com/contact")
+        self.assertEqual(unpacked.sourceEvent.sourceEvent.eventType, "ROOT")
+
+    def test_unpackResults_should_link_events_to_their_sources(self):
+        event = self.event()
+        b64 = SpiderFootEvent("BASE64_DATA", "Ym9i", "sfp_base64", event)
+        decoded = SpiderFootEvent("RAW_DATA", "bob", "sfp_base64", b64)
+        decoded.risk = 10
+
+        unpacked = unpackResults(packResults([b64, decoded], event), event)
+        self.assertEqual([e.data for e in unpacked], ["Ym9i", "bob"])
+        self.assertIs(unpacked[0].sourceEvent, event)
+        self.assertIs(unpacked[1].sourceEvent, unpacked[0])
+        self.assertEqual(unpacked[1].risk, 10)
+
+    def test_handleEvent_should_return_events_produced_in_worker_process(self):
+        opts = dict(self.default_options)
+        opts['_internettlds'] = "// ===BEGIN ICANN DOMAINS===\n\ncom\nnet\n\n// // ===END ICANN DOMAINS===\n".splitlines()
+        target = SpiderFootTarget("example.com", "INTERNET_NAME")
+
+        pool = SpiderFootProcessPool(2, {"sfp_email": opts}, target)
+        self.addCleanup(pool.shutdown)
+
+        event = self.event()
+        events = pool.handleEvent("sfp_email", event)
+        self.assertEqual(
+            sorted((e.eventType, e.data) for e in events),
+            [("AFFILIATE_EMAILADDR", "alice@example.net"), ("EMAILADDR", "bob@example.com")]
+        )
+        for e in events:
+            self.assertIs(e.sourceEvent, event)
+            self.assertEqual(e.module, "sfp_email")
+            self.assertEqual(e.moduleDataSource, "Target Website")
+
+    def test_setProcessPool_should_allow_an_event_per_process(self):
+        pool = SpiderFootProcessPool(4, dict(), SpiderFootTarget("example.com", "INTERNET_NAME"))
+        self.addCleanup(pool.shutdown)
+
+        module = sfp_email()
+        module.setProcessPool(pool)
+        self.assertIs(module.processPool, pool)
+        self.assertEqual(module.maxThreads, 4)
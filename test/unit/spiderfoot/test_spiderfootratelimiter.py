@@ -0,0 +1,96 @@
+# test_spiderfootratelimiter.py
+import time
+import threading
+import unittest
+from email.utils import formatdate
+
+from spiderfoot import SpiderFootRateLimiter, SpiderFootPlugin
+
+
+class TestSpiderFootRateLimiter(unittest.TestCase):
+    """
+    Test SpiderFootRateLimiter
+    """
+
+    def test_acquire_host_without_limit_should_not_wait(self):
+        limiter = SpiderFootRateLimiter()
+        self.assertEqual(limiter.acquire("example.com"), 0)
+        self.assertEqual(limiter.acquire(None), 0)
+        self.assertEqual(limiter.stats(), dict())
+
+    def test_acquire_should_space_out_requests(self):
+        limiter = SpiderFootRateLimiter()
+        limiter.setLimit("example.com", 0.1)
+
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire("EXAMPLE.com")
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+        # other hosts are not held up
+        self.assertEqual(limiter.acquire("example.net"), 0)
+
+        stats = limiter.stats()
+        self.assertEqual(list(stats.keys()), ["example.com"])
+        self.assertEqual(stats["example.com"]['requests'], 4)
+        self.assertAlmostEqual(stats["example.com"]['rate'], 10, delta=1)
+        self.assertGreater(stats["example.com"]['waited'], 0)
+
+    def test_acquire_should_space_out_concurrent_requests(self):
+        limiter = SpiderFootRateLimiter()
+        limiter.setLimit("example.com", 0.05)
+
+        waits = list()
+        threads = [threading.Thread(target=lambda: waits.append(limiter.acquire("example.com"))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertAlmostEqual(max(waits), 0.2, delta=0.05)
+
+    def test_setLimit_should_keep_the_stricter_limit(self):
+        limiter = SpiderFootRateLimiter()
+        limiter.setLimit("example.com", 2)
+        limiter.setLimit("example.com", 1)
+        self.assertEqual(limiter.buckets["example.com"].interval, 2)
+
+    def test_setLimit_invalid_args_should_raise(self):
+        limiter = SpiderFootRateLimiter()
+        with self.assertRaises(TypeError):
+            limiter.setLimit(None, 1)
+        with self.assertRaises(ValueError):
+            limiter.setLimit("", 1)
+        with self.assertRaises(ValueError):
+            limiter.setLimit("example.com", -1)
+
+    def test_setLimitsFromModule_should_apply_module_rate_limits(self):
+        module = SpiderFootPlugin()
+        module.meta = {
+            'rateLimits': {
+                'api.example.com': 1,
+                'example.net': 'delay',
+            }
+        }
+        module.opts = {'delay': 3}
+
+        limiter = SpiderFootRateLimiter()
+        limiter.setLimitsFromModule(module)
+        self.assertEqual(limiter.buckets['api.example.com'].interval, 1)
+        self.assertEqual(limiter.buckets['example.net'].interval, 3)
+
+    def test_checkResponse_429_should_back_off_host(self):
+        limiter = SpiderFootRateLimiter()
+
+        limiter.checkResponse("example.com", 200, "60")
+        self.assertEqual(limiter.buckets, dict())
+
+        limiter.checkResponse("example.com", 429, "60")
+        self.assertGreater(limiter.buckets["example.com"].next, time.monotonic() + 59)
+
+        limiter.checkResponse("example.net", 429, formatdate(time.time() + 120, usegmt=True))
+        self.assertGreater(limiter.buckets["example.net"].next, time.monotonic() + 100)
+
+        limiter.checkResponse("example.org", 429, "invalid")
+        self.assertGreater(limiter.buckets["example.org"].next, time.monotonic())
+        self.assertEqual(limiter.buckets["example.org"].interval, 0)
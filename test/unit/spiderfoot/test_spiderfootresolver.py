@@ -0,0 +1,153 @@
+# test_spiderfootresolver.py
+import asyncio
+import socketserver
+import threading
+import time
+import unittest
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+from spiderfoot import SpiderFootResolver
+
+
+class LocalDNSRequestHandler(socketserver.BaseRequestHandler):
+    """Answers queries from the zone of the server, and never answers
+    queries for names starting with "timeout"."""
+
+    def handle(self):
+        data, sock = self.request
+        query = dns.message.from_wire(data)
+        question = query.question[0]
+        name = question.name.to_text()
+
+        self.server.queries.append((name, question.rdtype))
+
+        if name.startswith("timeout"):
+            return
+
+        response = dns.message.make_response(query)
+        owner = name
+        while True:
+            cname = self.server.zone.get((owner, 'CNAME'))
+            if cname is None:
+                break
+            response.answer.append(dns.rrset.from_text(owner, 300, 'IN', 'CNAME', cname))
+            owner = cname
+
+        rdtype = dns.rdatatype.to_text(question.rdtype)
+        if (owner, rdtype) in self.server.zone:
+            ttl, values = self.server.zone[(owner, rdtype)]
+            response.answer.append(dns.rrset.from_text(owner, ttl, 'IN', rdtype, *values))
+        else:
+            if not any(key[0] == owner for key in self.server.zone):
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(dns.rrset.from_text(
+                "example.com.", 3600, 'IN', 'SOA', "ns.example.com. admin.example.com. 1 3600 600 86400 30"
+            ))
+
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+class TestSpiderFootResolver(unittest.TestCase):
+    """
+    Test SpiderFootResolver
+    """
+
+    def setUp(self):
+        server = socketserver.ThreadingUDPServer(("127.0.0.1", 0), LocalDNSRequestHandler)
+        server.queries = list()
+        server.zone = {
+            ("www.example.com.", 'CNAME'): "example.com.",
+            ("example.com.", 'A'): (60, ["192.0.2.1", "192.0.2.2"]),
+            ("example.com.", 'AAAA'): (60, ["2001:db8::1"]),
+            ("1.2.0.192.in-addr.arpa.", 'PTR'): (60, ["example.com."]),
+            ("_sip._tcp.example.com.", 'SRV'): (60, ["0 5 5060 sip.example.com."]),
+            ("expired.example.com.", 'A'): (0, ["192.0.2.3"]),
+        }
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.server = server
+
+        self.resolver = SpiderFootResolver(["127.0.0.1"], port=server.server_address[1], timeout=1)
+
+    def test_query_should_return_names_and_records(self):
+        names, addrs = self.resolver.query("WWW.example.com", 'A')
+        self.assertEqual(names, ["www.example.com", "example.com"])
+        self.assertEqual(sorted(addrs), ["192.0.2.1", "192.0.2.2"])
+
+        self.assertEqual(self.resolver.query("example.com", 'AAAA'), (["example.com"], ["2001:db8::1"]))
+        self.assertEqual(self.resolver.query("1.2.0.192.in-addr.arpa", 'PTR')[1], ["example.com"])
+        self.assertEqual(self.resolver.query("_sip._tcp.example.com", 'SRV')[1], ["0 5 5060 sip.example.com"])
+
+    def test_query_should_cache_answers(self):
+        for _ in range(3):
+            self.assertEqual(sorted(self.resolver.query("example.com.", 'A')[1]), ["192.0.2.1", "192.0.2.2"])
+            self.assertEqual(self.resolver.query("expired.example.com", 'A')[1], ["192.0.2.3"])
+
+        self.assertEqual(self.server.queries.count(("example.com.", dns.rdatatype.A)), 1)
+        self.assertEqual(self.server.queries.count(("expired.example.com.", dns.rdatatype.A)), 3)
+
+        stats = self.resolver.stats()
+        self.assertEqual(stats['queries'], 4)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_query_should_cache_names_which_do_not_exist(self):
+        self.assertEqual(self.resolver.query("missing.example.com", 'A'), ([], []))
+        self.assertEqual(self.resolver.query("missing.example.com", 'A'), ([], []))
+        self.assertEqual(self.resolver.query("example.com", 'MX'), (["example.com"], []))
+        self.assertEqual(self.resolver.query("example.com", 'MX'), (["example.com"], []))
+        self.assertEqual(len(self.server.queries), 2)
+
+        stats = self.resolver.stats()
+        self.assertEqual(stats['nxdomain'], 1)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_query_should_not_cache_timeouts(self):
+        self.assertEqual(self.resolver.query("timeout.example.com", 'A'), ([], []))
+        self.assertEqual(self.resolver.query("timeout.example.com", 'A'), ([], []))
+
+        stats = self.resolver.stats()
+        self.assertEqual(stats['timeouts'], 2)
+        self.assertEqual(stats['entries'], 0)
+
+    def test_queryMany_should_return_answer_of_each_name(self):
+        names = [f"host{i}.example.com" for i in range(50)] + ["example.com", "www.example.com"]
+        res = self.resolver.queryMany(names, 'A')
+        self.assertEqual(list(res.keys()), names)
+        self.assertEqual(res["host0.example.com"], ([], []))
+        self.assertEqual(sorted(res["www.example.com"][1]), ["192.0.2.1", "192.0.2.2"])
+        self.assertEqual(self.resolver.stats()['nxdomain'], 50)
+
+        self.assertEqual(self.resolver.queryMany([]), dict())
+
+    def test_queryMany_should_pass_answers_to_callback_as_they_arrive(self):
+        answers = list()
+
+        def callback(name, answer):
+            answers.append((name, answer))
+            return len(answers) < 3
+
+        names = [f"host{i}.example.com" for i in range(20)]
+        res = self.resolver.queryMany(names, 'A', callback=callback, concurrency=1)
+        self.assertEqual(len(answers), 3)
+        self.assertEqual(len(res), 3)
+        self.assertEqual(dict(answers), res)
+        self.assertLess(len(self.server.queries), 20)
+
+    def test_queryMany_should_limit_lookups_per_second(self):
+        names = [f"host{i}.example.com" for i in range(5)]
+        start = time.monotonic()
+        res = self.resolver.queryMany(names, 'A', maxRate=20)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(len(res), 5)
+
+    def test_queryAsync_should_use_cache(self):
+        self.resolver.query("example.com", 'A')
+        names, addrs = asyncio.run(self.resolver.queryAsync("example.com", 'A'))
+        self.assertEqual(sorted(addrs), ["192.0.2.1", "192.0.2.2"])
+        self.assertEqual(len(self.server.queries), 1)
@@ -0,0 +1,93 @@
+# test_spiderfootscansnapshot.py
+import unittest
+import uuid
+
+from spiderfoot import SpiderFootDb, SpiderFootEvent, SpiderFootScanSnapshot
+
+
+class TestSpiderFootScanSnapshot(unittest.TestCase):
+    """
+    Test SpiderFootScanSnapshot
+    """
+
+    def storeExampleScan(self, sfdb: SpiderFootDb) -> str:
+        scanId = str(uuid.uuid4())
+        sfdb.scanInstanceCreate(scanId, "example scan name", "example.com")
+
+        root = SpiderFootEvent("ROOT", "example.com", "", None)
+        target = SpiderFootEvent("INTERNET_NAME", "example.com", "SpiderFoot UI", root)
+        events = [root, target]
+        for i in range(10):
+            host = SpiderFootEvent("INTERNET_NAME", f"host{i % 4}.example.com", "sfp_dnsbrute", target)
+            ip = SpiderFootEvent("IP_ADDRESS", f"192.0.2.{i}", "sfp_dnsresolve", host)
+            events.extend([host, ip, SpiderFootEvent("TCP_PORT_OPEN", f"192.0.2.{i}:3389", "sfp_portscan_tcp", ip)])
+        sfdb.scanEventStoreBatch(scanId, events)
+        return scanId
+
+    def test_init_argument_dbh_invalid_type_should_raise_TypeError(self):
+        invalid_types = [None, str(), list(), dict(), int()]
+        for invalid_type in invalid_types:
+            with self.subTest(invalid_type=invalid_type):
+                with self.assertRaises(TypeError):
+                    SpiderFootScanSnapshot(invalid_type, "example scan id")
+
+    def test_init_argument_scanId_invalid_type_should_raise_TypeError(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+
+        invalid_types = [None, list(), dict(), int()]
+        for invalid_type in invalid_types:
+            with self.subTest(invalid_type=invalid_type):
+                with self.assertRaises(TypeError):
+                    SpiderFootScanSnapshot(sfdb, invalid_type)
+
+    def test_select_should_return_events_of_scanResultEvent(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        scanId = self.storeExampleScan(sfdb)
+        snapshot = SpiderFootScanSnapshot(sfdb, scanId)
+
+        self.assertEqual(len(snapshot), 32)
+        for criteria in [
+            {'eventType': ['INTERNET_NAME']},
+            {'eventType': ['INTERNET_NAME', 'IP_ADDRESS', 'ROOT']},
+            {'eventType': []},
+            {'srcModule': ['sfp_dnsresolve', 'sfp_portscan_tcp']},
+            {'eventType': 'ALL'},
+        ]:
+            with self.subTest(criteria=criteria):
+                expected = [row[8] for row in sfdb.scanResultEvent(scanId, **criteria)]
+                self.assertEqual([snapshot.ids[i] for i in snapshot.select(**criteria)], expected)
+
+    def test_source_and_children_should_return_related_events(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        scanId = self.storeExampleScan(sfdb)
+        snapshot = SpiderFootScanSnapshot(sfdb, scanId)
+
+        for i in snapshot.select(eventType=['INTERNET_NAME', 'IP_ADDRESS']):
+            with self.subTest(event=snapshot.data[i]):
+                expected = [row[9] for row in sfdb.scanElementSourcesDirect(scanId, [snapshot.ids[i]])]
+                self.assertEqual([snapshot.ids[s] for s in snapshot.source(i)], expected)
+
+                expected = [row[8] for row in sfdb.scanResultEvent(scanId, sourceId=[snapshot.ids[i]])]
+                self.assertEqual([snapshot.ids[c] for c in snapshot.children(i)], expected)
+
+    def test_filter_should_test_each_distinct_value_once(self):
+        sfdb = SpiderFootDb(self.default_options, False)
+        scanId = self.storeExampleScan(sfdb)
+        snapshot = SpiderFootScanSnapshot(sfdb, scanId)
+
+        tested = list()
+
+        def keep(value):
+            tested.append(value)
+            return value != "host0.example.com"
+
+        ips = snapshot.select(eventType=['IP_ADDRESS'])
+        kept = snapshot.filter(ips, 'source.data', keep)
+
+        self.assertEqual(len(ips), 10)
+        self.assertEqual(sorted(tested), [f"host{i}.example.com" for i in range(4)])
+        self.assertEqual(len(kept), 7)
+        self.assertEqual(snapshot.filter(ips, 'data', lambda value: value.endswith(".1")), [i for i in ips if snapshot.data[i] == "192.0.2.1"])
+
+        with self.assertRaises(KeyError):
+            snapshot.filter(ips, 'generated', keep)
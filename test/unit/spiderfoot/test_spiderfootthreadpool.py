@@ -1,5 +1,6 @@
 # test_spiderfootplugin.py
 import pytest
+import threading
 import unittest
 
 from spiderfoot import SpiderFootThreadPool
@@ -82,3 +83,54 @@ class TestSpiderFootThreadPool(unittest.TestCase):
         )
         self.assertEqual(map_results, expectedOutput)
         self.assertEqual(submit_results, expectedOutput2)
+
+    def test_submit_should_block_while_task_has_maxThreads_calls(self):
+        release = threading.Event()
+        pool = SpiderFootThreadPool(4)
+        pool.start()
+        self.addCleanup(pool.shutdown, False)
+
+        pool.submit(release.wait, taskName="blocked", maxThreads=1)
+        submitted = threading.Event()
+
+        def submit():
+            pool.submit(release.wait, taskName="blocked", maxThreads=1)
+            submitted.set()
+
+        threading.Thread(target=submit, daemon=True).start()
+        self.assertFalse(submitted.wait(0.2))
+        self.assertEqual(pool.countQueuedTasks("blocked"), 1)
+
+        release.set()
+        self.assertTrue(submitted.wait(5))
+        pool.shutdown()
+        self.assertEqual(pool.countQueuedTasks("blocked"), 0)
+
+    def test_tasks_should_take_turns_by_weight(self):
+        order = list()
+        release = threading.Event()
+        pool = SpiderFootThreadPool(1, qsize=100)
+        pool.start()
+
+        # keep the only worker busy while calls are queued
+        pool.submit(release.wait, taskName="first")
+        for i in range(4):
+            pool.submit(order.append, f"a{i}", taskName="a")
+        for i in range(4):
+            pool.submit(order.append, f"b{i}", taskName="b", weight=2)
+        release.set()
+        pool.shutdown()
+
+        self.assertEqual(order, ["a0", "b0", "b1", "a1", "b2", "b3", "a2", "a3"])
+
+    def test_worker_should_survive_exception_in_callback(self):
+        def fail():
+            raise ValueError("failed")
+
+        with SpiderFootThreadPool(1) as pool:
+            pool.start()
+            pool.submit(fail)
+            pool.submit(lambda: "ok", saveResult=True)
+            results = pool.shutdown()
+        self.assertEqual(results["default"], ["ok"])
+        self.assertTrue(pool.finished)
@@ -32,7 +32,7 @@ class TestSpiderFootModuleLoading(unittest.TestCase):
 
     def test_module_labels_are_valid(self):
         sf = SpiderFoot(self.default_options)
-        valid_labels = ["errorprone", "tor", "slow", "invasive", "apikey", "tool"]
+        valid_labels = ["errorprone", "tor", "slow", "invasive", "apikey", "tool", "cpubound"]
 
         sfModules = self.load_modules(sf)
         for module in sfModules:
@@ -181,7 +181,6 @@ class TestSpiderFootModuleLoading(unittest.TestCase):
         for module in sfModules:
             m = sfModules[module]
 
-            self.assertTrue(m.get('object'))
             self.assertTrue(m.get('name'))
             self.assertTrue(m.get('meta'))
             self.assertTrue(m.get('descr'))
@@ -1,10 +1,42 @@
 # test_spiderfoot.py
+import http.server
+import threading
+import time
 import pytest
 import unittest
 
 from sflib import SpiderFoot
 
 
+class LocalHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Keep-alive HTTP handler recording the client port of each request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def respond(self, body: bool) -> None:
+        self.server.clients.append(self.client_address[1])
+        content = self.path.encode()
+        if self.path.startswith("/429"):
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Set-Cookie", "session=secret; Path=/")
+        self.end_headers()
+        if body:
+            self.wfile.write(content)
+
+    def do_HEAD(self):
+        self.respond(False)
+
+    def do_GET(self):
+        self.respond(True)
+
+    def log_message(self, format, *args):
+        pass
+
+
 @pytest.mark.usefixtures
 class TestSpiderFoot(unittest.TestCase):
 
@@ -287,6 +319,18 @@ class TestSpiderFoot(unittest.TestCase):
         keywords = sf.domainKeywords(None, sf.opts.get('_internettlds'))
         self.assertIsInstance(keywords, set)
 
+    def test_public_suffix_list_should_be_shared_for_each_version_of_tldlist(self):
+        sf = SpiderFoot(self.default_options)
+
+        psl = sf.publicSuffixList(self.test_tlds)
+        self.assertIs(SpiderFoot(dict()).publicSuffixList(self.test_tlds), psl)
+        self.assertIs(sf.publicSuffixList(self.test_tlds.splitlines()), psl)
+
+        other_tlds = self.test_tlds.replace("org", "io")
+        self.assertIsNot(sf.publicSuffixList(other_tlds), psl)
+        self.assertTrue(sf.isDomain('spiderfoot.io', other_tlds))
+        self.assertFalse(sf.isDomain('spiderfoot.io', self.test_tlds))
+
     def test_host_domain_invalid_host_should_return_none(self):
         sf = SpiderFoot(self.default_options)
         sf.opts['_internettlds'] = self.test_tlds
@@ -604,6 +648,11 @@ class TestSpiderFoot(unittest.TestCase):
         session = sf.getSession()
         self.assertIn("requests.sessions.Session", str(session))
 
+    def test_get_session_should_return_the_same_session(self):
+        sf = SpiderFoot(self.default_options)
+        self.assertIs(sf.getSession(), sf.getSession())
+        self.assertIsNot(sf.getSession(), SpiderFoot(self.default_options).getSession())
+
     def test_remove_url_creds_should_remove_credentials_from_url(self):
         url = "http://local/?key=secret&pass=secret&user=secret&password=secret"
 
@@ -696,6 +745,61 @@ class TestSpiderFoot(unittest.TestCase):
                 res = sf.fetchUrl(invalid_type)
                 self.assertEqual(None, res)
 
+    def startLocalHTTPServer(self) -> str:
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), LocalHTTPRequestHandler)
+        server.clients = list()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.server = server
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_fetchUrl_should_reuse_connections(self):
+        url = self.startLocalHTTPServer()
+        sf = SpiderFoot(self.default_options)
+
+        for path in ["/a", "/b", "/c"]:
+            res = sf.fetchUrl(f"{url}{path}", sizeLimit=1000)
+            self.assertEqual(res['code'], "200")
+            self.assertEqual(res['content'], path)
+
+        self.assertEqual(len(self.server.clients), 6)
+        self.assertEqual(len(set(self.server.clients)), 1)
+
+    def test_fetchUrl_should_not_keep_cookies(self):
+        url = self.startLocalHTTPServer()
+        sf = SpiderFoot(self.default_options)
+
+        res = sf.fetchUrl(f"{url}/")
+        self.assertEqual(res['headers']['set-cookie'], "session=secret; Path=/")
+        self.assertEqual(len(sf.getSession().cookies), 0)
+
+    def test_fetchUrl_should_back_off_host_answering_429(self):
+        url = self.startLocalHTTPServer()
+        sf = SpiderFoot(self.default_options)
+
+        res = sf.fetchUrl(f"{url}/429")
+        self.assertEqual(res['code'], "429")
+
+        start = time.monotonic()
+        res = sf.fetchUrl(f"{url}/")
+        self.assertEqual(res['code'], "200")
+        self.assertGreater(time.monotonic() - start, 0.5)
+        self.assertEqual(sf.rateLimiter.stats()['127.0.0.1']['requests'], 1)
+
+    def test_fetchUrlMany_should_return_http_response_of_each_url(self):
+        url = self.startLocalHTTPServer()
+        sf = SpiderFoot(self.default_options)
+
+        urls = [f"{url}/{i}" for i in range(50)]
+        res = sf.fetchUrlMany(urls, timeout=5)
+        self.assertEqual(list(res.keys()), urls)
+        for u in urls:
+            self.assertEqual(res[u]['code'], "200")
+            self.assertEqual(res[u]['content'], u[len(url):])
+
+        self.assertEqual(sf.fetchUrlMany([]), dict())
+
     def test_fetchUrl_argument_url_invalid_url_should_return_None(self):
         sf = SpiderFoot(self.default_options)
 
@@ -726,6 +830,21 @@ class TestSpiderFoot(unittest.TestCase):
         check_dns_wildcard = sf.checkDnsWildcard('local')
         self.assertIsInstance(check_dns_wildcard, bool)
 
+    def test_check_dns_wildcard_should_check_each_domain_once(self):
+        sf = SpiderFoot(self.default_options)
+        lookups = list()
+
+        def resolveHost(host):
+            lookups.append(host)
+            return ['192.0.2.1']
+
+        sf.resolveHost = resolveHost
+
+        self.assertTrue(sf.checkDnsWildcard('example.com'))
+        self.assertTrue(sf.checkDnsWildcard('EXAMPLE.com'))
+        self.assertEqual(len(lookups), 1)
+        self.assertTrue(lookups[0].endswith('.example.com'))
+
     @unittest.skip("todo")
     def test_google_iterate(self):
         sf = SpiderFoot(self.default_options)
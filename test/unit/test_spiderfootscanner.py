@@ -1,9 +1,13 @@
 # test_spiderfootscanner.py
 import pytest
+import queue
+import time
 import unittest
 import uuid
 
+from modules.sfp__stor_db import sfp__stor_db
 from sfscan import SpiderFootScanner
+from spiderfoot import SpiderFootDb, SpiderFootEvent, SpiderFootPlugin
 
 
 @pytest.mark.usefixtures
@@ -290,3 +294,135 @@ class TestSpiderFootScanner(unittest.TestCase):
         sfscan = SpiderFootScanner("example scan name", scan_id, "spiderfoot.net", "IP_ADDRESS", module_list, opts, start=False)
         with self.assertRaises(ValueError):
             sfscan._SpiderFootScanner__setStatus("example invalid scan status")
+
+    def test_buildEventRouting_should_route_event_types_to_watching_modules(self):
+        """
+        Test buildEventRouting(self)
+        """
+        opts = self.default_options
+        opts['__modules__'] = dict()
+        scan_id = str(uuid.uuid4())
+        module_list = ['sfp__stor_db']
+
+        sfscan = SpiderFootScanner("example scan name", scan_id, "spiderfoot.net", "IP_ADDRESS", module_list, opts, start=False)
+
+        def module(name, watched, priority):
+            mod = SpiderFootPlugin()
+            mod.__name__ = name
+            mod._priority = priority
+            mod.watchedEvents = lambda: watched
+            return mod
+
+        storage = module("storage", ["*"], 0)
+        dns = module("dns", ["INTERNET_NAME", "DOMAIN_NAME"], 2)
+        ip = module("ip", ["IP_ADDRESS"], 1)
+        sfscan._SpiderFootScanner__moduleInstances = {m.__name__: m for m in [storage, dns, ip]}
+
+        sfscan.buildEventRouting()
+
+        self.assertEqual(sfscan.eventSubscribers("INTERNET_NAME"), (storage, dns))
+        self.assertEqual(sfscan.eventSubscribers("IP_ADDRESS"), (storage, ip))
+        self.assertEqual(sfscan.eventSubscribers("UNWATCHED_EVENT_TYPE"), (storage,))
+
+    def test_dispatchStats_should_return_a_dict(self):
+        opts = self.default_options
+        opts['__modules__'] = dict()
+        scan_id = str(uuid.uuid4())
+        module_list = ['sfp__stor_db']
+
+        sfscan = SpiderFootScanner("example scan name", scan_id, "spiderfoot.net", "IP_ADDRESS", module_list, opts, start=False)
+
+        stats = sfscan.dispatchStats
+        self.assertIsInstance(stats, dict)
+        self.assertEqual(stats['events'], 0)
+        self.assertEqual(stats['usPerEvent'], 0)
+
+    def runScan(self, producer: SpiderFootPlugin, maxFinishRounds: int = 10) -> tuple:
+        """Dispatch the events of a scan of a producer module, stored by
+        sfp__stor_db holding events until the scan ends."""
+        opts = self.default_options
+        opts['__modules__'] = dict()
+        opts['_internettlds'] = "com\nnet"
+        scan_id = str(uuid.uuid4())
+
+        sfscan = SpiderFootScanner("example scan name", scan_id, "spiderfoot.net", "INTERNET_NAME", ['sfp__stor_db'], opts, start=False)
+        sfscan.maxFinishRounds = maxFinishRounds
+        sfscan.eventQueue = queue.Queue()
+        pool = sfscan._SpiderFootScanner__sharedThreadPool
+        pool.start()
+
+        storage = sfp__stor_db()
+        storage.__name__ = "sfp__stor_db"
+        storage.setup(sfscan._SpiderFootScanner__sf, dict(opts, maxbatchsize=1000, maxbatchdelay=60))
+        storeBatch = storage.storeBatch
+
+        def slowStoreBatch():
+            # write held events late, so the scanner must wait for them
+            time.sleep(0.5)
+            storeBatch()
+
+        storage.storeBatch = slowStoreBatch
+        producer.__name__ = "producer"
+        producer.sf = sfscan._SpiderFootScanner__sf
+        producer.opts = opts
+        producer._priority = 3
+        for mod in [storage, producer]:
+            mod.setScanId(scan_id)
+            mod.setSharedThreadPool(pool)
+            mod.setDbh(sfscan._SpiderFootScanner__dbh)
+            mod.outgoingEventQueue = sfscan.eventQueue
+            mod.incomingEventQueue = queue.Queue()
+        sfscan._SpiderFootScanner__moduleInstances = {m.__name__: m for m in [storage, producer]}
+        sfscan.buildEventRouting()
+
+        root = SpiderFootEvent("ROOT", "spiderfoot.net", "", None)
+        sfscan.eventQueue.put(root)
+        sfscan.eventQueue.put(SpiderFootEvent("INTERNET_NAME", "spiderfoot.net", "SpiderFoot UI", root))
+
+        error = None
+        try:
+            sfscan.waitForThreads()
+        except AssertionError as e:
+            error = e
+
+        # read straight away, as the scanner goes on to correlate the scan
+        sfdb = SpiderFootDb(opts, False)
+        stored = sorted(row[1] for row in sfdb.scanResultEvent(scan_id))
+        sfdb.scanInstanceDelete(scan_id)
+        return error, stored
+
+    def test_waitForThreads_finish_rounds_capped_should_store_held_events(self):
+        class producer(SpiderFootPlugin):
+            rounds = 0
+
+            def watchedEvents(self):
+                return ["INTERNET_NAME"]
+
+            def handleEvent(self, sfEvent):
+                self.source = sfEvent
+
+            def finish(self):
+                # every round of FINISHED produces a new event
+                self.rounds += 1
+                self.notifyListeners(SpiderFootEvent("IP_ADDRESS", f"192.0.2.{self.rounds}", self.__name__, self.source))
+
+        error, stored = self.runScan(producer(), maxFinishRounds=2)
+
+        self.assertIsNone(error)
+        self.assertEqual(stored, ["192.0.2.1", "192.0.2.2", "spiderfoot.net", "spiderfoot.net"])
+
+    def test_waitForThreads_aborted_should_store_held_events(self):
+        class producer(SpiderFootPlugin):
+            def watchedEvents(self):
+                return ["INTERNET_NAME", "IP_ADDRESS"]
+
+            def handleEvent(self, sfEvent):
+                if sfEvent.eventType == "INTERNET_NAME":
+                    self.notifyListeners(SpiderFootEvent("IP_ADDRESS", "192.0.2.1", self.__name__, sfEvent))
+                    # stop the scan once the new event is sent
+                    self._stopScanning = True
+
+        error, stored = self.runScan(producer())
+
+        self.assertIsInstance(error, AssertionError)
+        self.assertEqual(stored, ["192.0.2.1", "spiderfoot.net", "spiderfoot.net"])